@@ -0,0 +1,288 @@
+"""Step many independent worlds in lockstep with NumPy.
+
+BatchEnv builds its worlds with generateWorld and then keeps the play state of
+all of them in arrays: player physics, platform collision, bush hiding,
+visibility, enemy patrols, vision cones, the alert meter, orbs and the exit are
+advanced for every world at once with the same rules as updatePlayState. Only
+line-of-sight checks for a player who is already inside a cone fall back to
+the per-world platform grid.
+
+    env = BatchEnv()
+    obs = env.reset(range(256))
+    obs, reward, done = env.step(actions)  # actions: int array (worlds, len(ACTION_FIELDS))
+
+Cosmetic state (camera, particles, leaves, fireflies, the mission log),
+attacks and guards leaving their patrol to investigate are not simulated; call
+world(index) to get a World with the batched state written back, e.g. to draw
+it with drawGame.
+
+Unlike main.py, where numpy is an optional accelerator, this module needs it.
+"""
+
+import math
+import os
+
+import numpy as np
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import main as game  # noqa: E402  (the video driver must be chosen before pygame loads)
+
+ACTION_FIELDS = ("move", "jump", "crouch", "run")  # move is -1/0/1; jump is a key press this step
+OBS_FIELDS = (
+    "x", "y", "velX", "velY", "grounded", "hidden", "visibility", "alert", "orbsLeft", "exitDX", "exitDY",
+)
+CONE_FIELDS = ("eyeDX", "eyeDY", "facing", "reach", "spread")  # Repeated for the nearest OBS_CONES enemies
+OBS_CONES = 4
+
+
+def padRects(rowsOfRects):
+    """Pack per-world rect lists into (worlds, most rects) left/top/right/bottom arrays.
+
+    Padding slots get left=inf and right=-inf so they never overlap anything.
+    """
+    columns = max(1, max((len(rects) for rects in rowsOfRects), default=0))
+    shape = (len(rowsOfRects), columns)
+    left, right = np.full(shape, np.inf), np.full(shape, -np.inf)
+    top, bottom = np.zeros(shape), np.zeros(shape)
+    for row, rects in enumerate(rowsOfRects):
+        for col, rect in enumerate(rects):
+            left[row, col], top[row, col], right[row, col], bottom[row, col] = rect.left, rect.top, rect.right, rect.bottom
+    return left, top, right, bottom
+
+
+def overlaps(x, y, w, h, rects):
+    """colliderect of each world's player box against that world's padded rects."""
+    left, top, right, bottom = rects
+    x, y = x[:, None], y[:, None]
+    return (x < right) & (left < x + w) & (y < bottom) & (top < y + h)
+
+
+class BatchEnv:
+    """Lockstep simulation of many worlds; see the module docstring."""
+
+    def __init__(self, dt=1 / 60):
+        self.dt = dt
+        self.worlds = []
+
+    def reset(self, seeds):
+        worlds = self.worlds = [game.generateWorld(seed) for seed in seeds]
+        count = self.count = len(worlds)
+        self.rows = np.arange(count)
+
+        rects = [world.playerRect for world in worlds]
+        self.playerW, self.playerH = rects[0].size if rects else game.playerHitboxSize
+        self.posX = np.array([world.playerPos.x for world in worlds], dtype=float)
+        self.posY = np.array([world.playerPos.y for world in worlds], dtype=float)
+        self.rectX = np.array([rect.x for rect in rects], dtype=float)
+        self.rectY = np.array([rect.y for rect in rects], dtype=float)
+        self.velX = np.zeros(count)
+        self.velY = np.zeros(count)
+        self.onGround = np.zeros(count, dtype=bool)
+        self.coyoteTimer = np.zeros(count)
+        self.jumpBuffer = np.zeros(count)
+        self.visibility = np.array([world.visibility for world in worlds], dtype=float)
+        self.alertMeter = np.zeros(count)
+        self.hidden = np.zeros(count, dtype=bool)
+        self.caught = np.zeros(count, dtype=bool)
+        self.win = np.zeros(count, dtype=bool)
+        self.simTime = np.zeros(count)
+
+        self.platforms = padRects([world.platforms for world in worlds])
+        bushes = [[spot for spot in world.hidingSpots if spot.type == "bush"] for world in worlds]
+        self.bushes = padRects([[spot.rect for spot in spots] for spots in bushes])
+        self.bushStrength = np.ones(self.bushes[0].shape)
+        for row, spots in enumerate(bushes):
+            self.bushStrength[row, :len(spots)] = [spot.strength for spot in spots]
+        self.orbs = padRects([[orb.rect for orb in world.orbs] for world in worlds])
+        self.orbRescued = np.isinf(self.orbs[0])
+        self.rescued = np.zeros(count, dtype=int)
+        self.orbTotal = np.array([world.orbTotal for world in worlds], dtype=int)
+        self.exit = padRects([[world.exitRect] for world in worlds])
+
+        # Every world's enemies in one flat EnemyBatch, plus a padded (worlds, most enemies)
+        # table of flat indices where -1 points at a sentinel appended when observing
+        self.enemyList = [enemy for world in worlds for enemy in world.enemies]
+        self.enemies = game.EnemyBatch(self.enemyList)
+        self.owner = np.repeat(self.rows, [len(world.enemies) for world in worlds])
+        slots = max(OBS_CONES, max((len(world.enemies) for world in worlds), default=0))
+        self.enemySlots = np.full((count, slots), -1)
+        start = 0
+        for row, world in enumerate(worlds):
+            self.enemySlots[row, :len(world.enemies)] = np.arange(start, start + len(world.enemies))
+            start += len(world.enemies)
+        return self.observe()
+
+    def playerCenter(self):
+        return self.rectX + self.playerW // 2, self.rectY + self.playerH // 2
+
+    def step(self, actions):
+        """Advance every unfinished world by dt; returns (observations, reward, done).
+
+        The reward is +1 per orb collected and on reaching the exit, -1 when
+        caught. Finished worlds stay frozen until the next reset.
+        """
+        actions = np.asarray(actions).reshape(self.count, len(ACTION_FIELDS))
+        live = ~(self.caught | self.win)
+        moveDir = np.where(live, np.clip(actions[:, 0], -1, 1), 0)
+        jumpPressed = live & (actions[:, 1] != 0)
+        crouching = actions[:, 2] != 0
+        running = actions[:, 3] != 0
+        dt = np.where(live, self.dt, 0.0)
+        w, h = self.playerW, self.playerH
+        self.simTime += dt
+
+        # Input and movement
+        self.jumpBuffer = np.where(jumpPressed, game.jumpBuffer, np.maximum(0.0, self.jumpBuffer - dt))
+        self.coyoteTimer = np.maximum(0.0, self.coyoteTimer - dt)
+        moveSpeed = np.where(running, game.runSpeed, game.walkSpeed) * np.where(crouching, 0.6, 1.0)
+        self.velX = np.where(live, moveDir * moveSpeed, self.velX)
+        jumping = (self.jumpBuffer > 0) & (self.onGround | (self.coyoteTimer > 0))
+        self.velY = np.where(jumping, -game.jumpForce, self.velY)
+        self.onGround &= ~jumping
+        self.coyoteTimer[jumping] = 0
+        self.jumpBuffer[jumping] = 0
+        self.velY += game.gravity * dt
+
+        # Platform collision, one axis at a time and in substeps as in movePlayer
+        self.onGround &= ~live
+        steps = np.maximum(1, np.ceil(np.maximum(np.abs(self.velX), np.abs(self.velY)) * dt / game.PLAYER_COLLISION_STEP))
+        for substep in range(int(steps.max())):
+            self.moveSubstep(np.where(substep < steps, dt / steps, 0.0))
+        self.coyoteTimer = np.where(self.onGround, game.coyoteTime, self.coyoteTimer)
+
+        # Hiding and visibility
+        inBush = overlaps(self.rectX, self.rectY, w, h, self.bushes)
+        self.hidden = np.where(live, inBush.any(axis=1), self.hidden)
+        hidingStrength = np.minimum(1.0, np.where(inBush, self.bushStrength, 1.0).min(axis=1))
+        targetVisibility = np.where(self.hidden, 20 + 60 * hidingStrength, np.where(crouching, 60, 85))
+        speedBonus = np.minimum(np.abs(self.velX) / game.runSpeed * 30, 30) + np.where(self.onGround, 0, 10)
+        targetVisibility = targetVisibility + np.where(moveDir == 0, speedBonus * 0.4, speedBonus)
+        self.visibility = np.clip(self.visibility + (targetVisibility - self.visibility) * 4 * dt, 5, 100)
+
+        caughtNow, spotted = self.updateEnemies(live, crouching)
+
+        # Alert meter
+        alert = np.where(spotted, self.alertMeter, np.maximum(0, self.alertMeter - 25 * dt))
+        alert = np.minimum(120, alert)
+        caughtNow |= live & ~caughtNow & (alert >= 100)
+        self.caught |= caughtNow
+        self.alertMeter = np.where(self.caught, 100.0, np.where(live, alert, self.alertMeter))
+
+        # Orbs and the exit
+        free = live & ~self.caught
+        collected = overlaps(self.rectX, self.rectY, w, h, self.orbs) & ~self.orbRescued & free[:, None]
+        self.orbRescued |= collected
+        gained = collected.sum(axis=1)
+        self.rescued += gained
+        atExit = overlaps(self.rectX, self.rectY, w, h, self.exit)[:, 0]
+        won = free & (self.rescued == self.orbTotal) & atExit
+        self.win |= won
+
+        reward = gained + won - caughtNow
+        return self.observe(), reward.astype(np.float32), self.caught | self.win
+
+    def moveSubstep(self, dt):
+        left, top, right, bottom = self.platforms
+        w, h = self.playerW, self.playerH
+        self.posX += self.velX * dt
+        self.rectX = np.trunc(self.posX)
+        hit = overlaps(self.rectX, self.rectY, w, h, self.platforms)
+        blocked = hit.any(axis=1)
+        pushLeft = np.where(hit, left, np.inf).min(axis=1) - w
+        pushRight = np.where(hit, right, -np.inf).max(axis=1)
+        self.rectX = np.where(blocked & (self.velX > 0), pushLeft, self.rectX)
+        self.rectX = np.where(blocked & (self.velX < 0), pushRight, self.rectX)
+        self.posX = np.where(blocked, self.rectX, self.posX)
+
+        self.posY += self.velY * dt
+        self.rectY = np.trunc(self.posY)
+        hit = overlaps(self.rectX, self.rectY, w, h, self.platforms)
+        blocked = hit.any(axis=1)
+        landed = blocked & (self.velY > 0)
+        bumped = blocked & (self.velY < 0)
+        self.rectY = np.where(landed, np.where(hit, top, np.inf).min(axis=1) - h, self.rectY)
+        self.rectY = np.where(bumped, np.where(hit, bottom, -np.inf).max(axis=1), self.rectY)
+        self.velY = np.where(landed | bumped, 0.0, self.velY)
+        self.posY = np.where(blocked, self.rectY, self.posY)
+        self.onGround |= landed
+
+    def updateEnemies(self, live, crouching):
+        """Patrol and detection for all enemies; returns (newly caught, spotted) per world."""
+        batch, owner, dt = self.enemies, self.owner, self.dt
+        centerX, centerY = self.playerCenter()
+        awake = batch.active & live[owner]
+        # Every enemy moves every step: with no per-enemy Python work left there is
+        # nothing for the LOD schedule to save
+        batch.patrol(np.full(batch.count, dt), awake)
+        inside, distance = batch.detect((centerX[owner], centerY[owner]))
+        inside &= awake
+        for idx in np.flatnonzero(inside).tolist():
+            enemy, row = self.enemyList[idx], owner[idx]
+            enemy.rect.x = math.floor(batch.x[idx] + 0.5)
+            enemy.dir = int(batch.dir[idx])
+            center = (int(centerX[row]), int(centerY[row]))
+            if game.lineOfSightBlocked(self.worlds[row], enemy, center):
+                inside[idx] = False
+
+        hidden, rows = self.hidden[owner], self.count
+        caughtNow = np.bincount(owner, inside & ~hidden, minlength=rows) > 0
+        seenRate = 30 * self.visibility[owner] / 100 * 0.4 * np.where(crouching[owner], 0.6, 1.0)
+        fast = np.abs(self.velX[owner]) > game.walkSpeed * 0.9
+        rate = np.where(inside, seenRate, 0.0) + np.where(awake & fast & (distance < 220), 20.0, 0.0)
+        self.alertMeter += np.bincount(owner, rate * dt, minlength=rows)
+        spotted = np.bincount(owner, rate > 0, minlength=rows) > 0
+        return caughtNow, spotted
+
+    def observe(self):
+        """(worlds, len(OBS_FIELDS) + OBS_CONES * len(CONE_FIELDS)) float32 observations.
+
+        Cone entries are the eye offset from the player's centre, facing (+1/-1),
+        reach and the cone's half height, for the nearest active enemies; unused
+        entries are zero.
+        """
+        batch, owner = self.enemies, self.owner
+        centerX, centerY = self.playerCenter()
+        exitLeft, exitTop, exitRight, exitBottom = self.exit
+        base = np.column_stack((
+            self.posX, self.posY, self.velX, self.velY, self.coyoteTimer > 0, self.hidden,
+            self.visibility, self.alertMeter, self.orbTotal - self.rescued,
+            (exitLeft[:, 0] + exitRight[:, 0]) / 2 - centerX, (exitTop[:, 0] + exitBottom[:, 0]) / 2 - centerY,
+        ))
+
+        eyeX = np.floor(batch.x + 0.5) + batch.halfWidth - centerX[owner]
+        eyeY = batch.y + batch.eyeOffset - centerY[owner]
+        cones = np.column_stack((eyeX, eyeY, batch.dir, batch.reach, batch.coneB))
+        cones = np.vstack((np.where(batch.active[:, None], cones, 0.0), np.zeros(len(CONE_FIELDS))))
+        distance = np.append(np.where(batch.active, np.hypot(eyeX, eyeY), np.inf), np.inf)
+        nearest = np.argsort(distance[self.enemySlots], axis=1, kind="stable")[:, :OBS_CONES]
+        chosen = self.enemySlots[self.rows[:, None], nearest]
+        return np.hstack((base, cones[chosen].reshape(self.count, -1))).astype(np.float32)
+
+    def world(self, index):
+        """The index-th World with the batched state written back into it."""
+        world, batch = self.worlds[index], self.enemies
+        world.playerPos.update(self.posX[index], self.posY[index])
+        world.playerRect.topleft = (int(self.rectX[index]), int(self.rectY[index]))
+        world.playerVel.update(self.velX[index], self.velY[index])
+        world.onGround = bool(self.onGround[index])
+        world.coyoteTimer = float(self.coyoteTimer[index])
+        world.jumpBuffer = float(self.jumpBuffer[index])
+        world.visibility = float(self.visibility[index])
+        world.alertMeter = float(self.alertMeter[index])
+        world.caught = bool(self.caught[index])
+        world.win = bool(self.win[index])
+        world.rescued = int(self.rescued[index])
+        world.simTime = float(self.simTime[index])
+        for orb, rescued in zip(world.orbs, self.orbRescued[index]):
+            orb.rescued = bool(rescued)
+        for idx in np.flatnonzero(self.owner == index).tolist():
+            enemy = self.enemyList[idx]
+            enemy.posX = float(batch.x[idx])
+            enemy.rect.x = math.floor(enemy.posX + 0.5)
+            enemy.dir = int(batch.dir[idx])
+            enemy.lastUpdate = None
+            enemy.wakeTime = 0.0
+        world.enemyBatch = None
+        return world
@@ -0,0 +1,151 @@
+"""Generate and vet level seeds in parallel.
+
+Every seed is built headlessly with the same generators resetWorld uses, then
+checked against the jump model (MAX_HORIZONTAL_GAP, MAX_JUMP_HEIGHT): each orb
+and the exit must be reachable from the floor. Valid seeds and their stats are
+written to a JSON index.
+
+    python level_batch.py --count 10000 --out seeds.json
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import main as game  # noqa: E402  (the video driver must be chosen before pygame loads)
+
+
+def jumpCounts(nav, start):
+    """Fewest jumps from start to every node it can reach, by breadth-first search.
+
+    PlatformNav.route minimises distance, which can take more hops than needed.
+    """
+    counts = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        node = frontier.popleft()
+        for neighbour, _ in nav.edges[node]:
+            if neighbour not in counts:
+                counts[neighbour] = counts[node] + 1
+                frontier.append(neighbour)
+    return counts
+
+
+def jumpsTo(counts, nav, platforms, rect):
+    """Fewest jumps from the floor to a platform rect can be reached from."""
+    jumps = [
+        counts[node]
+        for node in (nav.findNode(platform) for platform in platforms if game.is_rect_reachable(rect, [platform], [0]))
+        if node in counts
+    ]
+    return min(jumps) if jumps else None
+
+
+def orbJumps(levelData):
+    """Jumps needed for the hardest orb, a rough difficulty score for the seed."""
+    platforms = levelData["platforms"]
+    nav = game.PlatformNav(platforms)
+    counts = jumpCounts(nav, nav.findNode(platforms[0]))
+    jumps = [jumpsTo(counts, nav, platforms, orb.rect) for orb in levelData["orbs"]]
+    jumps = [count for count in jumps if count is not None]
+    return max(jumps) if jumps else None
+
+
+def orbDanger(levelData):
+    """Mean share of the patrol loop each orb sits inside a guard's cone, read off the coverage map."""
+    heat = game.dangerHeatmap(levelData["enemies"])
+    size = game.COVERAGE_CELL
+    orbs = levelData["orbs"]
+    if not orbs:
+        return None
+    danger = [heat.get((orb.rect.centerx // size, orb.rect.centery // size), 0.0) for orb in orbs]
+    return round(sum(danger) / len(danger), 3)
+
+
+def vetSeed(seed):
+    levelData = game.makeLevel(random.Random(seed))
+    platforms = levelData["platforms"]
+    enemies = levelData["enemies"]
+    problems = game.find_unreachable_targets(levelData)
+    return {
+        "seed": seed,
+        "valid": not problems,
+        "problems": problems,
+        "platforms": len(platforms),
+        "reachablePlatforms": len(game.get_reachable_platform_indices(platforms)),
+        "hidingSpots": len(levelData["hidingSpots"]),
+        "orbs": len(levelData["orbs"]),
+        "guards": sum(1 for enemy in enemies if enemy.type == "guard"),
+        "drones": sum(1 for enemy in enemies if enemy.type == "drone"),
+        "orbJumps": orbJumps(levelData),
+        "orbDanger": orbDanger(levelData),
+    }
+
+
+def vetSeeds(seeds, workers=None):
+    """Vet seeds across a process pool, returning results in seed order."""
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return [vetSeed(seed) for seed in seeds]
+    # Large chunks keep the per-task IPC cost negligible next to generation
+    chunksize = max(1, len(seeds) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(vetSeed, seeds, chunksize=chunksize))
+
+
+def summarize(results):
+    valid = [result for result in results if result["valid"]]
+    summary = {"generated": len(results), "valid": len(valid)}
+    for field in ("platforms", "reachablePlatforms", "hidingSpots", "orbs", "guards", "drones", "orbJumps", "orbDanger"):
+        values = [result[field] for result in valid if result[field] is not None]
+        if values:
+            summary[field] = {"min": min(values), "max": max(values), "mean": round(sum(values) / len(values), 2)}
+    problemCounts = {}
+    for result in results:
+        for problem in result["problems"]:
+            kind = problem.split()[0]
+            problemCounts[kind] = problemCounts.get(kind, 0) + 1
+    summary["problems"] = problemCounts
+    return summary
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and vet level seeds in parallel")
+    parser.add_argument("--start", type=int, default=0, help="first seed to generate")
+    parser.add_argument("--count", type=int, default=1000, help="number of consecutive seeds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--out", default="seeds.json", help="where to write the index of valid seeds")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    seeds = list(range(args.start, args.start + args.count))
+    started = time.perf_counter()
+    results = vetSeeds(seeds, args.workers)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results)
+    summary["elapsedSeconds"] = round(elapsed, 3)
+    summary["seedsPerSecond"] = round(len(seeds) / elapsed, 1) if elapsed > 0 else None
+    index = {
+        "summary": summary,
+        "seeds": [{k: v for k, v in result.items() if k not in ("valid", "problems")} for result in results if result["valid"]],
+    }
+    with open(args.out, "w") as handle:
+        json.dump(index, handle, indent=1)
+    print(
+        f"{summary['valid']}/{summary['generated']} seeds valid "
+        f"in {elapsed:.2f}s ({summary['seedsPerSecond']} seeds/s), index written to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,31 @@
+import argparse
+import heapq
+import json
 import math
+import os
 import random
 import sys
-
-import pygame
-
-# Initialization
-pygame.init()
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+# (phase, timestamp) pairs for --startup-report, taken as each startup phase ends
+startupMarks = [("start", time.perf_counter())]
+
+import pygame  # noqa: E402
+
+try:
+    import numpy as np
+except ImportError:  # Only the batched enemy path needs numpy
+    np = None
+startupMarks.append(("import libraries", time.perf_counter()))
+
+# Initialization: only the subsystems the game uses, so no audio or joystick startup
+pygame.display.init()
+pygame.font.init()
+startupMarks.append(("init subsystems", time.perf_counter()))
 width, height = 1280, 720
 levelWidth = 4200
 # Constants
@@ -81,8 +101,14 @@ attackActiveFrame = 3
 hurtFrameCount = 4
 hurtAnimFps = 8
 orbCount = 4
+PLAYER_COLLISION_STEP = 8  # Longest player move between collision checks; platforms are 18 px thick
+MAX_FRAME_DT = 0.1  # Longest step the main loop simulates at once, e.g. to catch up after a hitch
+FRAME_PACING_MODES = ("tick", "tick_busy_loop", "vsync")
+PACING_WINDOW = 600  # Present intervals and input latencies kept for the pacing report
 MAX_HORIZONTAL_GAP = 240
 MAX_JUMP_HEIGHT = (jumpForce * jumpForce) / (2 * gravity)
+NAV_ROUTE_CACHE_SIZE = 512
+SCALED_SPRITE_CACHE_SIZE = 256  # Resized sprites kept for a reduced render scale, least recently drawn dropped first
 LEAF_COUNT = 22
 LEAF_SPEED_MIN = 22
 LEAF_SPEED_MAX = 60
@@ -95,11 +121,29 @@ FIREFLY_MIN_SIZE = 3.2
 FIREFLY_MAX_SIZE = 6.1
 FIREFLY_WRAP_MARGIN = 60
 FOG_HEIGHT = int(height * 0.48)
+# Cosmetic detail per quality level, best first. fogBand is the height of each fog
+# gradient strip. screenTints and coneLayer are the full-screen alpha overlays (alert
+# tint and flash, vision cones); when off they are drawn as a border and cone outlines
+QUALITY_LEVELS = (
+    {"name": "high", "fogBand": 1, "fireflies": 1.0, "leaves": 1.0, "orbGlowLayers": 3, "screenTints": True, "coneLayer": True},
+    {"name": "medium", "fogBand": 4, "fireflies": 0.5, "leaves": 0.5, "orbGlowLayers": 2, "screenTints": False, "coneLayer": True},
+    {"name": "low", "fogBand": 8, "fireflies": 0.25, "leaves": 0.25, "orbGlowLayers": 1, "screenTints": False, "coneLayer": True},
+    {"name": "minimal", "fogBand": 24, "fireflies": 0.0, "leaves": 0.0, "orbGlowLayers": 0, "screenTints": False, "coneLayer": False},
+)
+AMBIENT_ALPHA_MASK = 7  # Firefly and leaf sprites are cached per alpha, with these low bits dropped
+POOL_SIZE_STEP = 8  # Scratch surfaces smaller than POOL_ROUND_BELOW are rounded up to this grid
+POOL_ROUND_BELOW = 128
+QUALITY_WINDOW = 90  # Frames in the rolling frame-time average
+QUALITY_DOWNGRADE_AT = 0.95  # Drop a level when the average frame takes this share of the frame budget
+QUALITY_UPGRADE_AT = 0.6  # Only climb back once a full window averages below this share
+QUALITY_HOLD_SECONDS = 2.0  # Minimum time between switches
 MISSION_LOG_DURATION = 4.2
 MAX_MISSION_LOG_LINES = 4
 enemyTargetCount = 5
 bushSheetColumns = 3
 bushSheetRows = 3
+bushTileCount = bushSheetColumns * bushSheetRows
+BUSH_COLORKEY = (255, 0, 255)  # Transparent colour of the RLE-encoded bush sprites
 
 # Enemy animation constants
 enemyWalkingFrameCount = 9
@@ -108,13 +152,172 @@ enemyWalkAnimFps = 12
 enemyDeathAnimFps = 10
 guardSize = (42, 80)
 droneSize = (48, 48)
+BATCH_VISION_MIN_ENEMIES = 24  # Below this the per-enemy loop is cheaper than numpy overhead
+LOS_GRID_CELL = 128  # Bucket size of the platform index used for line-of-sight queries
+LOS_CACHE_CELL = 24  # Sight lines are re-tested once an endpoint leaves its cell
+ENEMY_LOD_RADIUS = 960  # Enemies further than this from the player are updated at a reduced rate
+ENEMY_LOD_INTERVAL = 0.25  # Longest gap between updates of a far enemy, in seconds
+ENEMY_LOD_MARGIN = 48  # Extra pixels kept between a sleeping enemy's reach and the player
+COVERAGE_CELL = 32  # Grid size of the precomputed patrol coverage map
+COVERAGE_PHASES = 32  # Slices of each enemy's patrol loop in the coverage map
+INVESTIGATE_ALERT = 50  # Alert level that sends nearby guards to the player's last known position
+INVESTIGATE_RADIUS = 900  # Only guards this close to that position respond
+INVESTIGATE_SPEEDUP = 1.6  # Investigating guards move this much faster than they patrol
+INVESTIGATE_LOOK_SECONDS = 2.5  # Time spent looking both ways before heading back
+
+# Streaming level settings (long missions are generated chunk by chunk)
+CHUNK_WIDTH = 1400
+CHUNK_EDGE_MARGIN = 60  # Gap between a chunk's edge platform and the chunk boundary
+CHUNK_EDGE_PLATFORM_WIDTH = 200
+CHUNK_ANCHOR_Y_MIN = 440
+CHUNK_ANCHOR_Y_MAX = 540
+STREAM_CHUNKS_AHEAD = 2
+STREAM_CHUNKS_BEHIND = 1
+ORBS_PER_CHUNK = 1
+ENEMIES_PER_CHUNK = 2
+
+# Files that ship with or are written by the game live next to this script, not in the working directory
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Session telemetry
+TELEMETRY_PATH = os.path.join(GAME_DIR, "telemetry.jsonl")
+TELEMETRY_CAPACITY = 4096  # Events (and frame times) buffered between flushes before the oldest are dropped
+TELEMETRY_FLUSH_SECONDS = 5.0
+TELEMETRY_MAX_BYTES = 1 << 20  # The log is rotated to .1, .2, ... past this size
+TELEMETRY_BACKUPS = 3
+
+# Level files
+LEVEL_FORMAT_VERSION = 1
+TUTORIAL_LEVEL_PATH = os.path.join(GAME_DIR, "levels", "tutorial.json")
+
+# Fonts
+FONT_NAME = "arial"
+FONT_CACHE_PATH = os.path.join(GAME_DIR, ".font_cache.json")
 
 screen = pygame.display.set_mode((width, height))
 pygame.display.set_caption("Whispers of the Canopy")
 clock = pygame.time.Clock()
-font = pygame.font.SysFont("arial", 26)
-bigFont = pygame.font.SysFont("arial", 54)
-smallFont = pygame.font.SysFont("arial", 20)
+startupMarks.append(("open window", time.perf_counter()))
+
+
+class Telemetry:
+    """Session events and frame times in preallocated ring buffers, written out off the main thread.
+
+    record() and frame() only fill the next slot and bump a counter. A
+    background thread wakes every TELEMETRY_FLUSH_SECONDS, turns whatever was
+    added since its last pass into JSON lines (frame times become a
+    percentile summary) and appends them to path, rotating the file past
+    TELEMETRY_MAX_BYTES. If the game laps the writer, the overwritten events
+    are counted as dropped.
+    """
+
+    def __init__(self, path, capacity=TELEMETRY_CAPACITY):
+        self.path = path
+        self.capacity = capacity
+        self.events = [None] * capacity
+        self.frameTimes = array("d", bytes(8 * capacity))
+        self.written = self.flushed = 0
+        self.framesWritten = self.framesFlushed = 0
+        self.session = time.strftime("%Y%m%d-%H%M%S")
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="telemetry", daemon=True)
+        self.record("session", pid=os.getpid())
+        self.thread.start()
+
+    def record(self, kind, **fields):
+        self.events[self.written % self.capacity] = (time.time(), kind, fields)
+        self.written += 1
+
+    def frame(self, seconds):
+        self.frameTimes[self.framesWritten % self.capacity] = seconds
+        self.framesWritten += 1
+
+    def run(self):
+        while not self.stopping.wait(TELEMETRY_FLUSH_SECONDS):
+            self.flush()
+        self.flush()
+
+    def close(self):
+        self.record("end")
+        self.stopping.set()
+        self.thread.join()
+
+    def line(self, stamp, kind, fields):
+        return json.dumps({"session": self.session, "time": round(stamp, 3), "kind": kind, **fields})
+
+    def flush(self):
+        lines = []
+        written = self.written
+        start = max(self.flushed, written - self.capacity)
+        if start > self.flushed:
+            lines.append(self.line(time.time(), "dropped", {"events": start - self.flushed}))
+        for index in range(start, written):
+            lines.append(self.line(*self.events[index % self.capacity]))
+        self.flushed = written
+
+        framesWritten = self.framesWritten
+        first = max(self.framesFlushed, framesWritten - self.capacity)
+        if framesWritten > first:
+            times = sorted(self.frameTimes[index % self.capacity] for index in range(first, framesWritten))
+            count = len(times)
+            summary = {"count": count, "max": round(times[-1] * 1000, 2)}
+            for name, share in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+                summary[name] = round(times[min(count - 1, int(share * count))] * 1000, 2)
+            lines.append(self.line(time.time(), "frames", summary))
+        self.framesFlushed = framesWritten
+
+        if not lines:
+            return
+        try:
+            if os.path.exists(self.path) and os.path.getsize(self.path) > TELEMETRY_MAX_BYTES:
+                self.rotate()
+            with open(self.path, "a") as handle:
+                handle.write("\n".join(lines) + "\n")
+        except OSError:
+            pass  # Telemetry must never take the game down
+
+    def rotate(self):
+        for index in range(TELEMETRY_BACKUPS - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+sessionTelemetry = None  # Set by main() when asked for with --telemetry
+
+
+def resolveFontPath(name):
+    """Font file for a system font name, or None for pygame's default font.
+
+    Finding a system font can scan every installed font, so the answer is kept
+    in FONT_CACHE_PATH and reused until the file it names disappears. Headless
+    runs (the batch tools and their workers) read the cache but never write it.
+    """
+    try:
+        with open(FONT_CACHE_PATH) as handle:
+            cache = json.load(handle)
+    except (OSError, ValueError):
+        cache = {}
+    path = cache.get(name)
+    if name not in cache or (path is not None and not os.path.exists(path)):
+        path = pygame.font.match_font(name)
+        cache[name] = path
+        if os.environ.get("SDL_VIDEODRIVER") == "dummy":
+            return path
+        try:
+            with open(FONT_CACHE_PATH, "w") as handle:
+                json.dump(cache, handle)
+        except OSError:
+            pass
+    return path
+
+
+fontPath = resolveFontPath(FONT_NAME)
+font = pygame.font.Font(fontPath, 26)
+bigFont = pygame.font.Font(fontPath, 54)
+smallFont = pygame.font.Font(fontPath, 20)
+startupMarks.append(("load fonts", time.perf_counter()))
 
 
 def loadFrames(path, frameCount):
@@ -169,6 +372,40 @@ def removeWhitePixels(surface, tolerance=4):
     return cleaned
 
 
+def normalizeSprite(sprite):
+    """sprite in the display format, so blitting it never converts pixels.
+
+    Colorkeyed sprites are RLE-encoded, which skips their transparent runs
+    outright; everything else gets the display's per-pixel alpha layout.
+    """
+    key = sprite.get_colorkey()
+    if key is None:
+        return sprite.convert_alpha()
+    sprite = sprite.convert()
+    sprite.set_colorkey(key, pygame.RLEACCEL)
+    return sprite
+
+
+def normalizeAssets(value):
+    """normalizeSprite applied to every surface in a loaded frame dict or sprite list."""
+    if isinstance(value, pygame.Surface):
+        return normalizeSprite(value)
+    if isinstance(value, dict):
+        return {key: normalizeAssets(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [normalizeAssets(item) for item in value]
+    return value
+
+
+def colorkeySprite(sprite, key=BUSH_COLORKEY):
+    """Opaque copy of an all-or-nothing alpha sprite with its clear pixels colorkeyed out."""
+    keyed = pygame.Surface(sprite.get_size()).convert()
+    keyed.fill(key)
+    keyed.blit(sprite, (0, 0))
+    keyed.set_colorkey(key, pygame.RLEACCEL)
+    return keyed
+
+
 def loadBushSprites(path, columns=3, rows=3):
     try:
         sheet = pygame.image.load(path).convert()
@@ -187,7 +424,8 @@ def loadBushSprites(path, columns=3, rows=3):
             rect = pygame.Rect(offsetX + col * tileWidth, offsetY + row * tileHeight, tileWidth, tileHeight)
             frame = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
             frame.blit(sheet, (0, 0), rect)
-            frames.append(removeWhitePixels(frame))
+            # The sheet has no alpha, so a cleaned tile is fully opaque or fully clear
+            frames.append(colorkeySprite(removeWhitePixels(frame)))
     return frames
 
 
@@ -224,11 +462,185 @@ def get_reachable_platform_indices(platforms):
     return visible
 
 
-def scaleBushSprite(width, height, rng):
-    if not bushSprites:
+def is_rect_reachable(rect, platforms, reachable):
+    """Whether the player can touch rect while standing on, or jumping from, a reachable platform."""
+    playerHeight = playerSize[1] - PLAYER_HITBOX_OFFSET_TOP - PLAYER_HITBOX_OFFSET_BOTTOM
+    for idx in reachable:
+        platform = platforms[idx]
+        if rect.right <= platform.left or rect.left >= platform.right:
+            continue
+        if platform.top - playerHeight - MAX_JUMP_HEIGHT < rect.bottom and rect.top < platform.top:
+            return True
+    return False
+
+
+def find_unreachable_targets(levelData):
+    """Names of the orbs and exit that the jump model cannot reach from the floor."""
+    platforms = levelData["platforms"]
+    reachable = get_reachable_platform_indices(platforms)
+    problems = [f"orb {idx}" for idx, orb in enumerate(levelData["orbs"]) if not is_rect_reachable(orb.rect, platforms, reachable)]
+    if not is_rect_reachable(levelData["exitRect"], platforms, reachable):
+        problems.append("exit")
+    return problems
+
+
+def linkCost(source, target):
+    """Distance from the top centre of source to the nearest point on target's top edge."""
+    landingX = min(max(source.centerx, target.left), target.right)
+    return math.hypot(landingX - source.centerx, target.top - source.top)
+
+
+class PlatformNav:
+    """Jump graph over platforms for shortest-route queries.
+
+    Nodes are platforms and edges join every pair canLink accepts (checked in
+    each direction), weighted by the jump from the source's top centre to the
+    nearest point on the target's top edge. Platforms are bucketed
+    by x so adding one only tests its horizontal neighbours, and routes are
+    kept in an LRU cache keyed by (from node, to node).
+    """
+
+    def __init__(self, platforms=(), cacheSize=NAV_ROUTE_CACHE_SIZE, canLink=can_link_platforms):
+        self.canLink = canLink
+        self.platforms = []
+        self.nodeOf = {}
+        self.edges = []
+        self.buckets = {}
+        self.bucketWidth = MAX_HORIZONTAL_GAP
+        self.routes = OrderedDict()
+        self.cacheSize = cacheSize
+        self.synced = None
+        self.addPlatforms(platforms)
+
+    def bucketRange(self, left, right):
+        return range(int(left) // self.bucketWidth, int(right) // self.bucketWidth + 1)
+
+    def addPlatform(self, platform):
+        key = (platform.x, platform.y, platform.width, platform.height)
+        node = self.nodeOf.get(key)
+        if node is not None:
+            return node
+        node = len(self.platforms)
+        self.platforms.append(pygame.Rect(platform))
+        self.nodeOf[key] = node
+        self.edges.append([])
+        candidates = set()
+        for bucket in self.bucketRange(platform.left - MAX_HORIZONTAL_GAP, platform.right + MAX_HORIZONTAL_GAP):
+            candidates.update(self.buckets.get(bucket, ()))
+        for other in candidates:
+            target = self.platforms[other]
+            if self.canLink(platform, target):
+                self.edges[node].append((other, linkCost(platform, target)))
+            if self.canLink(target, platform):
+                self.edges[other].append((node, linkCost(target, platform)))
+        for bucket in self.bucketRange(platform.left, platform.right):
+            self.buckets.setdefault(bucket, []).append(node)
+        # New edges can shorten routes that were already cached
+        self.routes.clear()
+        return node
+
+    def addPlatforms(self, platforms):
+        for platform in platforms:
+            self.addPlatform(platform)
+
+    def removePlatforms(self, platforms):
+        """Drop platforms from the graph, e.g. when their stream chunk is evicted.
+
+        Node numbers are positions in self.platforms, so a removed node stays as
+        an unlinked None slot; cached routes are cleared since some ran through it.
+        """
+        removed = set()
+        for platform in platforms:
+            node = self.nodeOf.pop((platform.x, platform.y, platform.width, platform.height), None)
+            if node is None:
+                continue
+            removed.add(node)
+            rect = self.platforms[node]
+            for bucket in self.bucketRange(rect.left, rect.right):
+                self.buckets[bucket].remove(node)
+            self.platforms[node] = None
+            self.edges[node] = []
+        if removed:
+            self.edges = [[edge for edge in edges if edge[0] not in removed] for edges in self.edges]
+            self.routes.clear()
+
+    def findNode(self, platform):
+        return self.nodeOf.get((platform.x, platform.y, platform.width, platform.height))
+
+    def route(self, start, goal):
+        """Shortest node route from start to goal, or None when goal is out of reach."""
+        key = (start, goal)
+        if key in self.routes:
+            self.routes.move_to_end(key)
+            return self.routes[key]
+        path = self.search(start, goal)
+        self.routes[key] = path
+        if len(self.routes) > self.cacheSize:
+            self.routes.popitem(last=False)
+        return path
+
+    def search(self, start, goal):
+        platforms = self.platforms
+        goalY = platforms[goal].top
+
+        def estimate(node):
+            # Landing anywhere on a platform's top edge makes horizontal travel
+            # hard to bound, but every route still climbs or drops the full height
+            return abs(goalY - platforms[node].top)
+
+        best = {start: 0.0}
+        cameFrom = {}
+        frontier = [(estimate(start), start)]
+        closed = set()
+        while frontier:
+            _, node = heapq.heappop(frontier)
+            if node == goal:
+                path = [node]
+                while node in cameFrom:
+                    node = cameFrom[node]
+                    path.append(node)
+                return tuple(reversed(path))
+            if node in closed:
+                continue
+            closed.add(node)
+            for neighbour, cost in self.edges[node]:
+                score = best[node] + cost
+                if score < best.get(neighbour, math.inf):
+                    best[neighbour] = score
+                    cameFrom[neighbour] = node
+                    heapq.heappush(frontier, (score + estimate(neighbour), neighbour))
+        return None
+
+
+def getPlatformNav(world):
+    nav = world.platformNav
+    if nav is None:
+        nav = world.platformNav = PlatformNav()
+    if nav.synced is not world.platforms:
+        # Streaming swaps in a new list: evicted platforms are pruned, and ones already in the graph are skipped
+        current = {(p.x, p.y, p.width, p.height) for p in world.platforms}
+        nav.removePlatforms([p for p in nav.platforms if p is not None and (p.x, p.y, p.width, p.height) not in current])
+        nav.addPlatforms(world.platforms)
+        nav.synced = world.platforms
+    return nav
+
+
+def scaleBushSprite(width, height, spriteIndex):
+    if not bushSprites or spriteIndex is None:
         return None
-    baseSprite = rng.choice(bushSprites)
-    return pygame.transform.scale(baseSprite, (width, height)).convert_alpha()
+    baseSprite = bushSprites[spriteIndex % len(bushSprites)]
+    return normalizeSprite(pygame.transform.scale(baseSprite, (width, height)))
+
+
+def attachBushSprites(spots):
+    """Give generated hiding spots their scaled sheet tile.
+
+    Generation only picks the tile index, so levels can be built without a
+    display or loaded sprites.
+    """
+    for spot in spots:
+        if spot.sprite is None and spot.type == "bush":
+            spot.sprite = scaleBushSprite(spot.rect.width, spot.rect.height, spot.spriteIndex)
 
 
 def loadAnimalSprites(path, targetSize=(24, 24)):
@@ -274,7 +686,7 @@ def loadAnimalSprites(path, targetSize=(24, 24)):
                     
                     # Scale to target size and add to list
                     scaled = pygame.transform.smoothscale(tileSurface, targetSize)
-                    sprites.append(scaled)
+                    sprites.append(scaled.convert_alpha())
             
             # If we found content in multiple tiles (at least 4), it's likely a sprite sheet
             # Otherwise, treat the whole image as a single sprite
@@ -283,24 +695,35 @@ def loadAnimalSprites(path, targetSize=(24, 24)):
             else:
                 # Treat as single image - scale the whole thing
                 scaled = pygame.transform.smoothscale(sheet, targetSize)
-                return [scaled]
+                return [scaled.convert_alpha()]
         
         # For any other size, treat as single image
         scaled = pygame.transform.smoothscale(sheet, targetSize)
-        return [scaled]
+        return [scaled.convert_alpha()]
     except Exception:
         # If loading fails, return empty list (fallback to circle will be used)
         return []
 
 
-playerRunFrames = safeLoadFrames("assets/RUN.png", runFrameCount)
-playerAttackFrames = safeLoadFrames("assets/ATTACK.png", attackFrameCount)
-playerHurtFrames = safeLoadFrames("assets/HURT.png", hurtFrameCount)
-bushSprites = loadBushSprites("assets/BUSH.png", bushSheetColumns, bushSheetRows)
+playerRunFrames = None
+playerAttackFrames = None
+playerHurtFrames = None
+bushSprites = []
 
 # Enemy sprites
-enemyWalkingFrames = loadEnemyFrames("assets/EnemyWalking.png", enemyWalkingFrameCount, guardSize)
-enemyDeathFrames = loadEnemyFrames("assets/EnemyDeath.png", enemyDeathFrameCount, guardSize)
+enemyWalkingFrames = None
+enemyDeathFrames = None
+
+# Sheets are decoded on worker threads; each global above keeps its fallback
+# until pollAssetLoading installs the loaded value on the main thread
+assetLoaders = (
+    ("playerRunFrames", safeLoadFrames, ("assets/RUN.png", runFrameCount)),
+    ("playerAttackFrames", safeLoadFrames, ("assets/ATTACK.png", attackFrameCount)),
+    ("playerHurtFrames", safeLoadFrames, ("assets/HURT.png", hurtFrameCount)),
+    ("bushSprites", loadBushSprites, ("assets/BUSH.png", bushSheetColumns, bushSheetRows)),
+    ("enemyWalkingFrames", loadEnemyFrames, ("assets/EnemyWalking.png", enemyWalkingFrameCount, guardSize)),
+    ("enemyDeathFrames", loadEnemyFrames, ("assets/EnemyDeath.png", enemyDeathFrameCount, guardSize)),
+)
 
 # Orb settings
 orbSize = 20
@@ -333,6 +756,178 @@ def computePlayerHitbox():
 playerHitboxSize, playerSpriteOffsets = computePlayerHitbox()
 
 
+def startAssetLoading(executor):
+    return {executor.submit(loader, *args): name for name, loader, args in assetLoaders}
+
+
+def pollAssetLoading(pending):
+    """Install the assets that finished loading and return the fraction done."""
+    global playerHitboxSize, playerSpriteOffsets
+    finished = [future for future in pending if future.done()]
+    for future in finished:
+        globals()[pending.pop(future)] = normalizeAssets(future.result())
+    if finished:
+        playerHitboxSize, playerSpriteOffsets = computePlayerHitbox()
+    return 1.0 - len(pending) / len(assetLoaders)
+
+
+class HidingSpot:
+    __slots__ = ("rect", "strength", "color", "type", "solid", "spriteIndex", "sprite")
+
+    def __init__(self, rect, strength, color=bushColor, type="bush", solid=False, spriteIndex=None, sprite=None):
+        self.rect = rect
+        self.strength = strength
+        self.color = color
+        self.type = type
+        self.solid = solid
+        self.spriteIndex = spriteIndex  # Tile of the bush sheet, picked at generation time
+        self.sprite = sprite
+
+
+class Orb:
+    __slots__ = ("rect", "rescued", "pulsePhase", "key")
+
+    def __init__(self, rect, rescued=False, pulsePhase=0.0, key=None):
+        self.rect = rect
+        self.rescued = rescued
+        self.pulsePhase = pulsePhase
+        self.key = key
+
+
+class Enemy:
+    __slots__ = (
+        "rect", "path", "speed", "dir", "vision", "type", "active",
+        "animTime", "animFrame", "deathAnimTime", "deathAnimFrame", "cone", "coneKey",
+        "losKey", "losBlocked", "posX", "lastUpdate", "wakeTime", "key", "coverage",
+        "task", "waypoints", "searchTime", "home", "posY",
+    )
+
+    def __init__(self, rect, path, speed, dir, vision, type, active=True, animTime=0.0, key=None):
+        self.rect = rect
+        self.path = path
+        self.speed = speed
+        self.dir = dir
+        self.vision = vision
+        self.type = type
+        self.active = active
+        self.animTime = animTime
+        self.animFrame = 0
+        self.deathAnimTime = 0.0
+        self.deathAnimFrame = 0
+        self.cone = []
+        self.coneKey = None
+        self.losKey = None
+        self.losBlocked = False
+        self.posX = float(rect.x)  # Sub-pixel patrol position; rect.x is this rounded
+        self.lastUpdate = None  # Simulation time of the last patrol update
+        self.wakeTime = 0.0  # Skipped until the simulation reaches this time
+        self.key = key
+        self.coverage = None  # Cached patrolCoverage(self); the patrol never changes shape
+        self.task = None  # "investigate" or "return" while off patrol
+        self.waypoints = None  # (left, top) points still to walk to while off patrol
+        self.searchTime = 0.0
+        self.home = None  # (posX, rect.y, dir, platform) to resume the patrol from
+        self.posY = float(rect.y)
+
+
+class Particle:
+    __slots__ = ("pos", "dir", "life")
+
+    def __init__(self, pos, dir, life):
+        self.pos = pos
+        self.dir = dir
+        self.life = life
+
+
+class Leaf:
+    __slots__ = ("x", "y", "speed", "length", "sway", "direction")
+
+    def __init__(self, x, y, speed, length, sway, direction):
+        self.x = x
+        self.y = y
+        self.speed = speed
+        self.length = length
+        self.sway = sway
+        self.direction = direction
+
+
+class Firefly:
+    __slots__ = ("x", "y", "vx", "vy", "size", "pulse")
+
+    def __init__(self, x, y, vx, vy, size, pulse):
+        self.x = x
+        self.y = y
+        self.vx = vx
+        self.vy = vy
+        self.size = size
+        self.pulse = pulse
+
+
+class World:
+    """Everything that changes while a level is being played."""
+
+    __slots__ = (
+        "playerRect", "playerPos", "playerVel", "platforms", "hidingSpots", "orbs", "enemies",
+        "exitRect", "visibility", "alertMeter", "rescued", "cameraX", "onGround", "coyoteTimer",
+        "jumpBuffer", "animFrame", "animTime", "facing", "attacking", "attackCooldown", "attackRect",
+        "attackAnimFrame", "attackAnimTime", "caught", "win", "flashAmount", "particles", "rng",
+        "leaves", "fireflies", "fog_shift", "missionLog", "alertLogCooldown", "stealthState",
+        "tutorialHints", "isTutorial", "levelStream", "levelWidth", "orbTotal", "enemyBatch",
+        "platformGrid", "platformNav", "simTime", "lodRadius", "seed", "coverageMap", "lastSeen",
+    )
+
+    def __init__(self, playerRect, platforms, hidingSpots, orbs, enemies, exitRect, rng, **extra):
+        self.playerRect = playerRect
+        self.playerPos = pygame.Vector2(playerRect.x, playerRect.y)
+        self.playerVel = pygame.Vector2(0, 0)
+        self.platforms = platforms
+        self.hidingSpots = hidingSpots
+        self.orbs = orbs
+        self.enemies = enemies
+        self.exitRect = exitRect
+        self.visibility = 35.0
+        self.alertMeter = 0.0
+        self.rescued = 0
+        self.cameraX = 0.0
+        self.onGround = False
+        self.coyoteTimer = 0.0
+        self.jumpBuffer = 0.0
+        self.animFrame = 0
+        self.animTime = 0.0
+        self.facing = 1
+        self.attacking = False
+        self.attackCooldown = 0.0
+        self.attackRect = None
+        self.attackAnimFrame = 0
+        self.attackAnimTime = 0.0
+        self.caught = False
+        self.win = False
+        self.flashAmount = 0.0
+        self.particles = []
+        self.rng = rng
+        self.leaves = []
+        self.fireflies = []
+        self.fog_shift = 0.0
+        self.missionLog = []
+        self.alertLogCooldown = 0.0
+        self.stealthState = "idle"
+        self.tutorialHints = []
+        self.isTutorial = False
+        self.levelStream = None
+        self.levelWidth = levelWidth
+        self.orbTotal = len(orbs)
+        self.enemyBatch = None
+        self.platformGrid = None
+        self.platformNav = None
+        self.simTime = 0.0
+        self.lodRadius = ENEMY_LOD_RADIUS
+        self.seed = None
+        self.coverageMap = None
+        self.lastSeen = None  # Player's feet when an enemy last noticed them
+        for name, value in extra.items():
+            setattr(self, name, value)
+
+
 def makePlatforms(rng):
     floorRect = pygame.Rect(0, 640, levelWidth, 120)
     mainPlatforms = [floorRect]
@@ -364,9 +959,10 @@ def makePlatforms(rng):
     return mainPlatforms
 
 
-def makeHidingSpots(rng, platforms):
+def makeHidingSpots(rng, platforms, count=None):
     spots = []
-    count = rng.randint(8, 12)
+    if count is None:
+        count = rng.randint(8, 12)
 
     def placeBushOnSurface(width, height):
         candidates = [p for p in platforms if p.width >= width + 20]
@@ -400,21 +996,12 @@ def makeHidingSpots(rng, platforms):
                 width,
                 height,
             )
-        sprite = scaleBushSprite(rect.width, rect.height, rng) if template["type"] == "bush" else None
-        spots.append(
-            {
-                "rect": rect,
-                "strength": template["strength"],
-                "color": template["color"],
-                "type": template["type"],
-                "solid": template["solid"],
-                "sprite": sprite,
-            }
-        )
+        spriteIndex = rng.randrange(bushTileCount) if template["type"] == "bush" else None
+        spots.append(HidingSpot(rect, template["strength"], template["color"], template["type"], template["solid"], spriteIndex))
     return spots
 
 
-def makeOrbs(rng, platforms):
+def makeOrbs(rng, platforms, count=orbCount):
     orbs = []
     perches = [p for p in platforms if p.height <= 20 and p.width > 40 and p.top <= 620]
     platform_index_map = {id(p): idx for idx, p in enumerate(platforms)}
@@ -423,7 +1010,7 @@ def makeOrbs(rng, platforms):
     perch_candidates = reachable_perches or perches or [platforms[0]]
     attempts = 0
 
-    while len(orbs) < orbCount and attempts < orbCount * 4:
+    while len(orbs) < count and attempts < count * 4:
         attempts += 1
         platform = rng.choice(perch_candidates)
         left = platform.left + 10
@@ -432,11 +1019,7 @@ def makeOrbs(rng, platforms):
             continue
         x = rng.randint(left, right)
         y = platform.top - orbSize - 5
-        orbs.append({
-            "rect": pygame.Rect(x, y, orbSize * 2, orbSize * 2),
-            "rescued": False,
-            "pulsePhase": rng.uniform(0, math.tau),
-        })
+        orbs.append(Orb(pygame.Rect(x, y, orbSize * 2, orbSize * 2), pulsePhase=rng.uniform(0, math.tau)))
 
     return orbs
 
@@ -445,14 +1028,14 @@ def make_leaves(rng):
     leaves = []
     for _ in range(LEAF_COUNT):
         leaves.append(
-            {
-                "x": rng.uniform(0, levelWidth),
-                "y": rng.uniform(40, 620),
-                "speed": rng.uniform(LEAF_SPEED_MIN, LEAF_SPEED_MAX),
-                "length": rng.uniform(LEAF_LENGTH_MIN, LEAF_LENGTH_MAX),
-                "sway": rng.uniform(0, math.tau),
-                "direction": 1 if rng.random() < 0.5 else -1,
-            }
+            Leaf(
+                x=rng.uniform(0, levelWidth),
+                y=rng.uniform(40, 620),
+                speed=rng.uniform(LEAF_SPEED_MIN, LEAF_SPEED_MAX),
+                length=rng.uniform(LEAF_LENGTH_MIN, LEAF_LENGTH_MAX),
+                sway=rng.uniform(0, math.tau),
+                direction=1 if rng.random() < 0.5 else -1,
+            )
         )
     return leaves
 
@@ -460,69 +1043,83 @@ def make_leaves(rng):
 def make_fireflies(rng):
     fly_list = []
     for _ in range(FIREFLY_COUNT):
-        fly_list.append({
-            "x": rng.uniform(0, levelWidth),
-            "y": rng.uniform(130, 520),
-            "vx": rng.uniform(-FIREFLY_MAX_SPEED, FIREFLY_MAX_SPEED),
-            "vy": rng.uniform(-12, 12),
-            "size": rng.uniform(FIREFLY_MIN_SIZE, FIREFLY_MAX_SIZE),
-            "pulse": rng.uniform(0, math.tau),
-        })
+        fly_list.append(Firefly(
+            x=rng.uniform(0, levelWidth),
+            y=rng.uniform(130, 520),
+            vx=rng.uniform(-FIREFLY_MAX_SPEED, FIREFLY_MAX_SPEED),
+            vy=rng.uniform(-12, 12),
+            size=rng.uniform(FIREFLY_MIN_SIZE, FIREFLY_MAX_SIZE),
+            pulse=rng.uniform(0, math.tau),
+        ))
     return fly_list
 
 
+def get_ambient_span(world):
+    """Horizontal range that leaves and fireflies wrap around in."""
+    if not world.levelStream:
+        return 0, levelWidth
+    left = world.cameraX + width / 2 - levelWidth / 2
+    return left, left + levelWidth
+
+
 def update_fireflies(world, dt):
-    flies = world.get("fireflies")
+    flies = world.fireflies
     if not flies:
         return
+    spanLeft, spanRight = get_ambient_span(world)
     for fly in flies:
-        fly["x"] += fly["vx"] * dt
-        fly["y"] += fly["vy"] * dt
-        fly["pulse"] += dt * 1.5
+        fly.x += fly.vx * dt
+        fly.y += fly.vy * dt
+        fly.pulse += dt * 1.5
 
-        if fly["x"] < -FIREFLY_WRAP_MARGIN:
-            fly["x"] = levelWidth + FIREFLY_WRAP_MARGIN
-        elif fly["x"] > levelWidth + FIREFLY_WRAP_MARGIN:
-            fly["x"] = -FIREFLY_WRAP_MARGIN
+        if fly.x < spanLeft - FIREFLY_WRAP_MARGIN:
+            fly.x = spanRight + FIREFLY_WRAP_MARGIN
+        elif fly.x > spanRight + FIREFLY_WRAP_MARGIN:
+            fly.x = spanLeft - FIREFLY_WRAP_MARGIN
 
-        if fly["y"] < 110:
-            fly["y"] = 110
-        elif fly["y"] > 560:
-            fly["y"] = 560
+        if fly.y < 110:
+            fly.y = 110
+        elif fly.y > 560:
+            fly.y = 560
 
-    world["fog_shift"] = world.get("fog_shift", 0.0) + dt * 0.35
+    world.fog_shift = world.fog_shift + dt * 0.35
 
 
 def update_leaves(world, dt):
-    leaves = world.get("leaves")
+    leaves = world.leaves
     if not leaves:
         return
-    rng = world.get("rng") or random.Random()
+    rng = world.rng or random.Random()
+    spanLeft, spanRight = get_ambient_span(world)
     for leaf in leaves:
-        leaf["x"] += leaf["direction"] * leaf["speed"] * 0.18 * dt
-        leaf["y"] += (8 + math.sin(leaf["sway"]) * 4) * dt
-        leaf["sway"] += dt * 1.1
+        leaf.x += leaf.direction * leaf.speed * 0.18 * dt
+        leaf.y += (8 + math.sin(leaf.sway) * 4) * dt
+        leaf.sway += dt * 1.1
 
-        if leaf["y"] > 660:
-            leaf["y"] = rng.uniform(40, 160)
-            leaf["x"] = rng.uniform(-40, levelWidth + 40)
-        if leaf["x"] < -40:
-            leaf["x"] = levelWidth + 40
-        elif leaf["x"] > levelWidth + 40:
-            leaf["x"] = -40
+        if leaf.y > 660:
+            leaf.y = rng.uniform(40, 160)
+            leaf.x = rng.uniform(spanLeft - 40, spanRight + 40)
+        if leaf.x < spanLeft - 40:
+            leaf.x = spanRight + 40
+        elif leaf.x > spanRight + 40:
+            leaf.x = spanLeft - 40
 
 
 def push_mission_log(world, text):
     if not text:
         return
-    log = world.setdefault("missionLog", [])
+    if sessionTelemetry is not None:
+        # Detections and orb pickups all announce themselves here
+        center = world.playerRect.center
+        sessionTelemetry.record("log", text=text, x=center[0], y=center[1], simTime=round(world.simTime, 3))
+    log = world.missionLog
     log.insert(0, {"text": text, "timer": MISSION_LOG_DURATION})
     if len(log) > MAX_MISSION_LOG_LINES:
         log.pop()
 
 
 def update_mission_log(world, dt):
-    log = world.get("missionLog")
+    log = world.missionLog
     if not log:
         return
     for idx in range(len(log) - 1, -1, -1):
@@ -531,12 +1128,13 @@ def update_mission_log(world, dt):
             log.pop(idx)
 
 
-def makeEnemies(rng, platforms):
+def makeEnemies(rng, platforms, count=enemyTargetCount, bounds=(0, levelWidth)):
     enemies = []
     perches = [p for p in platforms if p.height <= 20 and p.width > 80]
+    minBound, maxBound = bounds
     attempts = 0
 
-    while len(enemies) < enemyTargetCount and attempts < enemyTargetCount * 6:
+    while len(enemies) < count and attempts < count * 6:
         attempts += 1
         isGuard = rng.random() < 0.65
         if isGuard and perches:
@@ -549,9 +1147,9 @@ def makeEnemies(rng, platforms):
             x = rng.randint(minX, maxX)
             y = platform.top - height
             roam = rng.randint(140, min(420, platform.width + 200))
-            pathLeft = max(0, x - roam // 2)
-            pathRight = min(levelWidth, pathLeft + roam)
-            pathLeft = max(0, pathRight - roam)
+            pathLeft = max(minBound, x - roam // 2)
+            pathRight = min(maxBound, pathLeft + roam)
+            pathLeft = max(minBound, pathRight - roam)
             maxPos = pathRight - width
             if maxPos <= pathLeft:
                 continue
@@ -561,12 +1159,12 @@ def makeEnemies(rng, platforms):
             enemyType = "guard"
         else:
             width, height = 48, 48
-            x = rng.randint(100, levelWidth - width - 100)
+            x = rng.randint(minBound + 100, maxBound - width - 100)
             y = rng.randint(320, 460)
             roam = rng.randint(220, 420)
-            pathLeft = max(0, x - roam // 2)
-            pathRight = min(levelWidth, pathLeft + roam)
-            pathLeft = max(0, pathRight - roam)
+            pathLeft = max(minBound, x - roam // 2)
+            pathRight = min(maxBound, pathLeft + roam)
+            pathLeft = max(minBound, pathRight - roam)
             maxPos = pathRight - width
             if maxPos <= pathLeft:
                 continue
@@ -576,91 +1174,271 @@ def makeEnemies(rng, platforms):
             enemyType = "drone"
 
         enemies.append(
-            {
-                "rect": pygame.Rect(x, y, width, height),
-                "path": (pathLeft, pathRight),
-                "speed": speed,
-                "dir": 1 if rng.random() < 0.5 else -1,
-                "vision": vision,
-                "type": enemyType,
-                "active": True,
-                "animTime": rng.uniform(0, 1.0 / enemyWalkAnimFps),
-                "animFrame": 0,
-                "deathAnimTime": 0.0,
-                "deathAnimFrame": 0,
-            }
+            Enemy(
+                rect=pygame.Rect(x, y, width, height),
+                path=(pathLeft, pathRight),
+                speed=speed,
+                dir=1 if rng.random() < 0.5 else -1,
+                vision=vision,
+                type=enemyType,
+                animTime=rng.uniform(0, 1.0 / enemyWalkAnimFps),
+            )
         )
 
     return enemies
 
 
-def makeTutorialLevel(rng):
-    floorRect = pygame.Rect(0, 640, levelWidth, 120)
-    platforms = [
-        floorRect,
-        pygame.Rect(200, 560, 180, 18),
-        pygame.Rect(520, 520, 200, 18),
-        pygame.Rect(860, 500, 220, 18),
-        pygame.Rect(1180, 470, 220, 18),
-        pygame.Rect(1500, 520, 220, 18),
-    ]
+def makeTutorialLevel():
+    return loadLevel(TUTORIAL_LEVEL_PATH)
 
-    def bush(rect, strength=0.25):
-        return {
-            "rect": rect,
-            "strength": strength,
-            "color": bushColor,
-            "type": "bush",
-            "solid": False,
-            "sprite": scaleBushSprite(rect.width, rect.height, rng),
-        }
 
-    hidingSpots = [
-        bush(pygame.Rect(120, 580, 140, 70), 0.25),
-        bush(pygame.Rect(460, 540, 150, 70), 0.3),
-        bush(pygame.Rect(1020, 500, 150, 70), 0.28),
-    ]
+def makeLevel(rng):
+    """Generate a fixed-width level layout; bush sprites are attached separately."""
+    platforms = makePlatforms(rng)
+    hidingSpots = makeHidingSpots(rng, platforms)
+    orbs = makeOrbs(rng, platforms)
+    enemies = makeEnemies(rng, platforms)
+    return {
+        "platforms": platforms,
+        "hidingSpots": hidingSpots,
+        "orbs": orbs,
+        "enemies": enemies,
+        "exitRect": pygame.Rect(levelWidth - 160, 420, 90, 220),
+        "tutorialHints": [],
+    }
 
-    orbs = [
-        {"rect": pygame.Rect(580, 460, orbSize * 2, orbSize * 2), "rescued": False, "pulsePhase": 0.0},
-        {"rect": pygame.Rect(1250, 410, orbSize * 2, orbSize * 2), "rescued": False, "pulsePhase": math.pi},
-    ]
-    
-    enemies = [
-        {
-            "rect": pygame.Rect(900, 440, 42, 80),
-            "path": (850, 1150),
-            "speed": 70,
-            "dir": 1,
-            "vision": (260, 150),
-            "type": "guard",
-            "active": True,
-            "animTime": 0.0,
-            "animFrame": 0,
-            "deathAnimTime": 0.0,
-            "deathAnimFrame": 0,
-        }
-    ]
 
-    exitRect = pygame.Rect(1650, 380, 90, 220)
-    tutorialHints = [
-        {"text": "Use A/D to move and SPACE to jump", "pos": (50, 90)},
-        {"text": "Press S to crouch in bushes to stay hidden", "pos": (320, 180)},
-        {"text": "Collect the glowing orbs, then head to the exit", "pos": (520, 120)},
-        {"text": "Left click to attack if you need to fight", "pos": (760, 60)},
-    ]
+def levelToData(levelData):
+    """Flatten a level into the compact, JSON-friendly level file layout.
+
+    Every entity is a flat list in a fixed field order:
+      platforms    [x, y, w, h]
+      hidingSpots  [x, y, w, h, strength, bush sheet tile]
+      orbs         [x, y, pulse phase]
+      enemies      [type, x, y, w, h, path left, path right, speed, dir, reach, spread, anim time]
+      exit         [x, y, w, h]
+      hints        [text, x, y]
+    """
+    return {
+        "format": LEVEL_FORMAT_VERSION,
+        "platforms": [list(rect) for rect in levelData["platforms"]],
+        "hidingSpots": [[*spot.rect, spot.strength, spot.spriteIndex] for spot in levelData["hidingSpots"]],
+        "orbs": [[orb.rect.x, orb.rect.y, orb.pulsePhase] for orb in levelData["orbs"]],
+        "enemies": [
+            [enemy.type, *enemy.rect, *enemy.path, enemy.speed, enemy.dir, *enemy.vision, enemy.animTime]
+            for enemy in levelData["enemies"]
+        ],
+        "exit": list(levelData["exitRect"]),
+        "hints": [[hint["text"], *hint["pos"]] for hint in levelData.get("tutorialHints", [])],
+    }
+
+
+def levelFromData(data):
+    """Build live level objects from level file data without running any generator."""
+    if data.get("format") != LEVEL_FORMAT_VERSION:
+        raise ValueError(f"Unsupported level format: {data.get('format')!r}")
+    Rect = pygame.Rect
+    return {
+        "platforms": [Rect(x, y, w, h) for x, y, w, h in data["platforms"]],
+        "hidingSpots": [
+            HidingSpot(Rect(x, y, w, h), strength, spriteIndex=tile)
+            for x, y, w, h, strength, tile in data["hidingSpots"]
+        ],
+        "orbs": [Orb(Rect(x, y, orbSize * 2, orbSize * 2), pulsePhase=phase) for x, y, phase in data["orbs"]],
+        "enemies": [
+            Enemy(Rect(x, y, w, h), (left, right), speed, direction, (reach, spread), kind, animTime=animTime)
+            for kind, x, y, w, h, left, right, speed, direction, reach, spread, animTime in data["enemies"]
+        ],
+        "exitRect": Rect(*data["exit"]),
+        "tutorialHints": [{"text": text, "pos": (x, y)} for text, x, y in data.get("hints", [])],
+    }
+
+
+levelFileCache = {}
+
+
+def loadLevel(path):
+    """Load a level file; the parsed JSON is cached so reloading only rebuilds objects."""
+    data = levelFileCache.get(path)
+    if data is None:
+        with open(path) as handle:
+            data = json.load(handle)
+        levelFileCache[path] = data
+    return levelFromData(data)
+
+
+def saveLevel(path, levelData):
+    # One entity per line keeps curated levels readable and diffable
+    parts = []
+    for key, value in levelToData(levelData).items():
+        if isinstance(value, list) and value and isinstance(value[0], list):
+            items = ",\n    ".join(json.dumps(item, separators=(", ", ": ")) for item in value)
+            parts.append(f'  "{key}": [\n    {items}\n  ]')
+        else:
+            parts.append(f'  "{key}": {json.dumps(value)}')
+    with open(path, "w") as handle:
+        handle.write("{\n" + ",\n".join(parts) + "\n}\n")
 
+
+def chunkRng(seed, chunkIndex, salt="chunk"):
+    """Deterministic RNG for one chunk, independent of the order chunks are built in."""
+    return random.Random(f"{seed}:{salt}:{chunkIndex}")
+
+
+def chunkAnchorY(seed, boundaryIndex):
+    """Height of the edge platforms on both sides of a chunk boundary."""
+    return chunkRng(seed, boundaryIndex, "anchor").randint(CHUNK_ANCHOR_Y_MIN, CHUNK_ANCHOR_Y_MAX)
+
+
+def getChunkCount(missionWidth):
+    return max(1, missionWidth // CHUNK_WIDTH)
+
+
+def getChunkBounds(chunkIndex, missionWidth):
+    """Left and right x of a chunk; the last chunk absorbs the leftover width."""
+    left = chunkIndex * CHUNK_WIDTH
+    if chunkIndex >= getChunkCount(missionWidth) - 1:
+        return left, missionWidth
+    return left, left + CHUNK_WIDTH
+
+
+def makeChunkPlatforms(rng, seed, chunkIndex, missionWidth):
+    left, right = getChunkBounds(chunkIndex, missionWidth)
+    lastChunk = right >= missionWidth
+    platforms = [pygame.Rect(left, 640, right - left, 120)]
+
+    # Both neighbours derive the boundary platforms from the seed alone, so the
+    # hop across a boundary is the same no matter which chunk was built first.
+    currentX = 140 if chunkIndex == 0 else left + CHUNK_EDGE_MARGIN
+    currentY = chunkAnchorY(seed, chunkIndex)
+    if lastChunk:
+        targetWidth = 280
+        targetX = missionWidth - targetWidth - 120
+    else:
+        targetWidth = CHUNK_EDGE_PLATFORM_WIDTH
+        targetX = right - CHUNK_EDGE_MARGIN - targetWidth
+
+    lastRight = lastY = None
+    while True:
+        platformWidth = rng.randint(170, 260)
+        if lastRight is not None and currentX + platformWidth > targetX - 90:
+            break
+        platforms.append(pygame.Rect(int(currentX), int(currentY), platformWidth, 18))
+        lastRight, lastY = currentX + platformWidth, currentY
+        currentX += platformWidth + rng.randint(90, 150)
+        currentY = max(380, min(600, currentY + rng.randint(-60, 60)))
+
+    targetY = max(380, min(580, lastY)) if lastChunk else chunkAnchorY(seed, chunkIndex + 1)
+    # Bridge whatever is left before the edge platform with jump-sized steps
+    while targetX - lastRight > MAX_HORIZONTAL_GAP - 20:
+        fillerX = lastRight + 100
+        fillerWidth = max(60, min(220, targetX - 100 - fillerX))
+        lastY += max(-60, min(60, targetY - lastY))
+        platforms.append(pygame.Rect(int(fillerX), int(lastY), fillerWidth, 18))
+        lastRight = fillerX + fillerWidth
+    platforms.append(pygame.Rect(targetX, targetY, targetWidth, 18))
+
+    base = rng.choice(platforms[1:])  # skip floor
+    extraWidth = rng.randint(130, 190)
+    x = base.centerx + rng.randint(-120, 120) - extraWidth // 2
+    x = max(left + 80, min(right - extraWidth - 80, x))
+    y = max(300, base.top - rng.randint(70, 130))
+    platforms.append(pygame.Rect(int(x), int(y), extraWidth, 18))
+
+    return platforms
+
+
+def makeChunk(seed, chunkIndex, missionWidth):
+    rng = chunkRng(seed, chunkIndex)
+    platforms = makeChunkPlatforms(rng, seed, chunkIndex, missionWidth)
+    hidingSpots = makeHidingSpots(rng, platforms, count=rng.randint(3, 4))
+    orbs = makeOrbs(rng, platforms, count=ORBS_PER_CHUNK)
+    enemies = makeEnemies(rng, platforms, ENEMIES_PER_CHUNK, getChunkBounds(chunkIndex, missionWidth))
+    for idx, orb in enumerate(orbs):
+        orb.key = (chunkIndex, idx)
+    for idx, enemy in enumerate(enemies):
+        enemy.key = (chunkIndex, idx)
+        enemyCoverage(enemy)
     return {
+        "index": chunkIndex,
         "platforms": platforms,
         "hidingSpots": hidingSpots,
         "orbs": orbs,
         "enemies": enemies,
-        "exitRect": exitRect,
-        "tutorialHints": tutorialHints,
     }
 
 
-def resetWorld(seed=None, tutorial=False):
+def makeLevelStream(seed, missionWidth):
+    return {
+        "seed": seed,
+        "missionWidth": missionWidth,
+        "chunkCount": getChunkCount(missionWidth),
+        "chunks": {},
+        "rescuedOrbs": set(),
+        "defeatedEnemies": set(),
+    }
+
+
+def loadStreamChunk(stream, chunkIndex):
+    chunk = makeChunk(stream["seed"], chunkIndex, stream["missionWidth"])
+    for orb in chunk["orbs"]:
+        if orb.key in stream["rescuedOrbs"]:
+            orb.rescued = True
+    chunk["enemies"] = [e for e in chunk["enemies"] if e.key not in stream["defeatedEnemies"]]
+    stream["chunks"][chunkIndex] = chunk
+
+
+def evictStreamChunk(stream, chunkIndex):
+    chunk = stream["chunks"].pop(chunkIndex)
+    # Remember progress so a regenerated chunk does not respawn it
+    for orb in chunk["orbs"]:
+        if orb.rescued:
+            stream["rescuedOrbs"].add(orb.key)
+    for enemy in chunk["enemies"]:
+        if not enemy.active:
+            stream["defeatedEnemies"].add(enemy.key)
+
+
+def updateLevelStream(world, attachSprites=True):
+    """Load chunks the camera is approaching and evict the ones far behind."""
+    stream = world.levelStream
+    if not stream:
+        return False
+    focus = int(world.cameraX + width // 2) // CHUNK_WIDTH
+    first = max(0, focus - STREAM_CHUNKS_BEHIND)
+    last = min(stream["chunkCount"] - 1, focus + STREAM_CHUNKS_AHEAD)
+    chunks = stream["chunks"]
+
+    changed = False
+    for idx in [i for i in chunks if i < first or i > last]:
+        evictStreamChunk(stream, idx)
+        changed = True
+    for idx in range(first, last + 1):
+        if idx not in chunks:
+            loadStreamChunk(stream, idx)
+            changed = True
+
+    if changed:
+        ordered = [chunks[i] for i in sorted(chunks)]
+        world.platforms = [p for chunk in ordered for p in chunk["platforms"]]
+        world.hidingSpots = [s for chunk in ordered for s in chunk["hidingSpots"]]
+        if attachSprites:
+            attachBushSprites(world.hidingSpots)
+        world.orbs = [o for chunk in ordered for o in chunk["orbs"]]
+        world.enemies = [e for chunk in ordered for e in chunk["enemies"]]
+    return changed
+
+
+def generateWorld(seed=None, tutorial=False, missionWidth=None, levelPath=None):
+    """Build a world without bush sprites.
+
+    Nothing here touches the display, so the next level can be generated on a
+    worker thread while the current one is played; attachWorldSprites finishes
+    it on the main thread.
+    """
+    if seed is None:
+        # Pick the seed here rather than letting Random seed itself, so it can be reported
+        seed = random.randrange(1 << 32)
     rng = random.Random(seed)
     # Position player on the ground
     playerX = 80
@@ -675,71 +1453,189 @@ def resetWorld(seed=None, tutorial=False):
     playerY -= (player_bottom - ground_level)
     playerRect = get_player_hitbox(playerX, playerY)
 
+    levelStream = None
     if tutorial:
-        levelData = makeTutorialLevel(rng)
-    else:
-        platforms = makePlatforms(rng)
-        hidingSpots = makeHidingSpots(rng, platforms)
-        orbs = makeOrbs(rng, platforms)
-        enemies = makeEnemies(rng, platforms)
+        levelData = makeTutorialLevel()
+    elif levelPath is not None:
+        levelData = loadLevel(levelPath)
+    elif missionWidth is not None:
+        missionWidth = max(CHUNK_WIDTH, int(missionWidth))
+        levelStream = makeLevelStream(seed, missionWidth)
         levelData = {
-            "platforms": platforms,
-            "hidingSpots": hidingSpots,
-            "orbs": orbs,
-            "enemies": enemies,
-            "exitRect": pygame.Rect(levelWidth - 160, 420, 90, 220),
+            "platforms": [],
+            "hidingSpots": [],
+            "orbs": [],
+            "enemies": [],
+            "exitRect": pygame.Rect(missionWidth - 160, 420, 90, 220),
             "tutorialHints": [],
         }
-
-    return {
-        "playerRect": playerRect,
-        "playerPos": pygame.Vector2(playerRect.x, playerRect.y),
-        "playerVel": pygame.Vector2(0, 0),
-        "platforms": levelData["platforms"],
-        "hidingSpots": levelData["hidingSpots"],
-        "orbs": levelData["orbs"],
-        "enemies": levelData["enemies"],
-        "exitRect": levelData["exitRect"],
-        "visibility": 35.0,
-        "alertMeter": 0.0,
-        "rescued": 0,
-        "cameraX": 0.0,
-        "onGround": False,
-        "coyoteTimer": 0.0,
-        "jumpBuffer": 0.0,
-        "animFrame": 0,
-        "animTime": 0.0,
-        "facing": 1,
-        "attacking": False,
-        "attackCooldown": 0.0,
-        "attackRect": None,
-        "attackAnimFrame": 0,
-        "attackAnimTime": 0.0,
-        "caught": False,
-        "win": False,
-        "flashAmount": 0.0,
-        "particles": [],
-        "rng": rng,
-        "leaves": make_leaves(rng),
-        "fireflies": make_fireflies(rng),
-        "fog_shift": rng.uniform(0.0, math.tau),
-        "missionLog": [
+    else:
+        levelData = makeLevel(rng)
+
+    world = World(
+        playerRect,
+        levelData["platforms"],
+        levelData["hidingSpots"],
+        levelData["orbs"],
+        levelData["enemies"],
+        levelData["exitRect"],
+        rng,
+        leaves=make_leaves(rng),
+        fireflies=make_fireflies(rng),
+        fog_shift=rng.uniform(0.0, math.tau),
+        missionLog=[
             {
                 "text": "Tutorial log: learn to move quietly in the leaves." if tutorial else "Mission log: keep the canopy calm while you collect light.",
                 "timer": MISSION_LOG_DURATION
             }
         ],
-        "alertLogCooldown": 0.0,
-        "stealthState": "idle",
-        "tutorialHints": levelData.get("tutorialHints", []),
-        "isTutorial": tutorial,
-    }
+        tutorialHints=levelData.get("tutorialHints", []),
+        isTutorial=tutorial,
+        levelStream=levelStream,
+        seed=seed,
+        levelWidth=levelStream["missionWidth"] if levelStream else levelWidth,
+        orbTotal=levelStream["chunkCount"] * ORBS_PER_CHUNK if levelStream else len(levelData["orbs"]),
+    )
+    updateLevelStream(world, attachSprites=False)
+    # Patrol coverage and the guards' route graph are built here, off the main thread
+    getCoverageMap(world)
+    getPlatformNav(world)
+    return world
+
+
+def attachWorldSprites(world):
+    attachBushSprites(world.hidingSpots)
+    return world
+
+
+def resetWorld(seed=None, tutorial=False, missionWidth=None, levelPath=None):
+    return attachWorldSprites(generateWorld(seed, tutorial, missionWidth, levelPath))
+
+
+def copyState(value, memo):
+    """Copy mutable play state, sharing sprites and other immutable assets.
+
+    memo maps id() to copies so objects referenced twice, such as streamed enemies
+    that are both in world.enemies and in their chunk, stay shared in the copy.
+    """
+    kind = type(value)
+    if kind in atomicTypes:
+        return value
+    copied = memo.get(id(value))
+    if copied is not None:
+        return copied
+    if kind is pygame.Rect:
+        copied = pygame.Rect(value)
+    elif kind is pygame.Vector2:
+        copied = pygame.Vector2(value)
+    elif kind is list:
+        copied = memo[id(value)] = [item if type(item) in atomicTypes else copyState(item, memo) for item in value]
+    elif kind is dict:
+        copied = memo[id(value)] = {}
+        for key, item in value.items():
+            copied[key] = item if type(item) in atomicTypes else copyState(item, memo)
+    elif kind is set:
+        copied = set(value)
+    elif kind is random.Random:
+        copied = random.Random()
+        copied.setstate(value.getstate())
+    elif kind in snapshotClasses:
+        copied = memo[id(value)] = object.__new__(kind)
+        for name in kind.__slots__:
+            item = getattr(value, name)
+            setattr(copied, name, item if type(item) in atomicTypes else copyState(item, memo))
+    else:
+        # Surfaces and the platform nav graph never change during play
+        return value
+    memo[id(value)] = copied
+    return copied
+
+
+atomicTypes = frozenset((int, float, str, bool, tuple, type(None)))
+snapshotClasses = frozenset((HidingSpot, Orb, Enemy, Particle, Leaf, Firefly, World))
+
+
+def snapshotWorld(world):
+    """Capture world state so restoreWorld can rebuild it without regenerating the level."""
+    snapshot = copyState(world, {})
+    # Caches derived from the live entity lists are rebuilt on demand
+    snapshot.enemyBatch = None
+    snapshot.platformGrid = None
+    snapshot.coverageMap = None
+    return snapshot
+
+
+def restoreWorld(snapshot):
+    return copyState(snapshot, {})
+
+
+def renderSnapshot(world):
+    """Copy of world for the render thread to draw while the next tick is simulated.
+
+    The level stream and rng are never read while drawing, so they are shared
+    rather than copied.
+    """
+    memo = {id(world.rng): world.rng}
+    if world.levelStream is not None:
+        memo[id(world.levelStream)] = world.levelStream
+    return copyState(world, memo)
 
 
 def lineBlocked(start, end, blockers):
     return any(block.clipline(start, end) for block in blockers)
 
 
+class PlatformGrid:
+    """Uniform grid of platform rects so sight lines only test nearby platforms."""
+
+    def __init__(self, platforms, cellSize=LOS_GRID_CELL):
+        self.platforms = platforms
+        self.count = len(platforms)
+        self.cellSize = cellSize
+        self.cells = {}
+        for platform in platforms:
+            for cell in self.cellsCovering(platform.left, platform.top, platform.right - 1, platform.bottom - 1):
+                self.cells.setdefault(cell, []).append(platform)
+
+    def cellsCovering(self, left, top, right, bottom):
+        size = self.cellSize
+        for cx in range(int(left) // size, int(right) // size + 1):
+            for cy in range(int(top) // size, int(bottom) // size + 1):
+                yield cx, cy
+
+    def query(self, left, top, right, bottom):
+        found = {}
+        for cell in self.cellsCovering(left, top, right, bottom):
+            for platform in self.cells.get(cell, ()):
+                found[id(platform)] = platform
+        return found.values()
+
+
+def getPlatformGrid(world):
+    grid = world.platformGrid
+    if grid is None or grid.platforms is not world.platforms or grid.count != len(world.platforms):
+        grid = world.platformGrid = PlatformGrid(world.platforms)
+    return grid
+
+
+def lineOfSightBlocked(world, enemy, target):
+    """Whether a platform hides target from the enemy's eye.
+
+    The answer is cached on the enemy until either endpoint crosses into another
+    LOS_CACHE_CELL cell or the platform set changes.
+    """
+    eyeX, eyeY = getEnemyEye(enemy)
+    targetX, targetY = target
+    grid = getPlatformGrid(world)
+    cell = LOS_CACHE_CELL
+    key = (grid, eyeX // cell, eyeY // cell, int(targetX) // cell, int(targetY) // cell)
+    if enemy.losKey != key:
+        blockers = grid.query(min(eyeX, targetX), min(eyeY, targetY), max(eyeX, targetX), max(eyeY, targetY))
+        enemy.losBlocked = lineBlocked((eyeX, eyeY), target, blockers)
+        enemy.losKey = key
+    return enemy.losBlocked
+
+
 def pointInPoly(point, polygon):
     px, py = point
     inside = False
@@ -756,45 +1652,685 @@ def pointInPoly(point, polygon):
     return inside
 
 
+def getEnemyEye(enemy):
+    rect = enemy.rect
+    return rect.centerx, (rect.top + 20 if enemy.type == "guard" else rect.centery)
+
+
 def buildVisionCone(enemy):
-    rect = enemy["rect"]
-    facing = 1 if enemy["dir"] >= 0 else -1
-    eyeX = rect.centerx
-    eyeY = rect.top + 20 if enemy["type"] == "guard" else rect.centery
-    reach, spread = enemy["vision"]
+    return visionConeAt(enemy, enemy.rect.x, 1 if enemy.dir >= 0 else -1)
+
+
+def visionConeAt(enemy, left, facing):
+    """The cone enemy would have with its rect at x = left, facing +1 or -1."""
+    rect = enemy.rect
+    eyeX = left + rect.width // 2
+    eyeY = rect.top + 20 if enemy.type == "guard" else rect.centery
+    reach, spread = enemy.vision
     tip = (eyeX + facing * reach, eyeY - 30)
     upper = (eyeX + facing * (reach * 0.6), eyeY - spread * 0.4)
     lower = (eyeX + facing * (reach * 0.6), eyeY + spread * 0.4)
     return [(eyeX, eyeY), upper, tip, lower]
 
 
+def refreshVisionCone(enemy):
+    """Rebuild the cached cone only when the enemy has moved or turned."""
+    key = (enemy.rect.x, enemy.rect.y, enemy.dir)
+    if enemy.coneKey == key:
+        return False
+    enemy.cone = buildVisionCone(enemy)
+    enemy.coneKey = key
+    return True
+
+
+def patrolPhaseBin(enemy, phases=COVERAGE_PHASES):
+    """Which of the phases equal slices of its patrol loop the enemy is in (see advancePatrol)."""
+    pathLeft = enemy.path[0]
+    span = enemy.path[1] - enemy.rect.width - pathLeft
+    if span <= 0:
+        return 0
+    offset = max(0, min(span, enemy.posX - pathLeft))
+    phase = offset if enemy.dir >= 0 else 2 * span - offset
+    return min(phases - 1, int(phase * phases / (2 * span)))
+
+
+def slabExtent(polygon, top, bottom):
+    """Leftmost and rightmost x of the part of polygon between two horizontal lines."""
+    xs = []
+    for i in range(len(polygon)):
+        ax, ay = polygon[i - 1]
+        bx, by = polygon[i]
+        if top <= ay <= bottom:
+            xs.append(ax)
+        for y in (top, bottom):
+            if (ay - y) * (by - y) < 0:
+                xs.append(ax + (y - ay) * (bx - ax) / (by - ay))
+    return (min(xs), max(xs)) if xs else None
+
+
+def markConeSweep(cells, cone, sweep, bits, cellSize=COVERAGE_CELL):
+    """Add bits to every cell the cone touches while sliding sweep pixels to the right."""
+    ys = [y for _, y in cone]
+    for cy in range(int(min(ys) // cellSize), int(max(ys) // cellSize) + 1):
+        extent = slabExtent(cone, cy * cellSize, (cy + 1) * cellSize)
+        if extent is None:
+            continue
+        # One pixel of slack either side covers rect.x being posX rounded
+        first = int((extent[0] - 1) // cellSize)
+        last = int((extent[1] + sweep + 1) // cellSize)
+        for cx in range(first, last + 1):
+            cells[cx, cy] = cells.get((cx, cy), 0) | bits
+
+
+def patrolCoverage(enemy, phases=COVERAGE_PHASES):
+    """Grid cells the enemy's cone can reach, each with a bitmask of the patrol phases it does.
+
+    A patrol is fully periodic, so every phase slice is the cone swept across
+    the stretch of path walked in that slice, split in two at the turnaround.
+    The masks err on the side of coverage: a set bit only means the exact
+    cone test is worth running.
+    """
+    rect = enemy.rect
+    pathLeft = enemy.path[0]
+    span = enemy.path[1] - rect.width - pathLeft
+    cells = {}
+    if span <= 0:
+        cone = visionConeAt(enemy, rect.x, 1 if enemy.dir >= 0 else -1)
+        markConeSweep(cells, cone, 0, (1 << phases) - 1)
+        return cells
+    period = 2 * span
+    step = period / phases
+    for index in range(phases):
+        start, end = index * step, (index + 1) * step
+        runs = []
+        if start < span:
+            runs.append((1, pathLeft + start, pathLeft + min(end, span)))
+        if end > span:
+            runs.append((-1, pathLeft + period - end, pathLeft + period - max(start, span)))
+        for facing, left, right in runs:
+            markConeSweep(cells, visionConeAt(enemy, left, facing), right - left, 1 << index)
+    return cells
+
+
+def enemyCoverage(enemy):
+    if enemy.coverage is None:
+        enemy.coverage = tuple(patrolCoverage(enemy).items())
+    return enemy.coverage
+
+
+class CoverageMap:
+    """Precomputed grid cell -> {id(enemy): patrol phase bitmask} for a level's enemies.
+
+    Detection looks up the player's cell once per tick; an enemy only gets the
+    exact cone and sight-line test when its current phase bit is set there.
+    """
+
+    def __init__(self, enemies, cellSize=COVERAGE_CELL):
+        self.enemies = enemies
+        self.count = len(enemies)
+        self.cellSize = cellSize
+        self.cells = {}
+        for enemy in enemies:
+            for cell, mask in enemyCoverage(enemy):
+                self.cells.setdefault(cell, {})[id(enemy)] = mask
+
+    def watchers(self, point):
+        size = self.cellSize
+        return self.cells.get((int(point[0] // size), int(point[1] // size)), {})
+
+
+def getCoverageMap(world):
+    coverage = world.coverageMap
+    if coverage is None or coverage.enemies is not world.enemies or coverage.count != len(world.enemies):
+        coverage = world.coverageMap = CoverageMap(world.enemies)
+    return coverage
+
+
+def dangerHeatmap(enemies, phases=COVERAGE_PHASES):
+    """Share of the time each grid cell is inside some active enemy's patrol cone.
+
+    Computed from the coverage masks alone, so it scores a seed's difficulty
+    without simulating play. Overlapping enemies combine as independent odds.
+    """
+    heat = {}
+    for enemy in enemies:
+        if not enemy.active:
+            continue
+        for cell, mask in enemyCoverage(enemy):
+            watched = bin(mask).count("1") / phases
+            heat[cell] = 1 - (1 - heat.get(cell, 0.0)) * (1 - watched)
+    return heat
+
+
+class EnemyBatch:
+    """Enemy patrol state and cone shapes packed into arrays for batched updates.
+
+    The arrays are authoritative while the batch is in use; enemies that were
+    updated this tick get their position, walk frame and schedule copied back.
+    The cone from buildVisionCone is a convex quad, so in the enemy's facing
+    frame a point is inside when it lies on the inner side of all four edges.
+    """
+
+    def __init__(self, enemies):
+        rects = [enemy.rect for enemy in enemies]
+        self.enemies = enemies
+        self.count = len(enemies)
+        self.indexOf = {id(enemy): idx for idx, enemy in enumerate(enemies)}
+        self.x = np.array([enemy.posX for enemy in enemies], dtype=float)
+        self.y = np.array([rect.y for rect in rects], dtype=float)
+        self.width = np.array([rect.width for rect in rects], dtype=float)
+        self.halfWidth = np.array([rect.width // 2 for rect in rects], dtype=float)
+        self.halfHeight = np.array([rect.height // 2 for rect in rects], dtype=float)
+        self.eyeOffset = np.array(
+            [20 if enemy.type == "guard" else rect.height // 2 for enemy, rect in zip(enemies, rects)],
+            dtype=float,
+        )
+        self.pathLeft = np.array([enemy.path[0] for enemy in enemies], dtype=float)
+        self.pathRight = np.array([enemy.path[1] for enemy in enemies], dtype=float)
+        self.speed = np.array([enemy.speed for enemy in enemies], dtype=float)
+        self.dir = np.array([1 if enemy.dir >= 0 else -1 for enemy in enemies], dtype=float)
+        self.animTime = np.array([enemy.animTime for enemy in enemies], dtype=float)
+        self.lastUpdate = np.array(
+            [math.nan if enemy.lastUpdate is None else enemy.lastUpdate for enemy in enemies], dtype=float
+        )
+        self.wakeTime = np.array([enemy.wakeTime for enemy in enemies], dtype=float)
+        self.reach = np.array([enemy.vision[0] for enemy in enemies], dtype=float)
+        self.coneA = self.reach * 0.6
+        self.coneB = np.array([enemy.vision[1] for enemy in enemies], dtype=float) * 0.4
+        # Guards off investigating are left out of the arrays until they resume their patrol
+        self.active = np.array([enemy.active and enemy.task is None for enemy in enemies], dtype=bool)
+        self.fallen = [idx for idx, enemy in enumerate(enemies) if not enemy.active]
+        self.investigating = [idx for idx, enemy in enumerate(enemies) if enemy.active and enemy.task is not None]
+
+    def knockOut(self, enemy):
+        idx = self.indexOf[id(enemy)]
+        self.active[idx] = False
+        self.fallen.append(idx)
+        if idx in self.investigating:
+            self.investigating.remove(idx)
+
+    def suspend(self, enemy):
+        idx = self.indexOf[id(enemy)]
+        if self.active[idx]:
+            self.active[idx] = False
+            self.investigating.append(idx)
+
+    def resume(self, enemy):
+        idx = self.indexOf[id(enemy)]
+        if idx in self.investigating:
+            self.investigating.remove(idx)
+        self.active[idx] = True
+        self.x[idx] = enemy.posX
+        self.dir[idx] = 1 if enemy.dir >= 0 else -1
+        self.lastUpdate[idx] = enemy.lastUpdate
+        self.wakeTime[idx] = enemy.wakeTime
+        self.animTime[idx] = enemy.animTime
+
+    def patrol(self, elapsed, due):
+        """Advance the due enemies along their paths, mirroring advancePatrol."""
+        span = self.pathRight - self.width - self.pathLeft
+        moving = due & (span > 0)
+        period = np.where(moving, 2 * span, 1.0)
+        offset = np.clip(self.x - self.pathLeft, 0, np.maximum(span, 0))
+        phase = np.where(self.dir >= 0, offset, period - offset)
+        phase = np.mod(phase + self.speed * elapsed, period)
+        forward = phase <= span
+        self.x = np.where(moving, self.pathLeft + np.where(forward, phase, period - phase), self.x)
+        self.dir = np.where(moving, np.where(forward, 1.0, -1.0), self.dir)
+
+    def schedule(self, due, now, playerCenter, lodRadius):
+        """Set the next update time of the due enemies, as enemyLodSleep does."""
+        px, py = playerCenter
+        centerX = np.floor(self.x + 0.5) + self.halfWidth
+        near = np.hypot(centerX - px, self.y + self.halfHeight - py) <= lodRadius
+        watch = np.maximum(self.reach, 220) + ENEMY_LOD_MARGIN
+        gap = np.maximum(
+            np.maximum(self.pathLeft + self.width / 2 - watch - px, px - (self.pathRight - self.width / 2 + watch)),
+            0,
+        )
+        sleep = np.where(near, 0.0, np.minimum(ENEMY_LOD_INTERVAL, gap / (runSpeed * 1.5)))
+        self.wakeTime = np.where(due, now + sleep, self.wakeTime)
+
+    def detect(self, point):
+        """Return (inside cone, distance to body centre) arrays for a world point."""
+        px, py = point
+        left = np.floor(self.x + 0.5)
+        dx = (px - left - self.halfWidth) * self.dir
+        dy = py - self.y - self.eyeOffset
+        a, b, reach = self.coneA, self.coneB, self.reach
+        inside = (
+            self.active
+            & (a * dy + b * dx > 0)
+            & ((reach - a) * (dy + b) - (b - 30) * (dx - a) > 0)
+            & ((a - reach) * (dy + 30) - (b + 30) * (dx - reach) > 0)
+            & (b * dx - a * dy > 0)
+        )
+        distance = np.hypot(left + self.halfWidth - px, self.y + self.halfHeight - py)
+        return inside, distance
+
+
 def updateParticles(world, dt):
-    for particle in world["particles"]:
-        particle["pos"][0] += particle["dir"][0] * 60 * dt
-        particle["pos"][1] += particle["dir"][1] * 60 * dt
-        particle["life"] -= dt
-    world["particles"] = [p for p in world["particles"] if p["life"] > 0]
+    for particle in world.particles:
+        particle.pos[0] += particle.dir[0] * 60 * dt
+        particle.pos[1] += particle.dir[1] * 60 * dt
+        particle.life -= dt
+    world.particles = [p for p in world.particles if p.life > 0]
 
 
 def spawnParticles(world, rect):
     for _ in range(8):
         angle = random.uniform(0, math.tau)
-        world["particles"].append(
-            {
-                "pos": [rect.centerx, rect.centery],
-                "dir": [math.cos(angle), math.sin(angle)],
-                "life": random.uniform(0.4, 0.8),
-            }
+        world.particles.append(
+            Particle(
+                pos=[rect.centerx, rect.centery],
+                dir=[math.cos(angle), math.sin(angle)],
+                life=random.uniform(0.4, 0.8),
+            )
         )
 
 
+def defeatEnemy(world, enemy):
+    enemy.active = False
+    enemy.cone = []
+    enemy.coneKey = None
+    enemy.deathAnimTime = 0.0
+    enemy.deathAnimFrame = 0
+    batch = world.enemyBatch
+    if batch is not None and batch.enemies is world.enemies:
+        batch.knockOut(enemy)
+    spawnParticles(world, enemy.rect)
+
+
+def updateEnemyDeath(enemy, dt):
+    enemy.cone = []
+    if enemyDeathFrames:
+        enemy.deathAnimTime += dt
+        enemy.deathAnimFrame = min(int(enemy.deathAnimTime * enemyDeathAnimFps), enemyDeathFrameCount - 1)
+
+
+def advancePatrol(enemy, elapsed):
+    """Move an enemy along its back-and-forth path by elapsed seconds.
+
+    The path is folded into one loop of length 2 * span, so any number of
+    turnarounds inside a long catch-up step lands exactly where per-frame
+    stepping would have.
+    """
+    rect = enemy.rect
+    pathLeft = enemy.path[0]
+    span = enemy.path[1] - rect.width - pathLeft
+    if span <= 0:
+        return
+    period = 2 * span
+    offset = max(0, min(span, enemy.posX - pathLeft))
+    phase = offset if enemy.dir >= 0 else period - offset
+    phase = (phase + enemy.speed * elapsed) % period
+    if phase <= span:
+        enemy.posX = pathLeft + phase
+        enemy.dir = 1
+    else:
+        enemy.posX = pathLeft + period - phase
+        enemy.dir = -1
+    rect.x = math.floor(enemy.posX + 0.5)
+
+
+def animateEnemyWalk(enemy, elapsed):
+    if enemyWalkingFrames:
+        enemy.animTime += elapsed
+        totalFrames = len(enemyWalkingFrames.get("right", [])) or 1
+        enemy.animFrame = int(enemy.animTime * enemyWalkAnimFps) % totalFrames
+
+
+def updateEnemyMotion(enemy, elapsed):
+    animateEnemyWalk(enemy, elapsed)
+    advancePatrol(enemy, elapsed)
+
+
+def platformBelow(platforms, x, y):
+    """Highest platform under x whose top is at or below y."""
+    below = [platform for platform in platforms if platform.left <= x < platform.right and platform.top >= y - 1]
+    return min(below, key=lambda platform: platform.top) if below else None
+
+
+def guardPerch(platforms, enemy):
+    """The platform a patrolling guard walks on; its path may run past the platform's ends."""
+    rect = enemy.rect
+    level = [platform for platform in platforms if platform.top == rect.bottom]
+    if level:
+        return min(level, key=lambda platform: horizontal_gap(platform, rect))
+    return platformBelow(platforms, rect.centerx, rect.bottom)
+
+
+def routeWaypoints(world, enemy, start, goal, targetLeft):
+    """(left, top) points that walk enemy from platform start to targetLeft on platform goal.
+
+    Routes come from the level's PlatformNav, whose cache is keyed by
+    (platform, platform), so guards sent off together share one search.
+    Returns None when goal cannot be reached from start.
+    """
+    nav = getPlatformNav(world)
+    startNode, goalNode = nav.findNode(start), nav.findNode(goal)
+    if startNode is None or goalNode is None:
+        return None
+    route = nav.route(startNode, goalNode)
+    if route is None:
+        return None
+    width, height = enemy.rect.size
+
+    def spot(platform, left):
+        return max(platform.left, min(left, platform.right - width)), platform.top - height
+
+    platforms = [nav.platforms[node] for node in route]
+    points = [spot(platforms[0], enemy.posX)]
+    for here, there in zip(platforms, platforms[1:]):
+        # Walk to the end nearest the next platform, then hop straight across
+        takeoff = spot(here, there.centerx - width / 2)
+        points.append(takeoff)
+        points.append(spot(there, takeoff[0]))
+    points.append(spot(platforms[-1], targetLeft))
+    return [point for idx, point in enumerate(points) if idx == 0 or point != points[idx - 1]]
+
+
+def startInvestigation(world, enemy, target):
+    """Send a guard along platform routes to target, a point at the player's feet."""
+    rect = enemy.rect
+    start = guardPerch(world.platforms, enemy) if enemy.task is None else platformBelow(world.platforms, rect.centerx, rect.bottom)
+    goal = platformBelow(world.platforms, *target)
+    if start is None or goal is None:
+        return False
+    waypoints = routeWaypoints(world, enemy, start, goal, target[0] - rect.width / 2)
+    if waypoints is None:
+        return False
+    if enemy.task is None:
+        enemy.home = (enemy.posX, rect.y, enemy.dir, start)
+        enemy.posY = float(rect.y)
+    enemy.task = "investigate"
+    enemy.waypoints = waypoints
+    enemy.searchTime = INVESTIGATE_LOOK_SECONDS
+    enemy.lastUpdate = enemy.wakeTime = world.simTime
+    batch = world.enemyBatch
+    if batch is not None and batch.enemies is world.enemies:
+        batch.suspend(enemy)
+    return True
+
+
+def wakeEnemy(world, enemy):
+    """Catch up a patrolling enemy the LOD scheduler left asleep to the current simulation time.
+
+    Patrols are periodic, so the batch arrays, which are behind by the same
+    amount, still land on the same position when they next update it.
+    """
+    now = world.simTime
+    if enemy.task is None and enemy.lastUpdate is not None and enemy.lastUpdate < now:
+        updateEnemyMotion(enemy, now - enemy.lastUpdate)
+        enemy.lastUpdate = now
+    enemy.wakeTime = min(enemy.wakeTime, now)
+
+
+def sendInvestigators(world, target):
+    """Send every active guard near target to look; returns how many went."""
+    sent = 0
+    for enemy in world.enemies:
+        if not enemy.active or enemy.type != "guard":
+            continue
+        # Pick and route guards from where they are now, not where they fell asleep
+        wakeEnemy(world, enemy)
+        if math.hypot(enemy.rect.centerx - target[0], enemy.rect.bottom - target[1]) > INVESTIGATE_RADIUS:
+            continue
+        if startInvestigation(world, enemy, target):
+            sent += 1
+    return sent
+
+
+def finishInvestigation(world, enemy):
+    enemy.posX, homeY, enemy.dir, _ = enemy.home
+    enemy.rect.x = math.floor(enemy.posX + 0.5)
+    enemy.rect.y = homeY
+    enemy.task = enemy.waypoints = enemy.home = None
+    enemy.lastUpdate = enemy.wakeTime = world.simTime
+    batch = world.enemyBatch
+    if batch is not None and batch.enemies is world.enemies:
+        batch.resume(enemy)
+
+
+def stepInvestigation(world, enemy, dt):
+    """Walk an off-patrol guard along its waypoints, look around at the end, then head home."""
+    animateEnemyWalk(enemy, dt)
+    enemy.lastUpdate = world.simTime
+    waypoints = enemy.waypoints
+    step = enemy.speed * INVESTIGATE_SPEEDUP * dt
+    while waypoints and step > 0:
+        targetX, targetY = waypoints[0]
+        dx, dy = targetX - enemy.posX, targetY - enemy.posY
+        distance = math.hypot(dx, dy)
+        if dx:
+            enemy.dir = 1 if dx > 0 else -1
+        if distance <= step:
+            enemy.posX, enemy.posY = targetX, targetY
+            waypoints.pop(0)
+            step -= distance
+        else:
+            enemy.posX += dx * step / distance
+            enemy.posY += dy * step / distance
+            step = 0
+    enemy.rect.x = math.floor(enemy.posX + 0.5)
+    enemy.rect.y = math.floor(enemy.posY + 0.5)
+    if waypoints:
+        return
+    if enemy.task == "return":
+        finishInvestigation(world, enemy)
+        return
+
+    halfway = INVESTIGATE_LOOK_SECONDS / 2
+    if enemy.searchTime > halfway >= enemy.searchTime - dt:
+        enemy.dir = -enemy.dir
+    enemy.searchTime -= dt
+    if enemy.searchTime > 0:
+        return
+    homeX, homeY, _, perch = enemy.home
+    rect = enemy.rect
+    here = platformBelow(world.platforms, rect.centerx, rect.bottom)
+    waypoints = routeWaypoints(world, enemy, here, perch, homeX) if here is not None else None
+    enemy.task = "return"
+    # The patrol may run past the perch's ends, so finish on the exact spot it left from
+    enemy.waypoints = (waypoints or []) + [(homeX, homeY)]
+
+
+def enemyLodSleep(world, enemy, playerCenter):
+    """How long an enemy may skip updates without missing a detection.
+
+    Enemies within world.lodRadius are updated every tick. Further out, the
+    sleep is capped by how soon the player, at most 1.5x run speed, could reach
+    any point the enemy can see or hear from anywhere on its path.
+    """
+    rect = enemy.rect
+    px, py = playerCenter
+    if math.hypot(rect.centerx - px, rect.centery - py) <= world.lodRadius:
+        return 0.0
+    watch = max(enemy.vision[0], 220) + ENEMY_LOD_MARGIN
+    left = enemy.path[0] + rect.width / 2 - watch
+    right = enemy.path[1] - rect.width / 2 + watch
+    gap = max(left - px, px - right, 0)
+    return min(ENEMY_LOD_INTERVAL, gap / (runSpeed * 1.5))
+
+
+def scoreEnemyDetection(world, inside, distance, playerHidden, crouching):
+    """Alert rate one enemy adds, or None when it catches the player outright."""
+    detectionRate = 0
+    if inside:
+        if not playerHidden:
+            return None
+        visibilityFactor = world.visibility / 100
+        detectionRate += 30 * visibilityFactor
+        detectionRate *= 0.4
+        if crouching:
+            detectionRate *= 0.6
+
+    if abs(world.playerVel.x) > walkSpeed * 0.9 and distance < 220:
+        detectionRate += 20
+    return detectionRate
+
+
+def updateEnemies(world, playerCenter, playerHidden, crouching, dt):
+    spotted = False
+    now = world.simTime
+    watchers = getCoverageMap(world).watchers(playerCenter)
+    for enemy in world.enemies:
+        if world.caught:
+            break
+        if not enemy.active:
+            updateEnemyDeath(enemy, dt)
+            continue
+        if enemy.wakeTime > now:
+            continue
+
+        inside = False
+        if enemy.task is not None:
+            # Off patrol, so the coverage map does not apply
+            stepInvestigation(world, enemy, dt)
+            refreshVisionCone(enemy)
+            inside = pointInPoly(playerCenter, enemy.cone) and not lineOfSightBlocked(world, enemy, playerCenter)
+        else:
+            updateEnemyMotion(enemy, dt if enemy.lastUpdate is None else now - enemy.lastUpdate)
+            enemy.lastUpdate = now
+            enemy.wakeTime = now + enemyLodSleep(world, enemy, playerCenter)
+            if watchers.get(id(enemy), 0) >> patrolPhaseBin(enemy) & 1:
+                refreshVisionCone(enemy)
+                inside = pointInPoly(playerCenter, enemy.cone) and not lineOfSightBlocked(world, enemy, playerCenter)
+        enemyRect = enemy.rect
+        distance = math.hypot(enemyRect.centerx - playerCenter[0], enemyRect.centery - playerCenter[1])
+        detectionRate = scoreEnemyDetection(world, inside, distance, playerHidden, crouching)
+        if detectionRate is None:
+            world.caught = True
+            world.flashAmount = 1.0
+            return True
+        if detectionRate > 0:
+            spotted = True
+        world.alertMeter += detectionRate * dt
+    return spotted
+
+
+def updateEnemiesBatched(world, playerCenter, playerHidden, crouching, dt):
+    """Same rules as updateEnemies, with patrol, scheduling and detection done for all enemies at once."""
+    if world.caught:
+        return False
+    enemies = world.enemies
+    batch = world.enemyBatch
+    if batch is None or batch.enemies is not enemies or batch.count != len(enemies):
+        batch = world.enemyBatch = EnemyBatch(enemies)
+
+    now = world.simTime
+    due = batch.active & (batch.wakeTime <= now)
+    elapsed = np.where(np.isnan(batch.lastUpdate), dt, now - batch.lastUpdate)
+    batch.patrol(elapsed, due)
+    batch.lastUpdate = np.where(due, now, batch.lastUpdate)
+    batch.animTime = np.where(due, batch.animTime + elapsed, batch.animTime)
+    batch.schedule(due, now, playerCenter, world.lodRadius)
+
+    # Copy results back only for the enemies that were updated
+    dueIdx = np.flatnonzero(due)
+    positions = batch.x[dueIdx].tolist()
+    directions = batch.dir[dueIdx].astype(int).tolist()
+    wakeTimes = batch.wakeTime[dueIdx].tolist()
+    animTimes = batch.animTime[dueIdx].tolist()
+    totalFrames = (len(enemyWalkingFrames.get("right", [])) or 1) if enemyWalkingFrames else 1
+    frames = ((batch.animTime[dueIdx] * enemyWalkAnimFps).astype(int) % totalFrames).tolist()
+    for slot, idx in enumerate(dueIdx.tolist()):
+        enemy = enemies[idx]
+        enemy.posX = positions[slot]
+        enemy.rect.x = math.floor(positions[slot] + 0.5)
+        enemy.dir = directions[slot]
+        enemy.lastUpdate = now
+        enemy.wakeTime = wakeTimes[slot]
+        if enemyWalkingFrames:
+            enemy.animTime = animTimes[slot]
+            enemy.animFrame = frames[slot]
+    for idx in batch.fallen:
+        updateEnemyDeath(enemies[idx], dt)
+
+    inside, distance = batch.detect(playerCenter)
+    candidates = inside & due
+    if abs(world.playerVel.x) > walkSpeed * 0.9:
+        candidates = due & (inside | (batch.active & (distance < 220)))
+
+    spotted = False
+    for idx in np.flatnonzero(candidates).tolist():
+        seen = inside[idx] and not lineOfSightBlocked(world, enemies[idx], playerCenter)
+        detectionRate = scoreEnemyDetection(world, seen, distance[idx], playerHidden, crouching)
+        if detectionRate is None:
+            world.caught = True
+            world.flashAmount = 1.0
+            return True
+        if detectionRate > 0:
+            spotted = True
+        world.alertMeter += detectionRate * dt
+
+    # Guards off investigating are outside the arrays and stepped one by one
+    for idx in list(batch.investigating):
+        enemy = enemies[idx]
+        stepInvestigation(world, enemy, dt)
+        if enemy.task is None:
+            continue
+        refreshVisionCone(enemy)
+        seen = pointInPoly(playerCenter, enemy.cone) and not lineOfSightBlocked(world, enemy, playerCenter)
+        enemyRect = enemy.rect
+        guardDistance = math.hypot(enemyRect.centerx - playerCenter[0], enemyRect.centery - playerCenter[1])
+        detectionRate = scoreEnemyDetection(world, seen, guardDistance, playerHidden, crouching)
+        if detectionRate is None:
+            world.caught = True
+            world.flashAmount = 1.0
+            return True
+        if detectionRate > 0:
+            spotted = True
+        world.alertMeter += detectionRate * dt
+    return spotted
+
+
+def movePlayer(world, dt):
+    """Move the player by velocity * dt, resolving platform overlaps one axis at a time.
+
+    The move is split into substeps of at most PLAYER_COLLISION_STEP pixels,
+    thinner than any platform, so a long frame or a fast fall lands on a
+    platform instead of passing through it. Without collisions the result is
+    the same as one full step.
+    """
+    steps = max(1, math.ceil(max(abs(world.playerVel.x), abs(world.playerVel.y)) * dt / PLAYER_COLLISION_STEP))
+    step = dt / steps
+    world.onGround = False
+    for _ in range(steps):
+        world.playerPos.x += world.playerVel.x * step
+        world.playerRect.x = int(world.playerPos.x)
+
+        for platform in world.platforms:
+            if world.playerRect.colliderect(platform):
+                if world.playerVel.x > 0:
+                    world.playerRect.right = platform.left
+                elif world.playerVel.x < 0:
+                    world.playerRect.left = platform.right
+                world.playerPos.x = world.playerRect.x
+
+        world.playerPos.y += world.playerVel.y * step
+        world.playerRect.y = int(world.playerPos.y)
+
+        for platform in world.platforms:
+            if world.playerRect.colliderect(platform):
+                if world.playerVel.y > 0:
+                    world.playerRect.bottom = platform.top
+                    world.onGround = True
+                    world.playerVel.y = 0
+                elif world.playerVel.y < 0:
+                    world.playerRect.top = platform.bottom
+                    world.playerVel.y = 0
+                world.playerPos.y = world.playerRect.y
+
+
 def updatePlayState(world, keys, events, dt):
+    world.simTime += dt
     # Input handling
-    world["jumpBuffer"] = max(0.0, world["jumpBuffer"] - dt)
-    world["coyoteTimer"] = max(0.0, world["coyoteTimer"] - dt)
-    world["attackCooldown"] = max(0.0, world["attackCooldown"] - dt)
-    world["attackRect"] = None
-    was_caught = world.get("caught", False)
+    world.jumpBuffer = max(0.0, world.jumpBuffer - dt)
+    world.coyoteTimer = max(0.0, world.coyoteTimer - dt)
+    world.attackCooldown = max(0.0, world.attackCooldown - dt)
+    world.attackRect = None
+    was_caught = world.caught
 
     moveDir = 0
     if keys[pygame.K_a] or keys[pygame.K_LEFT]:
@@ -806,134 +2342,110 @@ def updatePlayState(world, keys, events, dt):
     jumpPressed = any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_SPACE for evt in events)
     attackPressed = any(evt.type == pygame.MOUSEBUTTONDOWN and evt.button == 1 for evt in events)
     if jumpPressed:
-        world["jumpBuffer"] = jumpBuffer
+        world.jumpBuffer = jumpBuffer
 
     # Physics / movement
     moveSpeed = runSpeed if running else walkSpeed
     if crouching:
         moveSpeed *= 0.6
-    world["playerVel"].x = moveDir * moveSpeed
+    world.playerVel.x = moveDir * moveSpeed
     if moveDir == 0:
-        world["playerVel"].x *= 0.7
+        world.playerVel.x *= 0.7
     if moveDir > 0:
-        world["facing"] = 1
+        world.facing = 1
     elif moveDir < 0:
-        world["facing"] = -1
-
-    if world["jumpBuffer"] > 0 and (world["onGround"] or world["coyoteTimer"] > 0):
-        world["playerVel"].y = -jumpForce
-        world["onGround"] = False
-        world["coyoteTimer"] = 0
-        world["jumpBuffer"] = 0
-
-    world["playerVel"].y += gravity * dt
-    world["playerPos"].x += world["playerVel"].x * dt
-    world["playerRect"].x = int(world["playerPos"].x)
-
-    for platform in world["platforms"]:
-        if world["playerRect"].colliderect(platform):
-            if world["playerVel"].x > 0:
-                world["playerRect"].right = platform.left
-            elif world["playerVel"].x < 0:
-                world["playerRect"].left = platform.right
-            world["playerPos"].x = world["playerRect"].x
-
-    world["playerPos"].y += world["playerVel"].y * dt
-    world["playerRect"].y = int(world["playerPos"].y)
-    world["onGround"] = False
-
-    for platform in world["platforms"]:
-        if world["playerRect"].colliderect(platform):
-            if world["playerVel"].y > 0:
-                world["playerRect"].bottom = platform.top
-                world["onGround"] = True
-                world["playerVel"].y = 0
-            elif world["playerVel"].y < 0:
-                world["playerRect"].top = platform.bottom
-                world["playerVel"].y = 0
-            world["playerPos"].y = world["playerRect"].y
-
-    if world["onGround"]:
-        world["coyoteTimer"] = coyoteTime
+        world.facing = -1
+
+    if world.jumpBuffer > 0 and (world.onGround or world.coyoteTimer > 0):
+        world.playerVel.y = -jumpForce
+        world.onGround = False
+        world.coyoteTimer = 0
+        world.jumpBuffer = 0
+
+    world.playerVel.y += gravity * dt
+    movePlayer(world, dt)
+
+    if world.onGround:
+        world.coyoteTimer = coyoteTime
 
     # Handle attack input and animation
-    if attackPressed and not world["attacking"] and world["attackCooldown"] <= 0:
-        world["attacking"] = True
-        world["attackCooldown"] = attackCooldown
-        world["attackAnimTime"] = 0.0
-        world["attackAnimFrame"] = 0
+    if attackPressed and not world.attacking and world.attackCooldown <= 0:
+        world.attacking = True
+        world.attackCooldown = attackCooldown
+        world.attackAnimTime = 0.0
+        world.attackAnimFrame = 0
         
     # Update attack animation if attacking
-    if world["attacking"]:
-        world["attackAnimTime"] += dt
-        world["attackAnimFrame"] = int(world["attackAnimTime"] * attackAnimFps)
+    if world.attacking:
+        world.attackAnimTime += dt
+        world.attackAnimFrame = int(world.attackAnimTime * attackAnimFps)
         
         # Create attack hitbox when on the active frame
-        if world["attackAnimFrame"] == attackActiveFrame and world["attackCooldown"] > attackCooldown * 0.8:
-            attackX = world["playerRect"].x + (world["playerRect"].width if world["facing"] > 0 else -attackWidth)
-            world["attackRect"] = pygame.Rect(
+        if world.attackAnimFrame == attackActiveFrame and world.attackCooldown > attackCooldown * 0.8:
+            attackX = world.playerRect.x + (world.playerRect.width if world.facing > 0 else -attackWidth)
+            world.attackRect = pygame.Rect(
                 attackX,
-                world["playerRect"].y + (world["playerRect"].height - attackHeight) // 2,
+                world.playerRect.y + (world.playerRect.height - attackHeight) // 2,
                 attackWidth,
                 attackHeight
             )
         else:
-            world["attackRect"] = None
+            world.attackRect = None
             
         # End attack animation when complete
-        if world["attackAnimTime"] >= attackFrameCount / attackAnimFps:
-            world["attacking"] = False
-            world["attackAnimTime"] = 0
-            world["attackAnimFrame"] = 0
-            world["attackRect"] = None
+        if world.attackAnimTime >= attackFrameCount / attackAnimFps:
+            world.attacking = False
+            world.attackAnimTime = 0
+            world.attackAnimFrame = 0
+            world.attackRect = None
 
-    horizontalSpeed = abs(world["playerVel"].x)
+    horizontalSpeed = abs(world.playerVel.x)
     movingHorizontally = horizontalSpeed > 60
 
     if playerRunFrames:
         totalFrames = len(playerRunFrames["right"]) or 1
         if movingHorizontally:
-            world["animTime"] += dt
-            world["animFrame"] = int(world["animTime"] * runAnimFps) % totalFrames
+            world.animTime += dt
+            world.animFrame = int(world.animTime * runAnimFps) % totalFrames
         else:
-            world["animTime"] = 0.0
-            world["animFrame"] = 0
+            world.animTime = 0.0
+            world.animFrame = 0
     else:
-        world["animTime"] = 0.0
-        world["animFrame"] = 0
+        world.animTime = 0.0
+        world.animFrame = 0
 
-    if world["attacking"]:
+    if world.attacking:
         totalAttackFrames = len(playerAttackFrames["right"]) if playerAttackFrames else attackFrameCount
-        world["attackAnimTime"] += dt
-        currentFrame = int(world["attackAnimTime"] * attackAnimFps)
+        world.attackAnimTime += dt
+        currentFrame = int(world.attackAnimTime * attackAnimFps)
         if currentFrame >= totalAttackFrames:
-            world["attacking"] = False
-            world["attackAnimTime"] = 0.0
-            world["attackAnimFrame"] = 0
+            world.attacking = False
+            world.attackAnimTime = 0.0
+            world.attackAnimFrame = 0
         else:
-            world["attackAnimFrame"] = currentFrame
+            world.attackAnimFrame = currentFrame
     else:
-        world["attackAnimTime"] = 0.0
-        world["attackAnimFrame"] = 0
+        world.attackAnimTime = 0.0
+        world.attackAnimFrame = 0
 
     # Stealth and detection logic - ONLY BUSHES work for hiding
     playerHidden = False
     hidingStrength = 1.0
-    for spot in world["hidingSpots"]:
-        if spot.get("type") == "bush" and world["playerRect"].colliderect(spot["rect"]):
+    for spot in world.hidingSpots:
+        if spot.type == "bush" and world.playerRect.colliderect(spot.rect):
             playerHidden = True
-            hidingStrength = min(hidingStrength, spot["strength"])
+            hidingStrength = min(hidingStrength, spot.strength)
 
-    if world["caught"]:
-        world["stealthState"] = "exposed"
+    if world.caught:
+        world.stealthState = "exposed"
     elif playerHidden:
-        world["stealthState"] = "hidden"
-    elif abs(world["playerVel"].x) > runSpeed * 0.7:
-        world["stealthState"] = "hustle"
-    elif abs(world["playerVel"].x) > walkSpeed * 0.4:
-        world["stealthState"] = "moving"
+        world.stealthState = "hidden"
+    elif abs(world.playerVel.x) > runSpeed * 0.7:
+        world.stealthState = "hustle"
+    elif abs(world.playerVel.x) > walkSpeed * 0.4:
+        world.stealthState = "moving"
     else:
-        world["stealthState"] = "idle"
+        world.stealthState = "idle"
 
     targetVisibility = 85
     if crouching:
@@ -941,201 +2453,372 @@ def updatePlayState(world, keys, events, dt):
     if playerHidden:
         targetVisibility = 20 + 60 * hidingStrength
 
-    speedBonus = min(abs(world["playerVel"].x) / runSpeed * 30, 30)
-    if not world["onGround"]:
+    speedBonus = min(abs(world.playerVel.x) / runSpeed * 30, 30)
+    if not world.onGround:
         speedBonus += 10
     if moveDir == 0:
         speedBonus *= 0.4
     targetVisibility += speedBonus
 
-    world["visibility"] += (targetVisibility - world["visibility"]) * 4 * dt
-    world["visibility"] = max(5, min(100, world["visibility"]))
+    world.visibility += (targetVisibility - world.visibility) * 4 * dt
+    world.visibility = max(5, min(100, world.visibility))
 
-    playerCenter = world["playerRect"].center
-    cameraGoal = world["playerRect"].centerx - width // 2
-    cameraGoal = max(0, min(levelWidth - width, cameraGoal))
-    world["cameraX"] += (cameraGoal - world["cameraX"]) * 2.5 * dt
+    playerCenter = world.playerRect.center
+    cameraGoal = world.playerRect.centerx - width // 2
+    cameraGoal = max(0, min(world.levelWidth - width, cameraGoal))
+    world.cameraX += (cameraGoal - world.cameraX) * 2.5 * dt
+    updateLevelStream(world)
     update_fireflies(world, dt)
     update_leaves(world, dt)
 
-    attackActive = world["attacking"] and world["attackAnimFrame"] >= attackActiveFrame
+    attackActive = world.attacking and world.attackAnimFrame >= attackActiveFrame
     if attackActive:
         slashRect = pygame.Rect(0, 0, attackWidth, attackHeight)
         offset = playerHitboxSize[0] // 2 + attackWidth // 2
-        slashRect.center = (world["playerRect"].centerx + world["facing"] * offset, world["playerRect"].centery)
-        world["attackRect"] = slashRect
+        slashRect.center = (world.playerRect.centerx + world.facing * offset, world.playerRect.centery)
+        world.attackRect = slashRect
 
-    if attackActive and world["attackRect"]:
-        for enemy in world["enemies"]:
-            if not enemy.get("active", True):
+    if attackActive and world.attackRect:
+        for enemy in world.enemies:
+            if not enemy.active:
                 continue
-            if world["attackRect"].colliderect(enemy["rect"]):
-                enemy["active"] = False
-                enemy["cone"] = []
-                enemy["deathAnimTime"] = 0.0
-                enemy["deathAnimFrame"] = 0
-                spawnParticles(world, enemy["rect"])
+            if world.attackRect.colliderect(enemy.rect):
+                defeatEnemy(world, enemy)
 
-    spotted = False
-    for enemy in world["enemies"]:
-        if world["caught"]:
-            break
-        if not enemy.get("active", True):
-            enemy["cone"] = []
-            # Update death animation
-            if enemyDeathFrames:
-                enemy["deathAnimTime"] += dt
-                enemy["deathAnimFrame"] = min(int(enemy["deathAnimTime"] * enemyDeathAnimFps), enemyDeathFrameCount - 1)
-            continue
-
-        # Update walking animation
-        if enemyWalkingFrames:
-            enemy["animTime"] += dt
-            totalFrames = len(enemyWalkingFrames.get("right", [])) or 1
-            enemy["animFrame"] = int(enemy["animTime"] * enemyWalkAnimFps) % totalFrames
-
-        enemyRect = enemy["rect"]
-        enemyRect.x += enemy["speed"] * enemy["dir"] * dt
-        if enemyRect.left < enemy["path"][0] or enemyRect.right > enemy["path"][1]:
-            enemy["dir"] *= -1
-            enemyRect.x = max(enemy["path"][0], min(enemyRect.x, enemy["path"][1] - enemyRect.width))
-
-        conePoints = buildVisionCone(enemy)
-        shiftedCone = [(x, y) for x, y in conePoints]
-        enemy["cone"] = shiftedCone
-        inside = pointInPoly(playerCenter, shiftedCone)
-        detectionRate = 0
-
-        if inside:
-            if not playerHidden:
-                world["caught"] = True
-                world["flashAmount"] = 1.0
-                spotted = True
-                break
-            visibilityFactor = world["visibility"] / 100
-            detectionRate += 30 * visibilityFactor
-            detectionRate *= 0.4
-            if crouching:
-                detectionRate *= 0.6
-
-        distance = math.hypot(enemyRect.centerx - playerCenter[0], enemyRect.centery - playerCenter[1])
-        if abs(world["playerVel"].x) > walkSpeed * 0.9 and distance < 220:
-            detectionRate += 20
-
-        if detectionRate > 0:
-            spotted = True
-        world["alertMeter"] += detectionRate * dt
+    alertBefore = world.alertMeter
+    if np is not None and len(world.enemies) >= BATCH_VISION_MIN_ENEMIES:
+        spotted = updateEnemiesBatched(world, playerCenter, playerHidden, crouching, dt)
+    else:
+        spotted = updateEnemies(world, playerCenter, playerHidden, crouching, dt)
+    if spotted:
+        world.lastSeen = world.playerRect.midbottom
 
-    if world["caught"]:
-        world["alertMeter"] = 100
+    if world.caught:
+        world.alertMeter = 100
     else:
         if not spotted:
-            world["alertMeter"] = max(0, world["alertMeter"] - 25 * dt)
-        world["alertMeter"] = min(120, world["alertMeter"])
-        if world["alertMeter"] >= 100:
-            world["caught"] = True
-            world["flashAmount"] = 1.0
-        if world["alertMeter"] > 85 and world.get("alertLogCooldown", 0.0) <= 0:
+            world.alertMeter = max(0, world.alertMeter - 25 * dt)
+        world.alertMeter = min(120, world.alertMeter)
+        if world.alertMeter >= 100:
+            world.caught = True
+            world.flashAmount = 1.0
+        if world.alertMeter > 85 and world.alertLogCooldown <= 0:
             push_mission_log(world, "Alert level climbing. Stay still.")
-            world["alertLogCooldown"] = 3.0
+            world.alertLogCooldown = 3.0
+        if alertBefore < INVESTIGATE_ALERT <= world.alertMeter and world.lastSeen is not None:
+            if sendInvestigators(world, world.lastSeen):
+                push_mission_log(world, "Guards are moving in to investigate.")
 
-    if world["caught"] and not was_caught:
+    if world.caught and not was_caught:
         push_mission_log(world, "Alert! Detection triggered.")
-    world["alertLogCooldown"] = max(0.0, world.get("alertLogCooldown", 0.0) - dt)
+    world.alertLogCooldown = max(0.0, world.alertLogCooldown - dt)
 
     # Orb collection logic
-    if not world["caught"]:
-        for orb in world["orbs"]:
-            if not orb["rescued"] and world["playerRect"].colliderect(orb["rect"]):
-                orb["rescued"] = True
-                world["rescued"] += 1
-                push_mission_log(world, f"Orb secured ({world['rescued']}/{len(world['orbs'])})")
-                spawnParticles(world, orb["rect"])
+    if not world.caught:
+        for orb in world.orbs:
+            if not orb.rescued and world.playerRect.colliderect(orb.rect):
+                orb.rescued = True
+                world.rescued += 1
+                push_mission_log(world, f"Orb secured ({world.rescued}/{world.orbTotal})")
+                spawnParticles(world, orb.rect)
 
     updateParticles(world, dt)
 
     # Win check
-    if not world["caught"] and not world["win"] and world["rescued"] == len(world["orbs"]) and world["playerRect"].colliderect(world["exitRect"]):
-        world["win"] = True
+    if not world.caught and not world.win and world.rescued == world.orbTotal and world.playerRect.colliderect(world.exitRect):
+        world.win = True
         push_mission_log(world, "Extraction point reached. Mission success imminent.")
 
-    world["flashAmount"] = max(0.0, world["flashAmount"] - dt)
+    world.flashAmount = max(0.0, world.flashAmount - dt)
     update_mission_log(world, dt)
 
 
-def drawBackground(surface, cameraX):
+def viewRect(rect, cam, scale=1.0):
+    """rect in world coordinates as drawn on a world layer rendered at scale."""
+    if scale == 1.0:
+        return pygame.Rect(rect.x - cam, rect.y, rect.width, rect.height)
+    left, top = round((rect.x - cam) * scale), round(rect.y * scale)
+    return pygame.Rect(left, top, round((rect.right - cam) * scale) - left, round(rect.bottom * scale) - top)
+
+
+scaledSprites = OrderedDict()
+
+
+def scaledSprite(sprite, scale):
+    """sprite resized for a world layer drawn at scale.
+
+    Results are kept in an LRU of SCALED_SPRITE_CACHE_SIZE entries. Each entry
+    holds its source sprite so the id() in the key cannot be reused, so the
+    bound also caps how many retired bush sprites stay alive.
+    """
+    if scale == 1.0 or sprite is None:
+        return sprite
+    key = (id(sprite), scale)
+    cached = scaledSprites.get(key)
+    if cached is not None and cached[0] is sprite:
+        scaledSprites.move_to_end(key)
+    else:
+        size = (max(1, round(sprite.get_width() * scale)), max(1, round(sprite.get_height() * scale)))
+        if sprite.get_colorkey() is not None:
+            # Filtering would blend the key colour into the edges
+            resized = pygame.transform.scale(sprite, size)
+        else:
+            try:
+                resized = pygame.transform.smoothscale(sprite, size)
+            except ValueError:  # smoothscale only handles 24 and 32 bit surfaces
+                resized = pygame.transform.scale(sprite, size)
+        cached = scaledSprites[key] = (sprite, normalizeSprite(resized))
+        scaledSprites.move_to_end(key)
+        if len(scaledSprites) > SCALED_SPRITE_CACHE_SIZE:
+            scaledSprites.popitem(last=False)
+    return cached[1]
+
+
+def surfaceFormat(surface):
+    return surface.get_bitsize(), surface.get_masks(), bool(surface.get_flags() & pygame.SRCALPHA)
+
+
+class BlitAudit:
+    """Flags blits whose source is not in one of the display's own formats.
+
+    Such a blit converts every source pixel on the fly. The first blit from
+    each call site and format is printed as it happens; report() lists them all
+    with counts.
+    """
+
+    def __init__(self):
+        self.formats = {
+            surfaceFormat(pygame.Surface((1, 1)).convert()),
+            surfaceFormat(pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()),
+        }
+        self.flagged = {}
+        self.canvases = {}
+
+    def check(self, source):
+        sourceFormat = surfaceFormat(source)
+        if sourceFormat in self.formats:
+            return
+        caller = sys._getframe(2)
+        key = (caller.f_code.co_name, caller.f_lineno, sourceFormat)
+        if key not in self.flagged:
+            bits, masks, alpha = sourceFormat
+            print(
+                f"Slow blit in {key[0]} (line {key[1]}): {source.get_width()}x{source.get_height()} "
+                f"{bits}-bit{' alpha' if alpha else ''} source, masks {masks}"
+            )
+        self.flagged[key] = self.flagged.get(key, 0) + 1
+
+    def canvas(self, surface):
+        """An AuditedSurface to draw a frame on in place of surface."""
+        size = surface.get_size()
+        canvas = self.canvases.get(size)
+        if canvas is None:
+            canvas = self.canvases[size] = AuditedSurface(size, 0, surface)
+        return canvas
+
+    def report(self):
+        print(f"Blit audit: {sum(self.flagged.values())} blits from {len(self.flagged)} call sites needed a format conversion")
+        for (name, line, (bits, _, alpha)), count in sorted(self.flagged.items(), key=lambda item: -item[1]):
+            print(f"  {name} (line {line}): {count} x {bits}-bit{' alpha' if alpha else ''}")
+
+
+class AuditedSurface(pygame.Surface):
+    """Draw buffer that passes every blit source to blitAudit."""
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        blitAudit.check(source)
+        return super().blit(source, dest, area, special_flags)
+
+    def blits(self, blit_sequence, doreturn=1):
+        blit_sequence = list(blit_sequence)
+        for item in blit_sequence:
+            blitAudit.check(item[0])
+        return super().blits(blit_sequence, doreturn)
+
+
+blitAudit = None
+
+
+def drawSurface(size, flags=0):
+    """New draw buffer in the display format, audited while --blit-audit is on."""
+    surfaceType = pygame.Surface if blitAudit is None else AuditedSurface
+    if flags & pygame.SRCALPHA:
+        return surfaceType(size, flags)
+    return surfaceType(size, flags, screen)
+
+
+class SurfacePool:
+    """Scratch surfaces for draw buffers that only live for one frame.
+
+    get() hands out a surface keyed by size and flags, cleared to transparent
+    unless the caller will cover it anyway; release() at the end of the frame
+    makes every surface handed out available again. Small sizes are rounded
+    up to POOL_SIZE_STEP so pulsing glows and dots share a few buckets; the
+    spare area stays transparent. highWater records the most surfaces of each
+    key in use within one frame.
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.inUse = []
+        self.counts = {}
+        self.highWater = {}
+        self.allocations = 0
+
+    def get(self, size, flags=pygame.SRCALPHA, clear=True):
+        w, h = size
+        if w < POOL_ROUND_BELOW and h < POOL_ROUND_BELOW:
+            w, h = -(-w // POOL_SIZE_STEP) * POOL_SIZE_STEP, -(-h // POOL_SIZE_STEP) * POOL_SIZE_STEP
+        key = (max(1, w), max(1, h), flags)
+        bucket = self.free.get(key)
+        if bucket:
+            surface = bucket.pop()
+            if clear:
+                surface.fill((0, 0, 0, 0))
+        else:
+            surface = drawSurface(key[:2], flags)
+            self.allocations += 1
+        self.inUse.append((key, surface))
+        count = self.counts[key] = self.counts.get(key, 0) + 1
+        if count > self.highWater.get(key, 0):
+            self.highWater[key] = count
+        return surface
+
+    def release(self):
+        for key, surface in self.inUse:
+            self.free.setdefault(key, []).append(surface)
+        self.inUse.clear()
+        self.counts.clear()
+
+    def report(self):
+        print(f"Scratch surfaces: {self.allocations} allocated across {len(self.highWater)} sizes")
+        for (w, h, flags), peak in sorted(self.highWater.items(), key=lambda item: -item[0][0] * item[0][1]):
+            print(f"  {w}x{h}{' alpha' if flags & pygame.SRCALPHA else ''}: {peak} in one frame")
+
+
+scratchSurfaces = SurfacePool()
+worldLayers = {}
+
+
+def getWorldLayer(scale):
+    size = (round(width * scale), round(height * scale))
+    layer = worldLayers.get(size)
+    if layer is None:
+        layer = worldLayers[size] = drawSurface(size)
+    return layer
+
+
+def drawBackground(surface, cameraX, spanWidth=levelWidth, scale=1.0):
     surface.fill(backgroundColor)
     for layer in range(3):
         layerColor = (10 + layer * 10, 25 + layer * 20, 20 + layer * 10)
         offset = cameraX * (0.15 * layer)
-        for x in range(-200, levelWidth, 220):
+        # Only walk the trunks that can land on screen; long missions span 100k+ px
+        scroll = cameraX + offset
+        firstX = -200 + max(0, math.ceil((scroll - 30 + 200) / 220)) * 220
+        for x in range(firstX, min(spanWidth, int(scroll) + width + 1), 220):
             trunkX = x - offset
-            pygame.draw.rect(surface, layerColor, (trunkX - cameraX, 260 + layer * 60, 30, 460))
+            pygame.draw.rect(
+                surface, layerColor,
+                ((trunkX - cameraX) * scale, (260 + layer * 60) * scale, math.ceil(30 * scale), math.ceil(460 * scale)),
+            )
 
 
-def draw_fog(surface, world):
-    fog_height = max(0, FOG_HEIGHT)
+def draw_fog(surface, world, scale=1.0):
+    fog_height = max(0, round(FOG_HEIGHT * scale))
     if fog_height <= 0:
         return
-    fog_surface = pygame.Surface((width, fog_height), pygame.SRCALPHA)
-    shift = world.get("fog_shift", 0.0)
+    band = renderQuality["fogBand"]
+    layer_width = surface.get_width()
+    fog_surface = scratchSurfaces.get((layer_width, fog_height), clear=False)
+    shift = world.fog_shift
     pulse = 0.15 * math.sin(shift)
     top_alpha = max(0, min(220, int((0.5 + pulse) * 255)))
     bottom_alpha = max(20, min(160, int((0.25 + pulse * 0.6) * 255)))
-    for y in range(fog_height):
+    for y in range(0, fog_height, band):
         t = y / max(1, fog_height)
         alpha = int(top_alpha * (1 - t) + bottom_alpha * t)
-        fog_surface.fill((8, 14, 22, alpha), rect=pygame.Rect(0, y, width, 1))
+        fog_surface.fill((8, 14, 22, alpha), rect=pygame.Rect(0, y, layer_width, band))
     surface.blit(fog_surface, (0, 0))
-    highlight = pygame.Surface((width, 4), pygame.SRCALPHA)
+    highlight = scratchSurfaces.get((layer_width, max(1, round(4 * scale))), clear=False)
     hl_alpha = min(60, int(20 + abs(pulse) * 40))
     highlight.fill((255, 255, 255, hl_alpha))
-    surface.blit(highlight, (0, 6))
+    surface.blit(highlight, (0, round(6 * scale)))
+
+
+ambientSprites = {}
+
+
+def ambientSprite(key, draw):
+    """Small firefly or leaf sprite, drawn once per key; alpha is quantized into the key."""
+    sprite = ambientSprites.get(key)
+    if sprite is None:
+        sprite = ambientSprites[key] = draw()
+    return sprite
+
+
+def fireflyDot(size, radius, alpha):
+    dot = pygame.Surface((size, size), pygame.SRCALPHA)
+    pygame.draw.circle(dot, (186, 255, 225, alpha), (size // 2, size // 2), radius)
+    return dot
 
 
-def draw_fireflies(surface, world):
-    flies = world.get("fireflies")
+def leafStroke(size, start, end, alpha, lineWidth):
+    stroke = pygame.Surface(size, pygame.SRCALPHA)
+    pygame.draw.line(stroke, (166, 214, 194, alpha), start, end, lineWidth)
+    return stroke
+
+
+def draw_fireflies(surface, world, scale=1.0):
+    flies = world.fireflies
     if not flies:
         return
-    cam = world.get("cameraX", 0.0)
-    for fly in flies:
-        glow = 0.4 + 0.4 * math.sin(fly["pulse"])
-        radius = max(2.2, fly["size"] + 1.2 * math.sin(fly["pulse"] * 1.5))
+    cam = world.cameraX
+    dots = []
+    for fly in flies[:int(len(flies) * renderQuality["fireflies"])]:
+        glow = 0.4 + 0.4 * math.sin(fly.pulse)
+        radius = max(2.2, fly.size + 1.2 * math.sin(fly.pulse * 1.5)) * scale
         size = int(radius * 2 + 4)
-        dot = pygame.Surface((size, size), pygame.SRCALPHA)
-        alpha = max(60, min(220, int(glow * 255)))
-        pygame.draw.circle(dot, (186, 255, 225, alpha), (size // 2, size // 2), int(radius))
-        px = int(round(fly["x"] - cam))
-        py = int(round(fly["y"]))
-        surface.blit(dot, (px - size // 2, py - size // 2))
+        alpha = max(60, min(220, int(glow * 255))) & ~AMBIENT_ALPHA_MASK
+        radius = max(1, int(radius))
+        dot = ambientSprite(("fly", size, radius, alpha), lambda: fireflyDot(size, radius, alpha))
+        px = int(round((fly.x - cam) * scale))
+        py = int(round(fly.y * scale))
+        dots.append((dot, (px - size // 2, py - size // 2)))
+    surface.blits(dots, doreturn=False)
 
 
-def draw_leaves(surface, world):
-    leaves = world.get("leaves")
+def draw_leaves(surface, world, scale=1.0):
+    leaves = world.leaves
     if not leaves:
         return
-    cam = world.get("cameraX", 0.0)
-    for leaf in leaves:
-        px = leaf["x"] - cam
-        py = leaf["y"]
-        dx = leaf["direction"] * 12
-        dy = max(1, int(leaf["length"]))
+    cam = world.cameraX
+    strokes = []
+    for leaf in leaves[:int(len(leaves) * renderQuality["leaves"])]:
+        px = (leaf.x - cam) * scale
+        py = leaf.y * scale
+        dx = round(leaf.direction * 12 * scale)
+        dy = max(1, int(leaf.length * scale))
         width = abs(dx) + 6
         height = dy + 6
-        leaf_surface = pygame.Surface((width, height), pygame.SRCALPHA)
         start_x = 3 if dx >= 0 else width - 3
         start = (start_x, 2)
         end = (start_x + dx, 2 + dy)
-        alpha = max(60, min(220, int(150 + math.sin(leaf["sway"] * 0.9) * 60)))
-        pygame.draw.line(leaf_surface, (166, 214, 194, alpha), start, end, 2)
-        surface.blit(leaf_surface, (int(px) - start_x, int(py) - 2))
+        alpha = max(60, min(220, int(150 + math.sin(leaf.sway * 0.9) * 60))) & ~AMBIENT_ALPHA_MASK
+        lineWidth = max(1, round(2 * scale))
+        leaf_surface = ambientSprite(
+            ("leaf", width, height, dx, alpha, lineWidth),
+            lambda: leafStroke((width, height), start, end, alpha, lineWidth),
+        )
+        strokes.append((leaf_surface, (int(px) - start_x, int(py) - 2)))
+    surface.blits(strokes, doreturn=False)
 
 
 def draw_exit_pointer(surface, world):
-    exit_rect = world.get("exitRect")
+    exit_rect = world.exitRect
     if not exit_rect:
         return
-    player_center = world["playerRect"].centerx
+    player_center = world.playerRect.centerx
     exit_center = exit_rect.centerx
     direction = exit_center - player_center
     arrow_dir = 1 if direction >= 0 else -1
@@ -1155,14 +2838,14 @@ def draw_exit_pointer(surface, world):
 
 
 def draw_stealth_state(surface, world):
-    state = STEALTH_STATES.get(world.get("stealthState"), STEALTH_STATES["idle"])
+    state = STEALTH_STATES.get(world.stealthState, STEALTH_STATES["idle"])
     rect = pygame.Rect(30, 110, 220, 28)
     pygame.draw.rect(surface, (12, 18, 32), rect)
     pygame.draw.rect(surface, state["color"], rect, width=2, border_radius=6)
     label = smallFont.render(f"Stealth: {state['label']}", True, state["color"])
     surface.blit(label, (rect.x + 10, rect.y + 4))
 def draw_mission_log(surface, world):
-    log = world.get("missionLog")
+    log = world.missionLog
     if not log:
         return
     log_width = 310
@@ -1172,8 +2855,8 @@ def draw_mission_log(surface, world):
     height = padding + header_height + len(log) * entry_height + padding // 2
     x = width - log_width - 28
     y = 80
-    panel = pygame.Surface((log_width, height), pygame.SRCALPHA)
-    rect = panel.get_rect()
+    panel = scratchSurfaces.get((log_width, height))
+    rect = pygame.Rect(0, 0, log_width, height)
     pygame.draw.rect(panel, (12, 18, 32, 218), rect, border_radius=12)
     pygame.draw.rect(panel, (120, 210, 190, 200), rect, width=2, border_radius=12)
     surface.blit(panel, (x, y))
@@ -1186,14 +2869,15 @@ def draw_mission_log(surface, world):
         surface.blit(entry_surface, (x + padding, y + header_height + 6 + idx * entry_height))
 
 
-def blitPlayerSprite(surface, sprite, world, orientation, cam):
+def blitPlayerSprite(surface, sprite, world, orientation, cam, scale=1.0):
     """Blit player sprite with safe error handling."""
     try:
         if sprite is None:
             return False
         offsetX, offsetY = playerSpriteOffsets.get(orientation, playerSpriteOffsets.get("right", (0, 0)))
-        drawX = int(round(world["playerRect"].x - cam - offsetX))
-        drawY = int(round(world["playerRect"].y - offsetY))
+        drawX = int(round((world.playerRect.x - cam - offsetX) * scale))
+        drawY = int(round((world.playerRect.y - offsetY) * scale))
+        sprite = scaledSprite(sprite, scale)
         # Ensure sprite is valid and coordinates are reasonable
         if sprite.get_width() > 0 and sprite.get_height() > 0:
             spriteRect = sprite.get_rect(topleft=(drawX, drawY))
@@ -1204,91 +2888,115 @@ def blitPlayerSprite(surface, sprite, world, orientation, cam):
     return False
 
 
-def drawOrb(surface, orb, cam, time):
-    """Draw an orb with pulsing glow effect and visual marker."""
-    if orb["rescued"]:
-        return
-    
-    centerX = int(orb["rect"].centerx - cam)
-    centerY = int(orb["rect"].centery)
-    
-    # Calculate pulse based on time and phase
-    pulse = 0.5 + 0.5 * math.sin(time * orbPulseSpeed + orb.get("pulsePhase", 0))
-    currentGlowSize = orbGlowSize * (0.8 + 0.2 * pulse)
-    currentOrbSize = orbSize * (0.9 + 0.1 * pulse)
-    
-    # Draw outer glow (multiple layers for smooth glow effect)
-    glowAlpha = int(80 + 40 * pulse)
-    for i in range(3, 0, -1):
-        glowRadius = int(currentGlowSize * (i / 3))
-        if glowRadius > 0:
-            glowSurface = pygame.Surface((glowRadius * 2 + 4, glowRadius * 2 + 4), pygame.SRCALPHA)
-            alpha = int(glowAlpha * (i / 3) * 0.6)
-            glowCenter = glowRadius + 2
-            pygame.draw.circle(glowSurface, (*orbGlowColor, alpha), (glowCenter, glowCenter), glowRadius)
-            surface.blit(glowSurface, (centerX - glowCenter, centerY - glowCenter))
-    
-    # Draw orb core (bright center)
-    coreRadius = max(3, int(currentOrbSize * 0.6))
-    pygame.draw.circle(surface, orbCoreColor, (centerX, centerY), coreRadius)
-    
-    # Draw orb outer ring
-    ringRadius = int(currentOrbSize)
-    if ringRadius > 0:
-        pygame.draw.circle(surface, orbColor, (centerX, centerY), ringRadius, 2)
-    
-    # Draw visual marker (arrow pointing up above orb)
-    markerOffset = int(currentGlowSize * 0.7) + 20
-    markerY = centerY - markerOffset
-    markerAlpha = int(180 + 75 * pulse)
-    
-    # Draw arrow marker using a small surface
-    markerSize = 30
-    markerSurface = pygame.Surface((markerSize, markerSize), pygame.SRCALPHA)
-    markerCenterX = markerSize // 2
-    markerCenterY = markerSize // 2
-    
-    # Draw arrow pointing up
-    arrowPoints = [
-        (markerCenterX, markerCenterY - 10),
-        (markerCenterX - 6, markerCenterY - 2),
-        (markerCenterX + 6, markerCenterY - 2),
-    ]
-    pygame.draw.polygon(markerSurface, (*orbGlowColor, markerAlpha), arrowPoints)
-    
-    # Draw small circle at arrow base
-    pygame.draw.circle(markerSurface, (*orbGlowColor, markerAlpha), (markerCenterX, markerCenterY + 2), 4)
-    
-    # Blit marker above the orb
-    surface.blit(markerSurface, (centerX - markerCenterX, markerY - markerCenterY))
+def drawOrbs(surface, orbs, cam, time, scale=1.0):
+    """Draw orbs with pulsing glow effect and visual marker.
+
+    The glows of every orb go out in one Surface.blits call, then the cores
+    and rings are drawn over them, then the markers go out in a second call.
+    """
+    glows, cores, markers = [], [], []
+    for orb in orbs:
+        if orb.rescued:
+            continue
+        
+        centerX = int((orb.rect.centerx - cam) * scale)
+        centerY = int(orb.rect.centery * scale)
+        
+        # Calculate pulse based on time and phase
+        pulse = 0.5 + 0.5 * math.sin(time * orbPulseSpeed + orb.pulsePhase)
+        currentGlowSize = orbGlowSize * (0.8 + 0.2 * pulse) * scale
+        currentOrbSize = orbSize * (0.9 + 0.1 * pulse) * scale
+        
+        # Draw outer glow (multiple layers for smooth glow effect)
+        glowAlpha = int(80 + 40 * pulse)
+        for i in range(3, 3 - renderQuality["orbGlowLayers"], -1):
+            glowRadius = int(currentGlowSize * (i / 3))
+            if glowRadius > 0:
+                glowSurface = scratchSurfaces.get((glowRadius * 2 + 4, glowRadius * 2 + 4))
+                alpha = int(glowAlpha * (i / 3) * 0.6)
+                glowCenter = glowRadius + 2
+                pygame.draw.circle(glowSurface, (*orbGlowColor, alpha), (glowCenter, glowCenter), glowRadius)
+                glows.append((glowSurface, (centerX - glowCenter, centerY - glowCenter)))
+        
+        # Orb core (bright center) and outer ring, drawn once the glows are down
+        cores.append(((centerX, centerY), max(3 * scale, int(currentOrbSize * 0.6)), int(currentOrbSize)))
+        
+        # Draw visual marker (arrow pointing up above orb)
+        markerOffset = int(currentGlowSize * 0.7) + round(20 * scale)
+        markerY = centerY - markerOffset
+        markerAlpha = int(180 + 75 * pulse)
+        
+        # Draw arrow marker using a small surface
+        markerSize = round(30 * scale)
+        markerSurface = scratchSurfaces.get((markerSize, markerSize))
+        markerCenterX = markerSize // 2
+        markerCenterY = markerSize // 2
+        
+        # Draw arrow pointing up
+        arrowPoints = [
+            (markerCenterX, markerCenterY - 10 * scale),
+            (markerCenterX - 6 * scale, markerCenterY - 2 * scale),
+            (markerCenterX + 6 * scale, markerCenterY - 2 * scale),
+        ]
+        pygame.draw.polygon(markerSurface, (*orbGlowColor, markerAlpha), arrowPoints)
+        
+        # Draw small circle at arrow base
+        pygame.draw.circle(markerSurface, (*orbGlowColor, markerAlpha), (markerCenterX, markerCenterY + 2 * scale), max(1, round(4 * scale)))
+        
+        # Marker above the orb
+        markers.append((markerSurface, (centerX - markerCenterX, markerY - markerCenterY)))
 
+    surface.blits(glows, doreturn=False)
+    for center, coreRadius, ringRadius in cores:
+        pygame.draw.circle(surface, orbCoreColor, center, coreRadius)
+        if ringRadius > 0:
+            pygame.draw.circle(surface, orbColor, center, ringRadius, max(1, round(2 * scale)))
+    surface.blits(markers, doreturn=False)
+
+
+particleSprites = {}
 
-def drawGame(surface, world):
-    # Rendering
-    drawBackground(surface, world["cameraX"])
-    draw_fog(surface, world)
-    draw_leaves(surface, world)
-    draw_fireflies(surface, world)
-    cam = world["cameraX"]
 
-    for platform in world["platforms"]:
-        pygame.draw.rect(surface, (30, 40, 35), (platform.x - cam, platform.y, platform.width, platform.height))
+def particleSprite(radius):
+    """Solid orbGlowColor dot for particles (the world layer has no alpha, so they were always opaque)."""
+    sprite = particleSprites.get(radius)
+    if sprite is None:
+        sprite = particleSprites[radius] = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, orbGlowColor, (radius, radius), radius)
+    return sprite
 
-    for spot in world["hidingSpots"]:
-        sprite = spot.get("sprite")
+
+def drawWorldLayer(surface, world, scale=1.0):
+    """Everything that scrolls with the camera, drawn at scale on surface."""
+    cam = world.cameraX
+    drawBackground(surface, cam, world.levelWidth, scale)
+    draw_fog(surface, world, scale)
+    draw_leaves(surface, world, scale)
+    draw_fireflies(surface, world, scale)
+
+    for platform in world.platforms:
+        pygame.draw.rect(surface, (30, 40, 35), viewRect(platform, cam, scale))
+
+    # Sprites are gathered per layer and submitted with one Surface.blits call
+    bushes = []
+    for spot in world.hidingSpots:
+        sprite = scaledSprite(spot.sprite, scale)
         if sprite:
-            surface.blit(sprite, (spot["rect"].x - cam, spot["rect"].y))
+            bushes.append((sprite, viewRect(spot.rect, cam, scale)))
         else:
-            pygame.draw.rect(surface, spot["color"], (spot["rect"].x - cam, spot["rect"].y, spot["rect"].width, spot["rect"].height))
+            pygame.draw.rect(surface, spot.color, viewRect(spot.rect, cam, scale))
+    surface.blits(bushes, doreturn=False)
 
-    pygame.draw.rect(surface, exitColor, (world["exitRect"].x - cam, world["exitRect"].y, world["exitRect"].width, world["exitRect"].height))
+    pygame.draw.rect(surface, exitColor, viewRect(world.exitRect, cam, scale))
 
-    visionSurface = pygame.Surface((width, height), pygame.SRCALPHA)
+    coneLayer = renderQuality["coneLayer"]
+    visionSurface = scratchSurfaces.get(surface.get_size()) if coneLayer else None
 
-    for enemy in world["enemies"]:
-        rect = enemy["rect"]
-        enemyActive = enemy.get("active", True)
-        enemyType = enemy.get("type", "guard")
+    enemySprites = []
+    for enemy in world.enemies:
+        rect = enemy.rect
+        enemyActive = enemy.active
+        enemyType = enemy.type
         
         # Draw enemy sprite
         spriteDrawn = False
@@ -1296,21 +3004,21 @@ def drawGame(surface, world):
             # Draw death animation
             deathFrames = enemyDeathFrames.get("right", []) or enemyDeathFrames.get("left", [])
             if deathFrames:
-                deathFrame = min(enemy.get("deathAnimFrame", 0), len(deathFrames) - 1)
+                deathFrame = min(enemy.deathAnimFrame, len(deathFrames) - 1)
                 sprite = deathFrames[deathFrame]
-                orientation = "right" if enemy.get("dir", 1) >= 0 else "left"
+                orientation = "right" if enemy.dir >= 0 else "left"
                 if orientation == "left" and "left" in enemyDeathFrames:
                     sprite = enemyDeathFrames["left"][deathFrame]
-                surface.blit(sprite, (rect.x - cam, rect.y))
+                enemySprites.append((scaledSprite(sprite, scale), viewRect(rect, cam, scale)))
                 spriteDrawn = True
         elif enemyActive and enemyWalkingFrames and enemyType == "guard":
             # Draw walking animation for guards
-            orientation = "right" if enemy.get("dir", 1) >= 0 else "left"
+            orientation = "right" if enemy.dir >= 0 else "left"
             walkFrames = enemyWalkingFrames.get(orientation, [])
             if walkFrames:
-                animFrame = enemy.get("animFrame", 0) % len(walkFrames)
+                animFrame = enemy.animFrame % len(walkFrames)
                 sprite = walkFrames[animFrame]
-                surface.blit(sprite, (rect.x - cam, rect.y))
+                enemySprites.append((scaledSprite(sprite, scale), viewRect(rect, cam, scale)))
                 spriteDrawn = True
         
         # Fallback to rectangle if sprite not drawn
@@ -1318,53 +3026,58 @@ def drawGame(surface, world):
             color = enemyColor if enemyType == "guard" else droneColor
             if not enemyActive:
                 color = tuple(min(255, c + 60) for c in color)
-            pygame.draw.rect(surface, color, (rect.x - cam, rect.y, rect.width, rect.height), border_radius=6)
+            pygame.draw.rect(surface, color, viewRect(rect, cam, scale), border_radius=max(1, round(6 * scale)))
         
-        # Draw vision cone for active enemies
-        if enemyActive:
-            cone = enemy.get("cone")
+        # Draw vision cone for active enemies near the screen; cones are only
+        # rebuilt here when the enemy moved since the last time
+        reach = enemy.vision[0]
+        if enemyActive and cam - reach < rect.centerx < cam + width + reach:
+            refreshVisionCone(enemy)
+            cone = enemy.cone
             if cone:
-                conePoints = [(x - cam, y) for x, y in cone]
+                conePoints = [((x - cam) * scale, y * scale) for x, y in cone]
                 coneColor = (255, 210, 90, 60) if enemyType == "guard" else (120, 200, 255, 60)
-                pygame.draw.polygon(visionSurface, coneColor, conePoints)
+                if coneLayer:
+                    pygame.draw.polygon(visionSurface, coneColor, conePoints)
+                else:
+                    pygame.draw.polygon(surface, coneColor[:3], conePoints, max(1, round(2 * scale)))
 
-    surface.blit(visionSurface, (0, 0))
+    surface.blits(enemySprites, doreturn=False)
+    if coneLayer:
+        surface.blit(visionSurface, (0, 0))
 
     # Draw orbs with pulsing glow and visual markers
     currentTime = pygame.time.get_ticks() / 1000.0
-    for orb in world["orbs"]:
-        drawOrb(surface, orb, cam, currentTime)
-
-    draw_exit_pointer(surface, world)
+    drawOrbs(surface, world.orbs, cam, currentTime, scale)
 
     # Draw player sprite (always draw, even if sprites fail to load)
     spriteDrawn = False
-    orientation = "right" if world["facing"] >= 0 else "left"
+    orientation = "right" if world.facing >= 0 else "left"
     
     # Try to draw player sprite based on state
     try:
-        if world["caught"] and playerHurtFrames:
+        if world.caught and playerHurtFrames:
             hurtFrames = playerHurtFrames.get(orientation, [])
             if hurtFrames and len(hurtFrames) > 0:
                 animIndex = (pygame.time.get_ticks() * hurtAnimFps // 1000) % len(hurtFrames)
                 sprite = hurtFrames[animIndex]
-                if blitPlayerSprite(surface, sprite, world, orientation, cam):
+                if blitPlayerSprite(surface, sprite, world, orientation, cam, scale):
                     spriteDrawn = True
 
-        if not spriteDrawn and world["attacking"] and playerAttackFrames:
+        if not spriteDrawn and world.attacking and playerAttackFrames:
             attackFrames = playerAttackFrames.get(orientation, [])
             if attackFrames and len(attackFrames) > 0:
-                idx = min(world["attackAnimFrame"], len(attackFrames) - 1)
+                idx = min(world.attackAnimFrame, len(attackFrames) - 1)
                 sprite = attackFrames[idx]
-                if blitPlayerSprite(surface, sprite, world, orientation, cam):
+                if blitPlayerSprite(surface, sprite, world, orientation, cam, scale):
                     spriteDrawn = True
 
         if not spriteDrawn and playerRunFrames:
             runFrames = playerRunFrames.get(orientation, [])
             if runFrames and len(runFrames) > 0:
-                animFrame = world.get("animFrame", 0) % len(runFrames)
+                animFrame = world.animFrame % len(runFrames)
                 sprite = runFrames[animFrame]
-                if blitPlayerSprite(surface, sprite, world, orientation, cam):
+                if blitPlayerSprite(surface, sprite, world, orientation, cam, scale):
                     spriteDrawn = True
     except (KeyError, IndexError, AttributeError, TypeError):
         # If sprite rendering fails, fall back to rectangle
@@ -1373,32 +3086,55 @@ def drawGame(surface, world):
     # Always draw player fallback (rectangle) if sprites didn't render
     # This ensures the player is always visible, even if sprites fail
     if not spriteDrawn:
-        playerX = int(round(world["playerRect"].x - cam))
-        playerY = int(round(world["playerRect"].y))
         # Always draw the player rectangle, even if off-screen (pygame handles clipping)
         try:
-            pygame.draw.rect(surface, playerColor, (playerX, playerY, world["playerRect"].width, world["playerRect"].height), border_radius=12)
+            pygame.draw.rect(surface, playerColor, viewRect(world.playerRect, round(cam), scale), border_radius=max(1, round(12 * scale)))
         except (TypeError, ValueError):
             # If coordinates are invalid, draw at a safe fallback position
             pygame.draw.rect(surface, playerColor, (width // 2 - 20, height // 2 - 20, 40, 40), border_radius=12)
 
-    for particle in world["particles"]:
-        alpha = int(255 * (particle["life"]))
-        pygame.draw.circle(surface, (*orbGlowColor, alpha), (int(particle["pos"][0] - cam), int(particle["pos"][1])), 3)
+    dot = particleSprite(max(1, round(3 * scale)))
+    radius = dot.get_width() // 2
+    surface.blits(
+        [(dot, (int((particle.pos[0] - cam) * scale) - radius, int(particle.pos[1] * scale) - radius)) for particle in world.particles],
+        doreturn=False,
+    )
+
+    screenTints = renderQuality["screenTints"]
+    if world.alertMeter > 85:
+        if screenTints:
+            warningSurface = scratchSurfaces.get(surface.get_size(), clear=False)
+            warningSurface.fill((200, 50, 50, 50))
+            surface.blit(warningSurface, (0, 0))
+        else:
+            pygame.draw.rect(surface, (200, 50, 50), surface.get_rect(), max(1, round(6 * scale)))
+
+    if world.flashAmount > 0:
+        if screenTints:
+            flashSurface = scratchSurfaces.get(surface.get_size(), clear=False)
+            flashSurface.fill((255, 80, 80, int(120 * world.flashAmount)))
+            surface.blit(flashSurface, (0, 0))
+        else:
+            pygame.draw.rect(surface, (255, 80, 80), surface.get_rect(), max(1, int(14 * scale * world.flashAmount)))
+
+
+def drawHud(surface, world):
+    """Bars, text and pointers, always drawn at the native resolution."""
+    draw_exit_pointer(surface, world)
 
     stealthRect = pygame.Rect(30, 30, 280, 22)
     pygame.draw.rect(surface, (40, 50, 60), stealthRect)
-    stealthFill = int(stealthRect.width * (world["visibility"] / 100))
+    stealthFill = int(stealthRect.width * (world.visibility / 100))
     pygame.draw.rect(surface, stealthBarColor, (stealthRect.x, stealthRect.y, stealthFill, stealthRect.height))
     pygame.draw.rect(surface, (200, 200, 200), stealthRect, 2)
 
     alertRect = pygame.Rect(width - 340, 30, 300, 20)
     pygame.draw.rect(surface, (40, 30, 30), alertRect)
-    alertFill = int(alertRect.width * (world["alertMeter"] / 100))
+    alertFill = int(alertRect.width * (world.alertMeter / 100))
     pygame.draw.rect(surface, alertColor, (alertRect.x, alertRect.y, alertFill, alertRect.height))
     pygame.draw.rect(surface, (200, 200, 200), alertRect, 2)
 
-    orbsText = font.render(f"Orbs collected: {world['rescued']}/{len(world['orbs'])}", True, (220, 230, 230))
+    orbsText = font.render(f"Orbs collected: {world.rescued}/{world.orbTotal}", True, (220, 230, 230))
     surface.blit(orbsText, (30, 65))
 
     hintText = smallFont.render("A/D move | SPACE jump | S hide | Left click attack | R retry", True, (170, 180, 190))
@@ -1408,18 +3144,8 @@ def drawGame(surface, world):
 
     draw_stealth_state(surface, world)
 
-    if world["alertMeter"] > 85:
-        warningSurface = pygame.Surface((width, height), pygame.SRCALPHA)
-        warningSurface.fill((200, 50, 50, 50))
-        surface.blit(warningSurface, (0, 0))
-
-    if world["flashAmount"] > 0:
-        flashSurface = pygame.Surface((width, height), pygame.SRCALPHA)
-        flashSurface.fill((255, 80, 80, int(120 * world["flashAmount"])))
-        surface.blit(flashSurface, (0, 0))
-
-    if world.get("isTutorial"):
-        for hint in world.get("tutorialHints", []):
+    if world.isTutorial:
+        for hint in world.tutorialHints:
             text = hint.get("text", "")
             pos = hint.get("pos", (40, 80))
             if not text:
@@ -1431,11 +3157,35 @@ def drawGame(surface, world):
             surface.blit(label, pos)
 
 
-def drawTitle(surface):
+renderScale = 1.0  # Set by --render-scale; the world layer is drawn this much smaller and upscaled
+
+
+def drawGame(surface, world):
+    # Rendering
+    if renderScale >= 1.0:
+        drawWorldLayer(surface, world)
+    else:
+        layer = getWorldLayer(renderScale)
+        drawWorldLayer(layer, world, renderScale)
+        pygame.transform.scale(layer, surface.get_size(), surface)
+    drawHud(surface, world)
+    scratchSurfaces.release()
+
+
+def drawTitle(surface, loadProgress=1.0):
     drawBackground(surface, 0)
     titleText = bigFont.render("Whispers of the Canopy", True, (220, 240, 230))
-    promptText = font.render("Press ENTER to start", True, (180, 190, 190))
     surface.blit(titleText, (width // 2 - titleText.get_width() // 2, height // 2 - 80))
+    if loadProgress < 1.0:
+        barRect = pygame.Rect(width // 2 - 160, height // 2 + 8, 320, 14)
+        pygame.draw.rect(surface, (15, 25, 35), barRect, border_radius=6)
+        fillRect = barRect.inflate(-4, -4)
+        fillRect.width = int(fillRect.width * loadProgress)
+        pygame.draw.rect(surface, (120, 200, 170), fillRect, border_radius=5)
+        loadText = smallFont.render("Gathering the forest...", True, (180, 190, 190))
+        surface.blit(loadText, (width // 2 - loadText.get_width() // 2, height // 2 + 30))
+        return
+    promptText = font.render("Press ENTER to start", True, (180, 190, 190))
     surface.blit(promptText, (width // 2 - promptText.get_width() // 2, height // 2))
 
 
@@ -1449,7 +3199,7 @@ def drawCaught(surface):
 
 
 def drawWin(surface, world):
-    if world and world.get("isTutorial"):
+    if world and world.isTutorial:
         winText = bigFont.render("Tutorial complete!", True, (200, 255, 200))
         promptText = font.render("Press ENTER to begin the real mission", True, (230, 230, 230))
         noteText = smallFont.render("Remember: collect every orb and stay hidden.", True, (210, 220, 210))
@@ -1463,70 +3213,445 @@ def drawWin(surface, world):
         surface.blit(promptText, (width // 2 - promptText.get_width() // 2, height // 2))
 
 
-tutorialCompleted = False
-worldState = None
-gameState = "title"
-stateTimer = 0.0
+renderQuality = QUALITY_LEVELS[0]
+
+
+class QualityGovernor:
+    """Steps renderQuality down when frames run over budget and back up with headroom.
+
+    Frame times go into a rolling window of QUALITY_WINDOW samples. A level is
+    dropped as soon as the average nears the budget, but only regained after a
+    whole fresh window averages well under it, so quality does not flap at the
+    boundary. Each switch clears the window and is printed.
+    """
+
+    def __init__(self, budget=1.0 / fps, levels=QUALITY_LEVELS):
+        self.budget = budget
+        self.levels = levels
+        self.level = 0
+        self.samples = []
+        self.total = 0.0
+        self.heldUntil = 0.0
+
+    def record(self, frameSeconds, now):
+        samples = self.samples
+        samples.append(frameSeconds)
+        self.total += frameSeconds
+        if len(samples) > QUALITY_WINDOW:
+            self.total -= samples.pop(0)
+        if now < self.heldUntil or len(samples) < QUALITY_WINDOW // 3:
+            return
+        average = self.total / len(samples)
+        if average > self.budget * QUALITY_DOWNGRADE_AT and self.level < len(self.levels) - 1:
+            self.switch(self.level + 1, average, now)
+        elif len(samples) >= QUALITY_WINDOW and average < self.budget * QUALITY_UPGRADE_AT and self.level > 0:
+            self.switch(self.level - 1, average, now)
+
+    def switch(self, level, average, now):
+        global renderQuality
+        previous = self.levels[self.level]["name"]
+        self.level = level
+        renderQuality = self.levels[level]
+        print(
+            f"Quality {previous} -> {renderQuality['name']}: "
+            f"{average * 1000:.1f} ms average frame over {len(self.samples)} frames "
+            f"(budget {self.budget * 1000:.1f} ms)"
+        )
+        self.samples.clear()
+        self.total = 0.0
+        self.heldUntil = now + QUALITY_HOLD_SECONDS
 
-# Game loop
-while True:
-    dt_raw = clock.tick(fps) / 1000.0
-    # Cap delta time aggressively to prevent large jumps when window loses/gains focus
-    # Maximum of 2 frames worth of time (prevents issues when clicking)
-    max_dt = (1.0 / fps) * 2
-    dt = min(dt_raw, max_dt)
-    
-    eventList = pygame.event.get()
-    for event in eventList:
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-
-    keyState = pygame.key.get_pressed()
-
-    if gameState == "title":
-        if any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_RETURN for evt in eventList):
-            worldState = resetWorld(tutorial=not tutorialCompleted)
-            gameState = "playing"
-            stateTimer = 0.0
-    elif gameState == "playing":
-        if worldState is not None:
-            updatePlayState(worldState, keyState, eventList, dt)
-            if worldState["caught"]:
-                gameState = "caught"
-                stateTimer = 0.0
-            if worldState["win"]:
-                gameState = "win"
-                stateTimer = 0.0
-    elif gameState == "caught":
-        stateTimer += dt
-        restartPressed = any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_r for evt in eventList)
-        if restartPressed or stateTimer >= 1.8:
-            worldState = resetWorld(tutorial=worldState.get("isTutorial") if worldState else False)
-            gameState = "playing"
-            stateTimer = 0.0
-    elif gameState == "win":
-        if any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_RETURN for evt in eventList):
-            if worldState and worldState.get("isTutorial") and not tutorialCompleted:
-                tutorialCompleted = True
-                worldState = resetWorld()
-            else:
-                worldState = resetWorld(tutorial=not tutorialCompleted)
-            gameState = "playing"
-            stateTimer = 0.0
 
-    # Rendering - always render to ensure player is visible
-    if gameState == "title":
-        drawTitle(screen)
+def drawFrame(surface, gameState, world, loadProgress):
+    if blitAudit is not None:
+        canvas = blitAudit.canvas(surface)
+        drawFrameContents(canvas, gameState, world, loadProgress)
+        surface.blit(canvas, (0, 0))
     else:
-        if worldState is not None:
-            drawGame(screen, worldState)
-            if gameState == "caught":
-                drawCaught(screen)
-            if gameState == "win":
-                drawWin(screen, worldState)
+        drawFrameContents(surface, gameState, world, loadProgress)
+
+
+def drawFrameContents(surface, gameState, world, loadProgress):
+    if gameState == "title" or world is None:
+        drawTitle(surface, loadProgress)
+        return
+    drawGame(surface, world)
+    if gameState == "caught":
+        drawCaught(surface)
+    if gameState == "win":
+        drawWin(surface, world)
+
+
+class FramePacer:
+    """Waits out each frame and measures how evenly frames reach the screen.
+
+    tick sleeps, which is cheap but can overshoot by a millisecond or two;
+    tick_busy_loop spins through the end of the wait for an exact interval at
+    the cost of a busy core; vsync leaves pacing to a flip that blocks until
+    the display refreshes, except when the flip runs on the render thread and
+    the loop still ticks at rate. Jitter is how far present-to-present intervals stray
+    from the frame budget. Input latency runs from the event poll that
+    delivered a jump or attack press to the flip that first shows its result.
+    """
+
+    def __init__(self, mode, clock, rate=fps, pipelined=False):
+        self.mode = mode
+        self.clock = clock
+        # A vsync flip on the render thread only blocks that thread, so the loop still needs a cap
+        self.flipPaces = mode == "vsync" and not pipelined
+        self.rate = rate
+        self.budget = 1.0 / rate
+        self.frameStart = time.perf_counter()
+        self.lastPresent = None
+        self.inputStamp = None
+        self.intervals = deque(maxlen=PACING_WINDOW)
+        self.latencies = deque(maxlen=PACING_WINDOW)
+
+    def wait(self):
+        """Block until the next frame is due and return the milliseconds since the last one."""
+        if self.flipPaces:
+            # The previous flip already waited for the refresh
+            elapsed = self.clock.tick()
+        elif self.mode == "tick_busy_loop":
+            elapsed = self.clock.tick_busy_loop(self.rate)
         else:
-            # Fallback if worldState is None
-            drawTitle(screen)
+            elapsed = self.clock.tick(self.rate)
+        self.frameStart = time.perf_counter()
+        return elapsed
+
+    def polled(self, events):
+        if self.inputStamp is None and any(
+            (evt.type == pygame.KEYDOWN and evt.key == pygame.K_SPACE)
+            or (evt.type == pygame.MOUSEBUTTONDOWN and evt.button == 1)
+            for evt in events
+        ):
+            self.inputStamp = self.frameStart
+
+    def takeInput(self):
+        stamp, self.inputStamp = self.inputStamp, None
+        return stamp
+
+    def presented(self, inputStamp=None):
+        now = time.perf_counter()
+        if self.lastPresent is not None:
+            self.intervals.append(now - self.lastPresent)
+        self.lastPresent = now
+        if inputStamp is not None:
+            self.latencies.append(now - inputStamp)
+
+    def summary(self):
+        intervals = sorted(self.intervals)
+        if not intervals:
+            return None
+        count = len(intervals)
+        result = {
+            "mode": self.mode,
+            "frames": count,
+            "meanMs": round(sum(intervals) / count * 1000, 2),
+            "jitterMs": round(sum(abs(interval - self.budget) for interval in intervals) / count * 1000, 2),
+            "p99Ms": round(intervals[min(count - 1, int(count * 0.99))] * 1000, 2),
+            "late": sum(1 for interval in intervals if interval > self.budget * 1.5),
+        }
+        if self.latencies:
+            result["inputLatencyMs"] = round(sum(self.latencies) / len(self.latencies) * 1000, 2)
+            result["inputLatencyMaxMs"] = round(max(self.latencies) * 1000, 2)
+        return result
+
+    def report(self):
+        result = self.summary()
+        if result is None:
+            return
+        print(
+            f"Frame pacing ({result['mode']}): {result['frames']} frames, mean {result['meanMs']} ms, "
+            f"jitter {result['jitterMs']} ms, p99 {result['p99Ms']} ms, {result['late']} late"
+        )
+        if "inputLatencyMs" in result:
+            print(f"  input to present: mean {result['inputLatencyMs']} ms, worst {result['inputLatencyMaxMs']} ms")
 
+
+def presentFrame(surface, pacer, gameState, world, loadProgress, inputStamp=None):
+    """Draw and flip one frame, returning the seconds it took.
+
+    A vsync flip blocks until the refresh, which is pacing rather than work,
+    so under vsync only the drawing is counted.
+    """
+    started = time.perf_counter()
+    drawFrame(surface, gameState, world, loadProgress)
+    drawn = time.perf_counter()
     pygame.display.flip()
+    presented = time.perf_counter()
+    if pacer is None:
+        return presented - started
+    pacer.presented(inputStamp)
+    return (drawn if pacer.mode == "vsync" else presented) - started
+
+
+class RenderPipeline:
+    """Draws and flips published frames on a worker thread.
+
+    The simulation publishes (gameState, renderSnapshot, loadProgress) each tick
+    and carries on; pygame releases the GIL in fills, blits and flips, so the
+    two overlap and a frame costs roughly the slower of them instead of their
+    sum. Only the newest unrendered frame is kept, so a slow renderer drops
+    frames rather than holding the simulation back. An exception on the render
+    thread stops it and is raised again from the next publish() or stop().
+    """
+
+    def __init__(self, surface, pacer=None):
+        self.surface = surface
+        self.pacer = pacer
+        self.frame = None
+        self.renderSeconds = 0.0
+        self.error = None
+        self.running = True
+        self.ready = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="render", daemon=True)
+        self.thread.start()
+
+    def publish(self, gameState, world, loadProgress, inputStamp=None):
+        self.raiseError()
+        frame = (gameState, renderSnapshot(world) if world is not None else None, loadProgress)
+        with self.ready:
+            # An input carried by a dropped frame is first shown by its replacement
+            if self.frame is not None and self.frame[1] is not None:
+                inputStamp = self.frame[1] if inputStamp is None else min(inputStamp, self.frame[1])
+            self.frame = (frame, inputStamp)
+            self.ready.notify()
+
+    def run(self):
+        while True:
+            with self.ready:
+                while self.frame is None and self.running:
+                    self.ready.wait()
+                if not self.running:
+                    return
+                (frame, inputStamp), self.frame = self.frame, None
+            try:
+                self.renderSeconds = presentFrame(self.surface, self.pacer, *frame, inputStamp)
+            except Exception as error:
+                self.error = error
+                return
+
+    def raiseError(self):
+        # Hand a render thread failure to the main thread once
+        error, self.error = self.error, None
+        if error is not None:
+            raise error
+
+    def stop(self):
+        with self.ready:
+            self.running = False
+            self.ready.notify()
+        self.thread.join()
+        self.raiseError()
+
+
+def reportStartup():
+    print("Startup breakdown:")
+    for (_, previous), (phase, stamp) in zip(startupMarks, startupMarks[1:]):
+        print(f"  {phase:<18}{(stamp - previous) * 1000:8.1f} ms")
+    print(f"  {'total':<18}{(startupMarks[-1][1] - startupMarks[0][1]) * 1000:8.1f} ms")
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Whispers of the Canopy")
+    parser.add_argument(
+        "--mission-width",
+        type=int,
+        default=None,
+        help="stream a long mission of this many pixels instead of the fixed level",
+    )
+    parser.add_argument("--level", default=None, help="play a curated level file instead of a generated one")
+    parser.add_argument(
+        "--startup-report",
+        action="store_true",
+        help="print how long each startup phase took, up to the first frame",
+    )
+    parser.add_argument(
+        "--pipelined-render",
+        action="store_true",
+        help="draw on a separate thread so rendering overlaps the next simulation tick",
+    )
+    parser.add_argument("--telemetry", action="store_true", help="record session telemetry")
+    parser.add_argument(
+        "--telemetry-log",
+        default=None,
+        help="where session telemetry is appended (implies --telemetry; default telemetry.jsonl next to main.py)",
+    )
+    parser.add_argument(
+        "--surface-report",
+        action="store_true",
+        help="on exit, print how many scratch draw surfaces were allocated and the most used per frame",
+    )
+    parser.add_argument(
+        "--frame-pacing",
+        choices=FRAME_PACING_MODES,
+        default="tick",
+        help="how frames are paced: sleep (tick), sleep then spin (tick_busy_loop) or wait for the display refresh (vsync)",
+    )
+    parser.add_argument(
+        "--pacing-report",
+        action="store_true",
+        help="on exit, print frame-time jitter and input-to-present latency",
+    )
+    parser.add_argument(
+        "--blit-audit",
+        action="store_true",
+        help="print every blit whose source is not in the display's pixel format, and a summary on exit",
+    )
+    parser.add_argument(
+        "--render-scale",
+        type=float,
+        default=1.0,
+        help="draw the world at this fraction of the window size (e.g. 0.5) and upscale it; the HUD stays sharp",
+    )
+    return parser.parse_args(argv)
+
+
+def recordState(kind, world, **fields):
+    """Telemetry for a gameState transition, tagged with the level seed and where the player is."""
+    if sessionTelemetry is not None:
+        center = world.playerRect.center
+        sessionTelemetry.record(kind, seed=world.seed, x=center[0], y=center[1], simTime=round(world.simTime, 3), **fields)
+
+
+def main(argv=None):
+    global renderScale, sessionTelemetry, screen, blitAudit
+    startupMarks.append(("module setup", time.perf_counter()))
+    launchArgs = parseArgs(argv)
+    if launchArgs.telemetry or launchArgs.telemetry_log:
+        sessionTelemetry = Telemetry(launchArgs.telemetry_log or TELEMETRY_PATH)
+    renderScale = min(1.0, max(0.25, launchArgs.render_scale))
+    firstFrame = True
+    tutorialCompleted = False
+    worldState = None
+    levelSnapshot = None
+    gameState = "title"
+    stateTimer = 0.0
+    # The next mission is generated in the background while the current one is played
+    levelWorker = ThreadPoolExecutor(max_workers=1)
+    nextWorld = levelWorker.submit(generateWorld, missionWidth=launchArgs.mission_width, levelPath=launchArgs.level)
+    assetWorker = ThreadPoolExecutor(max_workers=3)
+    pendingAssets = startAssetLoading(assetWorker)
+    loadProgress = 0.0
+    pacingMode = launchArgs.frame_pacing
+    if pacingMode == "vsync":
+        try:
+            screen = pygame.display.set_mode((width, height), pygame.SCALED, vsync=1)
+        except pygame.error as err:
+            print(f"vsync unavailable ({err}), pacing with tick")
+            screen = pygame.display.set_mode((width, height))
+            pacingMode = "tick"
+    framePacer = FramePacer(pacingMode, clock, pipelined=launchArgs.pipelined_render)
+    if launchArgs.blit_audit:
+        blitAudit = BlitAudit()
+    renderPipeline = RenderPipeline(screen, framePacer) if launchArgs.pipelined_render else None
+    qualityGovernor = QualityGovernor()
+    simSeconds = renderSeconds = 0.0
+
+    # Game loop
+    try:
+        while True:
+            dt_raw = framePacer.wait() / 1000.0
+            # Player movement is substepped, so a hitch is caught up in one step; the cap
+            # only stops a long stall (window drag, focus loss) from turning into a jump
+            dt = min(dt_raw, MAX_FRAME_DT)
+            if sessionTelemetry is not None and gameState == "playing":
+                sessionTelemetry.frame(dt_raw)
+            if gameState == "playing":
+                # Last frame's work: simulation and drawing run one after the other, or
+                # side by side when the render thread draws
+                if renderPipeline is not None:
+                    frameSeconds = max(simSeconds, renderPipeline.renderSeconds)
+                else:
+                    frameSeconds = simSeconds + renderSeconds
+                qualityGovernor.record(frameSeconds, time.perf_counter())
+
+            eventList = pygame.event.get()
+            framePacer.polled(eventList)
+            for event in eventList:
+                if event.type == pygame.QUIT:
+                    if launchArgs.pacing_report:
+                        framePacer.report()
+                    if blitAudit is not None:
+                        blitAudit.report()
+                    if launchArgs.surface_report:
+                        scratchSurfaces.report()
+                    sys.exit()
+
+            keyState = pygame.key.get_pressed()
+
+            if pendingAssets:
+                loadProgress = pollAssetLoading(pendingAssets)
+
+            if gameState == "title":
+                # Play starts only once every sprite sheet has been installed
+                if loadProgress >= 1.0 and any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_RETURN for evt in eventList):
+                    worldState = resetWorld(tutorial=not tutorialCompleted, missionWidth=launchArgs.mission_width, levelPath=launchArgs.level)
+                    levelSnapshot = snapshotWorld(worldState)
+                    recordState("level", worldState, tutorial=worldState.isTutorial, levelPath=launchArgs.level)
+                    gameState = "playing"
+                    stateTimer = 0.0
+            elif gameState == "playing":
+                if worldState is not None:
+                    simStarted = time.perf_counter()
+                    updatePlayState(worldState, keyState, eventList, dt)
+                    simSeconds = time.perf_counter() - simStarted
+                    if worldState.caught:
+                        gameState = "caught"
+                        stateTimer = 0.0
+                        recordState("caught", worldState, alert=round(worldState.alertMeter, 1))
+                    if worldState.win:
+                        gameState = "win"
+                        stateTimer = 0.0
+                        recordState("win", worldState, orbs=worldState.rescued)
+            elif gameState == "caught":
+                stateTimer += dt
+                restartPressed = any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_r for evt in eventList)
+                if restartPressed or stateTimer >= 1.8:
+                    # Retry the same level from its freshly generated state
+                    worldState = restoreWorld(levelSnapshot)
+                    recordState("retry", worldState)
+                    gameState = "playing"
+                    stateTimer = 0.0
+            elif gameState == "win":
+                if any(evt.type == pygame.KEYDOWN and evt.key == pygame.K_RETURN for evt in eventList):
+                    if worldState and worldState.isTutorial:
+                        tutorialCompleted = True
+                    worldState = attachWorldSprites(nextWorld.result())
+                    nextWorld = levelWorker.submit(generateWorld, missionWidth=launchArgs.mission_width, levelPath=launchArgs.level)
+                    levelSnapshot = snapshotWorld(worldState)
+                    recordState("level", worldState, tutorial=worldState.isTutorial, levelPath=launchArgs.level)
+                    gameState = "playing"
+                    stateTimer = 0.0
+
+            # Rendering - always render to ensure player is visible
+            if renderPipeline is not None:
+                # Snapshotting the world for the render thread is main-thread work too
+                handoffStarted = time.perf_counter()
+                renderPipeline.publish(gameState, worldState, loadProgress, framePacer.takeInput())
+                simSeconds += time.perf_counter() - handoffStarted
+            else:
+                renderSeconds = presentFrame(screen, framePacer, gameState, worldState, loadProgress, framePacer.takeInput())
+            if firstFrame:
+                firstFrame = False
+                startupMarks.append(("first frame", time.perf_counter()))
+                if launchArgs.startup_report:
+                    reportStartup()
+    finally:
+        # Runs on a crash or Ctrl-C too, when the buffered tail of the session matters most
+        try:
+            if renderPipeline is not None:
+                # Raises a render thread failure that no publish() has reported yet
+                renderPipeline.stop()
+        finally:
+            if sessionTelemetry is not None:
+                pacing = framePacer.summary()
+                if pacing is not None:
+                    sessionTelemetry.record("pacing", **pacing)
+                sessionTelemetry.close()
+            pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
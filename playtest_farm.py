@@ -0,0 +1,570 @@
+"""Play generated levels with a scripted bot to measure detection and completion.
+
+The bot drives updatePlayState with synthesized key states. It routes toward
+the nearest orb (then the exit) over the platform jump graph, cut into short
+segments so routes follow where the player walks, and takes gaps with a running
+jump. Each tick it predicts every nearby patrol's vision cone a second ahead;
+a move that would walk or jump into one is traded for waiting, a bush or
+backing off, and a guard looking the other way within reach is cut down.
+Orbs the bot cannot get to are given up on, so a "stuck" run usually points at
+an unreachable spot in the level. Seeds are spread across a process pool and
+per-seed results are aggregated into a JSON report.
+
+    python playtest_farm.py --count 500 --out playtest.json
+"""
+
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import main as game  # noqa: E402  (the video driver must be chosen before pygame loads)
+
+pygame = game.pygame
+
+JUMP_EVENTS = [pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)]
+ATTACK_EVENTS = [pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1)]
+THREAT_HORIZON = (0.0, 0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.35, 0.4, 0.5, 0.6, 0.75, 0.9, 1.2)  # Seconds ahead that patrol cones are predicted for
+CONE_MARGIN = 16  # Predicted cones are padded by this much to cover timing and LOD catch-up slop
+THREAT_RANGE = 260  # Enemies further than this beyond their cone reach are ignored
+TAKEDOWN_SECONDS = 0.35  # Slash only when no cone reaches the player before it lands
+WALK_SAFE_SECONDS = 0.5  # A route step on foot goes ahead when no cone is predicted to reach it this soon
+BACK_OFF = 400  # How far to retreat along the platform when neither waiting nor a bush is safe
+QUIET_RADIUS = 260  # Sneak (crouch-walk) this close to an enemy so footsteps don't raise the alert
+BUSH_SEARCH_RADIUS = 220
+HIDE_UNTIL_ALERT = 5
+STUCK_SECONDS = 0.3
+GIVE_UP_SECONDS = 12.0  # Abandon a target the bot has not got any closer to for this long
+CLIMB_MARGIN = 16  # Headroom kept under the jump apex when planning a climb
+NAV_SEGMENT = 160  # Platforms are split into pieces this wide for the bot's route planning
+THINK_TICKS = 3  # The bot picks keys every this many ticks and holds them in between, about a player's reaction rate
+JUMP_MARGIN = 40  # Horizontal slack kept on a running jump for take-off and landing
+
+
+def flightTime(fromY, toY):
+    """Seconds a jump from height fromY takes to come down to toY."""
+    return (game.jumpForce + math.sqrt(max(0.0, game.jumpForce ** 2 - 2 * game.gravity * (fromY - toY)))) / game.gravity
+
+
+def botCanLink(a, b):
+    """Stricter than can_link_platforms: only jumps the bot can actually make from a to b.
+
+    A running jump covers runSpeed times the time until the player's feet come
+    back down to b's top, so higher platforms have to be closer.
+    """
+    if a.top - b.top > game.MAX_JUMP_HEIGHT - CLIMB_MARGIN:
+        return False
+    reach = game.runSpeed * flightTime(a.top, b.top) - JUMP_MARGIN
+    return game.horizontal_gap(a, b) <= min(game.MAX_HORIZONTAL_GAP, reach)
+
+
+def navSegments(platforms, clearance, width=NAV_SEGMENT):
+    """platforms cut into pieces at most width wide, and a map from each piece back to its platform.
+
+    PlatformNav costs a jump from the middle of a platform, which on the floor
+    is half the level away from the player; routes over short pieces follow
+    where the player actually walks. Stretches under a ceiling lower than
+    clearance are left out, since the player cannot stand there.
+    """
+    segments = []
+    platformOf = {}
+    for platform in platforms:
+        free = [(platform.left, platform.right)]
+        for ceiling in platforms:
+            if ceiling is platform or not 0 <= platform.top - ceiling.bottom < clearance:
+                continue
+            free = [
+                piece
+                for left, right in free
+                for piece in ((left, min(right, ceiling.left)), (max(left, ceiling.right), right))
+                if piece[1] - piece[0] > 0
+            ]
+        for left, right in free:
+            count = max(1, math.ceil((right - left) / width))
+            cuts = [left + (right - left) * index // count for index in range(count + 1)]
+            for start, end in zip(cuts, cuts[1:]):
+                segment = pygame.Rect(start, platform.top, end - start, platform.height)
+                segments.append(segment)
+                platformOf[tuple(segment)] = platform
+    return segments, platformOf
+
+
+class BotKeys:
+    """Stands in for pygame.key.get_pressed() with the keys the bot is holding."""
+
+    __slots__ = ("down",)
+
+    def __init__(self):
+        self.down = set()
+
+    def __getitem__(self, key):
+        return key in self.down
+
+
+class PatrolGhost:
+    """Copy of an enemy's patrol state that advancePatrol can move without touching the enemy."""
+
+    __slots__ = ("rect", "path", "posX", "dir", "speed")
+
+    def __init__(self, enemy):
+        self.rect = enemy.rect.copy()
+        self.path = enemy.path
+        self.posX = enemy.posX
+        self.dir = enemy.dir
+        self.speed = enemy.speed
+
+
+def paddedCone(cone, margin=CONE_MARGIN):
+    """cone with every edge pushed margin pixels outwards, and its bounding box.
+
+    The cone is convex, so moving each corner along the mitre of its two edge
+    normals keeps every edge parallel to where it was.
+    """
+    count = len(cone)
+    # Which side is outside depends on the winding, which flips with the facing
+    area = sum(cone[i - 1][0] * cone[i][1] - cone[i][0] * cone[i - 1][1] for i in range(count))
+    turn = 1 if area > 0 else -1
+    normals = []
+    for i in range(count):
+        (ax, ay), (bx, by) = cone[i], cone[(i + 1) % count]
+        length = math.hypot(bx - ax, by - ay) or 1.0
+        normals.append(((by - ay) * turn / length, (ax - bx) * turn / length))
+    padded = []
+    for i in range(count):
+        (px, py), (nx, ny) = normals[i - 1], normals[i]
+        scale = margin / max(1.0 + px * nx + py * ny, 0.1)
+        padded.append((cone[i][0] + (px + nx) * scale, cone[i][1] + (py + ny) * scale))
+    xs = [x for x, _ in padded]
+    ys = [y for _, y in padded]
+    return padded, min(xs), max(xs), min(ys), max(ys)
+
+
+class PlaytestBot:
+    __slots__ = (
+        "world", "nav", "keys", "landings", "current", "hiding", "lastX", "lastY", "stuckTime",
+        "abandoned", "goal", "goalDistance", "goalTime", "gaveUp", "cones", "templates", "bushes", "segments",
+        "platformOf",
+    )
+
+    def __init__(self, world):
+        self.world = world
+        self.segments, self.platformOf = navSegments(world.platforms, world.playerRect.height)
+        self.nav = game.PlatformNav(self.segments, canLink=botCanLink)
+        self.keys = BotKeys()
+        self.landings = {}
+        self.current = None
+        self.current = self.standingPlatform() or self.segments[0]
+        self.hiding = False
+        self.lastX, self.lastY = world.playerRect.topleft
+        self.stuckTime = 0.0
+        self.abandoned = set()
+        self.goal = None
+        self.goalDistance = math.inf
+        self.goalTime = 0.0
+        self.gaveUp = False
+        self.cones = []
+        self.templates = {}
+        self.bushes = [spot.rect for spot in world.hidingSpots if spot.type == "bush"]
+
+    def standingPlatform(self):
+        """The segment under the player's feet: the current one while they are still on it, else the one under their centre."""
+        rect = self.world.playerRect
+        under = [
+            segment
+            for segment in self.segments
+            if segment.top == rect.bottom and segment.left < rect.right and rect.left < segment.right
+        ]
+        if self.current in under:
+            # Standing across a cut, switching back and forth would flip the route every tick
+            return self.current
+        return min(under, key=lambda segment: abs(segment.centerx - rect.centerx)) if under else None
+
+    def target(self):
+        """The orb being chased, else the nearest one still worth chasing, then the exit; None once everything is abandoned."""
+        world = self.world
+        player = world.playerRect
+        remaining = [orb.rect for orb in world.orbs if not orb.rescued and tuple(orb.rect) not in self.abandoned]
+        if remaining:
+            # Sticking with it keeps two orbs about as near from resetting each other's progress clock
+            for rect in remaining:
+                if tuple(rect) == self.goal:
+                    return rect
+            return min(remaining, key=lambda rect: abs(rect.centerx - player.centerx) + abs(rect.centery - player.centery))
+        if world.rescued < world.orbTotal or tuple(world.exitRect) in self.abandoned:
+            return None
+        return world.exitRect
+
+    def trackProgress(self, target, dt):
+        """Abandon target when the bot stops getting closer to it."""
+        player = self.world.playerRect
+        distance = abs(target.centerx - player.centerx) + abs(target.centery - player.centery)
+        if self.goal != tuple(target):
+            self.goal = tuple(target)
+            self.goalDistance = distance
+            self.goalTime = 0.0
+        elif distance < self.goalDistance - 8:
+            self.goalDistance = distance
+            self.goalTime = 0.0
+        else:
+            self.goalTime += dt
+            if self.goalTime > GIVE_UP_SECONDS:
+                self.abandoned.add(self.goal)
+                self.goal = None
+
+    def coneTemplate(self, enemy, facing):
+        """Padded cone of enemy with its rect at x = 0; a patrol only slides it sideways."""
+        key = (id(enemy), enemy.rect.y, facing)
+        template = self.templates.get(key)
+        if template is None:
+            template = self.templates[key] = paddedCone(game.visionConeAt(enemy, 0, facing))
+        return template
+
+    def predictCones(self):
+        """Cones of the nearby enemies at each THREAT_HORIZON step, as (padded cone, x offset) pairs."""
+        world = self.world
+        px, py = world.playerRect.center
+        now = world.simTime
+        cones = [[] for _ in THREAT_HORIZON]
+        for enemy in world.enemies:
+            reach = enemy.vision[0] + THREAT_RANGE
+            if not enemy.active or abs(enemy.rect.centerx - px) > reach or abs(enemy.rect.centery - py) > THREAT_RANGE:
+                continue
+            if enemy.task is not None:
+                # Investigating guards do not follow their patrol, so assume they keep looking the same way
+                game.refreshVisionCone(enemy)
+                cone = (paddedCone(enemy.cone), 0)
+                for step in cones:
+                    step.append(cone)
+                continue
+            # A sleeping enemy catches up on the time since its last update when it wakes
+            ghost = PatrolGhost(enemy)
+            elapsed = 0.0 if enemy.lastUpdate is None else enemy.lastUpdate - now
+            for step, ahead in zip(cones, THREAT_HORIZON):
+                game.advancePatrol(ghost, ahead - elapsed)
+                elapsed = ahead
+                step.append((self.coneTemplate(enemy, 1 if ghost.dir >= 0 else -1), ghost.rect.x))
+        self.cones = cones
+
+    def seen(self, point, step):
+        """Whether a cone predicted for THREAT_HORIZON[step] covers point outside every bush."""
+        x, y = point
+        for (cone, left, right, top, bottom), offset in self.cones[step]:
+            local = x - offset
+            if left <= local <= right and top <= y <= bottom and game.pointInPoly((local, y), cone):
+                return not any(bush.collidepoint(point) for bush in self.bushes)
+        return False
+
+    def safeFor(self, aimX, jump, speed, landY=None):
+        """Seconds the player can head for aimX (jumping first if asked) before a cone is predicted to reach them.
+
+        A fall is followed down to landY, the centre height on the segment the player is heading for.
+        """
+        world = self.world
+        px, py = world.playerRect.center
+        if landY is None:
+            landY = py
+        rise = -game.jumpForce if jump else world.playerVel.y
+        for step, ahead in enumerate(THREAT_HORIZON):
+            x = px + max(-speed * ahead, min(speed * ahead, aimX - px))
+            y = py + rise * ahead + game.gravity * ahead * ahead / 2
+            if rise + game.gravity * ahead > 0 and y > landY:
+                y = landY
+            if self.seen((x, y), step):
+                return ahead
+        return math.inf
+
+    def nearestBush(self):
+        player = self.world.playerRect
+        bushes = [
+            rect
+            for rect in self.bushes
+            if abs(rect.centerx - player.centerx) < BUSH_SEARCH_RADIUS and abs(rect.bottom - player.bottom) < 24
+        ]
+        return min(bushes, key=lambda rect: abs(rect.centerx - player.centerx)) if bushes else None
+
+    def enemyNearby(self):
+        px, py = self.world.playerRect.center
+        return any(
+            enemy.active and math.hypot(enemy.rect.centerx - px, enemy.rect.centery - py) < QUIET_RADIUS
+            for enemy in self.world.enemies
+        )
+
+    def takedownTarget(self):
+        """An enemy in reach of the slash in front of the player that is looking the other way."""
+        world = self.world
+        player = world.playerRect
+        facing = world.facing
+        reach = player.width // 2 + game.attackWidth
+        for enemy in world.enemies:
+            if not enemy.active:
+                continue
+            ahead = (enemy.rect.centerx - player.centerx) * facing
+            if not 0 < ahead < reach or abs(enemy.rect.centery - player.centery) > (game.attackHeight + enemy.rect.height) // 2:
+                continue
+            if (enemy.dir >= 0) == (facing > 0):
+                return enemy
+        return None
+
+    def landingPlatform(self, target):
+        """The segment to stand on to grab target: the highest one below its centre."""
+        key = (target.x, target.y)
+        segment = self.landings.get(key)
+        if segment is None:
+            below = [
+                segment
+                for segment in self.segments
+                if segment.left < target.right and target.left < segment.right and segment.top >= target.centery
+            ]
+            if below:
+                segment = min(below, key=lambda rect: (rect.top, abs(rect.centerx - target.centerx)))
+            else:
+                segment = min(self.segments, key=lambda rect: abs(rect.centerx - target.centerx) + abs(rect.top - target.bottom))
+            self.landings[key] = segment
+        return segment
+
+    def nextPlatform(self, current, target):
+        """The next segment on the jump route toward target, or None once standing on its landing segment."""
+        landing = self.landingPlatform(target)
+        if landing is current:
+            return None
+        nav = self.nav
+        route = nav.route(nav.findNode(current), nav.findNode(landing))
+        if not route or len(route) < 2:
+            return None
+        return nav.platforms[route[1]]
+
+    def canWalkTo(self, x):
+        """Whether no platform stands between the player and x at their height."""
+        player = self.world.playerRect
+        left = min(player.left, x - player.width // 2)
+        walk = pygame.Rect(left, player.top, max(player.right, x + player.width // 2) - left, player.height - 1)
+        return walk.collidelist(self.world.platforms) < 0
+
+    def routeMove(self, target, grounded):
+        """Where to head, whether to jump and whether to run this tick to follow the jump route toward target.
+
+        None when no route leads from the current segment to target's.
+        """
+        player = self.world.playerRect
+        segment = self.nextPlatform(self.current, target)
+        if segment is None and self.landingPlatform(target) is not self.current:
+            return None
+        if segment is None:
+            aimX = target.centerx
+            return aimX, grounded and target.bottom < player.top + 8 and abs(aimX - player.centerx) < 30, False
+        # Jumps and edges are worked out on whole platforms; the segments only steer the route
+        current = self.platformOf[tuple(self.current)]
+        nextPlatform = self.platformOf[tuple(segment)]
+        onto = min(max(player.centerx, segment.left + player.width), segment.right - player.width)
+        # Rising beside a platform: drift in only once clear of its lip
+        belowLip = game.horizontal_gap(player, nextPlatform) < 8 and player.bottom > nextPlatform.top
+        if nextPlatform is current:
+            return segment.centerx, False, False
+        if game.horizontal_gap(current, nextPlatform) > 0:
+            # Across a gap: take a running jump from the edge of this one
+            edge = current.right if nextPlatform.left >= current.right else current.left
+            jump = grounded and abs(player.centerx - edge) < player.width
+            return (player.centerx if not grounded and belowLip else onto), jump, True
+        if nextPlatform.top < current.top - 4:
+            # A higher platform overhead: jump from just past its edge nearest the segment, then drift on,
+            # keeping to edges the player can walk to
+            launches = [nextPlatform.left - player.width, nextPlatform.right + player.width]
+            launches = [x for x in launches if current.left <= x <= current.right and self.canWalkTo(x)] or launches
+            launchX = min(launches, key=lambda x: abs(x - segment.centerx))
+            if grounded:
+                return launchX, abs(player.centerx - launchX) < 8, False
+            return (player.centerx if belowLip else onto), False, False
+        if not grounded:
+            return onto, False, False
+        # A lower platform partly underneath this one: walk off the edge the segment sticks out past
+        # furthest, or failing that the platform
+        outLeft = current.left - segment.left
+        outRight = segment.right - current.right
+        if outLeft <= 0 and outRight <= 0:
+            outLeft = current.left - nextPlatform.left
+            outRight = nextPlatform.right - current.right
+        if outLeft > outRight:
+            return current.left - player.width, False, False
+        return current.right + player.width, False, False
+
+    def step(self, dt):
+        """Pick this tick's keys and events."""
+        world = self.world
+        player = world.playerRect
+        down = self.keys.down
+        down.clear()
+        events = []
+
+        target = self.target()
+        if target is None:
+            self.gaveUp = True
+            return self.keys, events
+        standing = self.standingPlatform()
+        if standing is not None:
+            self.current = standing
+        grounded = world.coyoteTimer > 0
+        self.predictCones()
+
+        if world.attacking:
+            # Hold still until the slash lands
+            down.add(pygame.K_s)
+            return self.keys, events
+        if world.attackCooldown <= 0 and self.takedownTarget() is not None and self.safeFor(player.centerx, False, 0) > TAKEDOWN_SECONDS:
+            down.add(pygame.K_s)
+            return self.keys, ATTACK_EVENTS
+
+        move = self.routeMove(target, grounded)
+        if move is None:
+            self.abandoned.add(tuple(target))
+            return self.keys, events
+        aimX, jump, hurry = move
+        heading = self.nextPlatform(self.current, target) or self.current
+        landY = heading.top - player.height / 2 if jump or not grounded else None
+        crouch = not hurry and self.enemyNearby()
+        speed = game.runSpeed if hurry else game.walkSpeed * (0.6 if crouch else 1.0)
+        inBush = any(player.colliderect(bush) for bush in self.bushes)
+        if inBush and world.alertMeter > HIDE_UNTIL_ALERT:
+            # Let the alert drain before leaving cover
+            aimX, jump, hurry = player.centerx, False, False
+        elif self.safeFor(aimX, jump, speed, landY) < WALK_SAFE_SECONDS + (flightTime(player.centery, landY) if jump else 0):
+            # A walk is checked again next tick, but a jump cannot be called off until it lands
+            self.hiding = True
+            # The route walks into a cone: wait where it is safe, else make for a bush, else back off
+            options = [(player.centerx, False)]
+            bush = self.nearestBush()
+            if bush is not None:
+                options.append((bush.centerx, False))
+            options += [(player.centerx - BACK_OFF, False), (player.centerx + BACK_OFF, False)]
+            hurry = False
+            speed = game.walkSpeed * 0.6
+            aimX, jump = max(options, key=lambda option: self.safeFor(option[0], False, speed, landY))
+        else:
+            self.hiding = False
+        # Waiting counts too, so a target a patrol never leaves open is eventually given up
+        self.trackProgress(target, dt)
+
+        if hurry:
+            down.add(pygame.K_LSHIFT)
+        elif crouch or self.hiding:
+            down.add(pygame.K_s)
+        if abs(aimX - player.centerx) > 6:
+            down.add(pygame.K_d if aimX > player.centerx else pygame.K_a)
+
+        # Not getting anywhere: hop, which clears most lips and ledges
+        if not self.hiding and abs(player.x - self.lastX) < 1 and abs(player.y - self.lastY) < 1:
+            self.stuckTime += dt
+            if self.stuckTime > STUCK_SECONDS:
+                landY = heading.top - player.height / 2
+                jump = grounded and self.safeFor(aimX, True, speed, landY) >= WALK_SAFE_SECONDS + flightTime(player.centery, landY)
+                self.stuckTime = 0.0
+        else:
+            self.stuckTime = 0.0
+        self.lastX, self.lastY = player.x, player.y
+        if jump:
+            events = JUMP_EVENTS
+        return self.keys, events
+
+
+def playSeed(seed, maxSeconds=180.0, dt=1 / 60):
+    # Nothing is drawn: skip the bush sprites and the leaves and fireflies, which only animate
+    world = game.generateWorld(seed)
+    world.leaves = []
+    world.fireflies = []
+    bot = PlaytestBot(world)
+    maxTicks = int(maxSeconds / dt)
+    alertPeak = 0.0
+    hiddenTicks = 0
+    ticks = 0
+    while ticks < maxTicks and not world.caught and not world.win and not bot.gaveUp:
+        if ticks % THINK_TICKS == 0:
+            keys, events = bot.step(dt * THINK_TICKS)
+        else:
+            events = []
+        game.updatePlayState(world, keys, events, dt)
+        alertPeak = max(alertPeak, world.alertMeter)
+        hiddenTicks += world.stealthState == "hidden"
+        ticks += 1
+    return {
+        "seed": seed,
+        "outcome": "win" if world.win else "caught" if world.caught else "stuck" if bot.gaveUp else "timeout",
+        "ticks": ticks,
+        "seconds": round(ticks * dt, 3),
+        "orbs": world.rescued,
+        "alertPeak": round(alertPeak, 1),
+        "hiddenSeconds": round(hiddenTicks * dt, 2),
+    }
+
+
+def playSeeds(seeds, workers=None, maxSeconds=180.0):
+    """Play seeds across a process pool, returning results in seed order."""
+    workers = workers or os.cpu_count() or 1
+    limits = [maxSeconds] * len(seeds)
+    if workers == 1:
+        return [playSeed(seed, limit) for seed, limit in zip(seeds, limits)]
+    # Runs last seconds each, so small chunks keep the workers evenly loaded
+    chunksize = max(1, len(seeds) // (workers * 32))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(playSeed, seeds, limits, chunksize=chunksize))
+
+
+def summarize(results):
+    runs = len(results)
+    outcomes = {"win": 0, "caught": 0, "stuck": 0, "timeout": 0}
+    for result in results:
+        outcomes[result["outcome"]] += 1
+    summary = {
+        "runs": runs,
+        "outcomes": outcomes,
+        "detectionRate": round(outcomes["caught"] / runs, 3) if runs else None,
+        "completionRate": round(outcomes["win"] / runs, 3) if runs else None,
+        "simulatedSeconds": round(sum(result["seconds"] for result in results), 1),
+    }
+    winTimes = sorted(result["seconds"] for result in results if result["outcome"] == "win")
+    if winTimes:
+        summary["completionSeconds"] = {
+            "min": winTimes[0],
+            "median": winTimes[len(winTimes) // 2],
+            "max": winTimes[-1],
+        }
+    peaks = [result["alertPeak"] for result in results]
+    if peaks:
+        summary["alertPeak"] = {"mean": round(sum(peaks) / len(peaks), 1), "max": max(peaks)}
+    return summary
+
+
+def parseArgs(argv=None):
+    parser = argparse.ArgumentParser(description="Play generated levels with a scripted bot")
+    parser.add_argument("--start", type=int, default=0, help="first seed to play")
+    parser.add_argument("--count", type=int, default=200, help="number of consecutive seeds")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--max-seconds", type=float, default=180.0, help="simulated time limit per run")
+    parser.add_argument("--out", default="playtest.json", help="where to write the report")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parseArgs(argv)
+    seeds = list(range(args.start, args.start + args.count))
+    started = time.perf_counter()
+    results = playSeeds(seeds, args.workers, args.max_seconds)
+    elapsed = time.perf_counter() - started
+
+    summary = summarize(results)
+    summary["elapsedSeconds"] = round(elapsed, 3)
+    summary["simulatedPerSecond"] = round(summary["simulatedSeconds"] / elapsed, 1) if elapsed > 0 else None
+    with open(args.out, "w") as handle:
+        json.dump({"summary": summary, "runs": results}, handle, indent=1)
+    print(
+        f"{summary['outcomes']['win']} won, {summary['outcomes']['caught']} caught, "
+        f"{summary['outcomes']['stuck']} stuck, {summary['outcomes']['timeout']} timed out; {summary['simulatedSeconds']:.0f} simulated seconds "
+        f"in {elapsed:.2f}s ({summary['simulatedPerSecond']}x real time), report written to {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Seed vetting stats from level_batch.py.
+
+    python -m pytest -q test_level_batch.py
+"""
+
+import level_batch
+
+
+class StubNav:
+    def __init__(self, edges):
+        self.edges = edges
+
+
+def test_jump_counts_are_hops_not_distance():
+    # 0 -> 3 directly is one long jump; 0 -> 1 -> 2 -> 3 is shorter but three hops
+    nav = StubNav([[(3, 500.0), (1, 10.0)], [(2, 10.0)], [(3, 10.0)], []])
+    assert level_batch.jumpCounts(nav, 0) == {0: 0, 1: 1, 2: 2, 3: 1}
+
@@ -0,0 +1,176 @@
+"""Checks of main.py that need no display beyond SDL's dummy driver.
+
+    python -m pytest -q
+"""
+
+import os
+
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import main as game  # noqa: E402  (the video driver must be chosen before pygame loads)
+
+
+def test_tutorial_loads_from_another_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    world = game.generateWorld(tutorial=True)
+    assert world.isTutorial
+    assert world.platforms and world.tutorialHints
+
+
+def test_telemetry_is_opt_in_and_lands_next_to_main_py():
+    assert not game.parseArgs([]).telemetry
+    assert game.parseArgs([]).telemetry_log is None
+    assert game.parseArgs(["--telemetry"]).telemetry
+    assert game.TELEMETRY_PATH == os.path.join(os.path.dirname(os.path.abspath(game.__file__)), "telemetry.jsonl")
+
+
+class RecordingClock:
+    def __init__(self):
+        self.calls = []
+
+    def tick(self, rate=0):
+        self.calls.append(("tick", rate))
+        return 16
+
+    def tick_busy_loop(self, rate=0):
+        self.calls.append(("tick_busy_loop", rate))
+        return 16
+
+
+def test_vsync_pacing_caps_the_loop_when_the_flip_is_on_the_render_thread():
+    serial, pipelined = RecordingClock(), RecordingClock()
+    game.FramePacer("vsync", serial, rate=60).wait()
+    game.FramePacer("vsync", pipelined, rate=60, pipelined=True).wait()
+    assert serial.calls == [("tick", 0)]
+    assert pipelined.calls == [("tick", 60)]
+
+
+def failingPresent(*args):
+    raise RuntimeError("render failed")
+
+
+def test_render_thread_failure_reaches_stop(monkeypatch):
+    monkeypatch.setattr(game, "presentFrame", failingPresent)
+    pipeline = game.RenderPipeline(game.pygame.Surface((8, 8)))
+    pipeline.publish("title", None, None)
+    pipeline.thread.join(timeout=5)
+    assert not pipeline.thread.is_alive()
+    with pytest.raises(RuntimeError, match="render failed"):
+        pipeline.stop()
+
+
+def test_render_thread_failure_reaches_the_next_publish(monkeypatch):
+    monkeypatch.setattr(game, "presentFrame", failingPresent)
+    pipeline = game.RenderPipeline(game.pygame.Surface((8, 8)))
+    pipeline.publish("title", None, None)
+    pipeline.thread.join(timeout=5)
+    with pytest.raises(RuntimeError, match="render failed"):
+        pipeline.publish("title", None, None)
+    # Reported once, so shutting down afterwards is quiet
+    pipeline.stop()
+
+
+def routeCost(nav, path):
+    return sum(dict(nav.edges[node])[following] for node, following in zip(path, path[1:]))
+
+
+def test_jump_cost_is_to_the_nearest_point_on_the_landing_edge():
+    ledge = game.pygame.Rect(100, 300, 40, 10)
+    floor = game.pygame.Rect(0, 400, 600, 10)
+    assert game.linkCost(ledge, floor) == 100
+    assert game.linkCost(floor, ledge) == game.math.hypot(300 - 140, 100)
+
+
+def test_routes_are_as_short_as_an_exhaustive_search():
+    world = game.generateWorld(3)
+    nav = game.PlatformNav(world.platforms)
+    nodes = range(len(nav.platforms))
+    for start in nodes:
+        # Plain Dijkstra over the same edges
+        best = {start: 0.0}
+        frontier = [(0.0, start)]
+        while frontier:
+            cost, node = game.heapq.heappop(frontier)
+            if cost > best[node]:
+                continue
+            for neighbour, step in nav.edges[node]:
+                if cost + step < best.get(neighbour, game.math.inf):
+                    best[neighbour] = cost + step
+                    game.heapq.heappush(frontier, (cost + step, neighbour))
+        for goal in nodes:
+            path = nav.route(start, goal)
+            if goal not in best:
+                assert path is None
+            else:
+                assert routeCost(nav, path) == pytest.approx(best[goal])
+
+
+def edgeDistance(point, polygon):
+    """Distance from point to the nearest edge of polygon."""
+    px, py = point
+    nearest = game.math.inf
+    for (ax, ay), (bx, by) in zip(polygon, polygon[1:] + polygon[:1]):
+        dx, dy = bx - ax, by - ay
+        t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy or 1.0)))
+        nearest = min(nearest, game.math.hypot(ax + t * dx - px, ay + t * dy - py))
+    return nearest
+
+
+def scatteredPatrols(seed):
+    """A generated level with every enemy at a random spot on its path, facing a random way."""
+    rng = game.random.Random(seed)
+    world = game.generateWorld(seed)
+    for enemy in world.enemies:
+        span = max(0, enemy.path[1] - enemy.rect.width - enemy.path[0])
+        enemy.posX = enemy.path[0] + rng.uniform(0, span)
+        enemy.rect.x = game.math.floor(enemy.posX + 0.5)
+        enemy.dir = rng.choice((1, -1))
+    return world, rng
+
+
+def pointsAroundCones(cones, rng, count):
+    """Random points near the cones, none within a pixel of any cone edge where rounding could split a tie."""
+    points = []
+    while len(points) < count:
+        xs, ys = zip(*rng.choice(cones))
+        point = (rng.uniform(min(xs) - 40, max(xs) + 40), rng.uniform(min(ys) - 40, max(ys) + 40))
+        if all(edgeDistance(point, cone) > 1 for cone in cones):
+            points.append(point)
+    return points
+
+
+@pytest.mark.skipif(game.np is None, reason="numpy is not installed")
+def test_batched_cones_match_the_scalar_cones():
+    hits = 0
+    for seed in range(4):
+        world, rng = scatteredPatrols(seed)
+        batch = game.EnemyBatch(world.enemies)
+        cones = [game.buildVisionCone(enemy) for enemy in world.enemies]
+        for point in pointsAroundCones(cones, rng, 150):
+            inside, _ = batch.detect(point)
+            expected = [game.pointInPoly(point, cone) for cone in cones]
+            assert inside.tolist() == expected, point
+            hits += any(expected)
+    assert 0 < hits < 600
+
+
+@pytest.mark.skipif(game.np is None, reason="numpy is not installed")
+def test_batched_and_scalar_ticks_catch_the_player_alike(monkeypatch):
+    caught = 0
+    for seed in range(4):
+        world, rng = scatteredPatrols(seed)
+        cones = [game.buildVisionCone(enemy) for enemy in world.enemies]
+        for point in pointsAroundCones(cones, rng, 30):
+            batched = game.snapshotWorld(world)
+            game.updateEnemiesBatched(batched, point, False, False, 0.0)
+            scalar = game.snapshotWorld(world)
+            with monkeypatch.context() as patch:
+                # The per-enemy loop is what runs when numpy is missing
+                patch.setattr(game, "np", None)
+                game.updateEnemies(scalar, point, False, False, 0.0)
+            assert batched.caught == scalar.caught, point
+            caught += scalar.caught
+    assert 0 < caught < 120
@@ -0,0 +1,59 @@
+"""Streaming missions keep the guards' route graph in step with the loaded chunks.
+
+    python -m pytest -q test_streaming.py
+"""
+
+import os
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import main as game  # noqa: E402  (the video driver must be chosen before pygame loads)
+
+
+def platformKey(platform):
+    return platform.x, platform.y, platform.width, platform.height
+
+
+def scrollTo(world, chunkIndex):
+    """Move the camera so the stream loads around chunkIndex and evicts what is behind it."""
+    world.cameraX = chunkIndex * game.CHUNK_WIDTH - game.width // 2
+    game.updateLevelStream(world, attachSprites=False)
+
+
+def test_evicted_platforms_leave_the_nav_graph():
+    world = game.generateWorld(7, missionWidth=game.CHUNK_WIDTH * 8)
+    scrollTo(world, 4)
+    assert 0 not in world.levelStream["chunks"]
+
+    nav = game.getPlatformNav(world)
+    live = {platformKey(platform) for platform in nav.platforms if platform is not None}
+    assert live == {platformKey(platform) for platform in world.platforms}
+    for edges in nav.edges:
+        assert all(nav.platforms[node] is not None for node, _ in edges)
+
+
+def test_investigation_after_eviction_stays_on_loaded_platforms():
+    world = game.generateWorld(7, missionWidth=game.CHUNK_WIDTH * 8)
+    # Plan routes first so the cache holds ones through chunks about to be evicted
+    for enemy in world.enemies:
+        if enemy.type == "guard":
+            game.routeWaypoints(world, enemy, game.guardPerch(world.platforms, enemy), world.platforms[0], 0)
+    scrollTo(world, 4)
+
+    floorLeft = min(world.platforms, key=lambda platform: platform.left)
+    target = (floorLeft.left + 10, floorLeft.top)
+    guards = [enemy for enemy in world.enemies if enemy.type == "guard" and enemy.active]
+    assert guards
+    sent = [enemy for enemy in guards if game.startInvestigation(world, enemy, target)]
+    assert sent
+
+    loaded = {platformKey(platform) for platform in world.platforms}
+    for enemy in sent:
+        width, height = enemy.rect.size
+        for left, top in enemy.waypoints:
+            assert any(
+                platform.top - height == top and platform.left <= left <= max(platform.left, platform.right - width)
+                for platform in world.platforms
+                if platformKey(platform) in loaded
+            ), (left, top)